@@ -0,0 +1,270 @@
+import anthropic
+import argparse
+import json
+import os
+import tempfile
+import time
+import logging
+
+from writing_2_claude import ANTHROPIC_API_KEY, IELTSWritingTask2Agent
+from pre_grader import PreGrader
+
+logger = logging.getLogger(__name__)
+
+class BatchGrader:
+    """
+    Grade Task 2 essays in bulk through the Message Batches API.
+
+    Input is JSONL with one essay per line: {"question_id": ..., "answer": ...} and optionally
+    "question" (the question text; otherwise it is looked up in writing_2_samples.json by id).
+    Output is JSONL with the parsed scores and feedback per essay. Each chunk of essays is
+    recorded in a state file before it is submitted, with its batch id once submitted, so an
+    interrupted run submits only the chunks that are missing, resumes polling the rest, and
+    never writes an essay to the output twice.
+    """
+
+    POLL_INTERVAL = 30  # seconds
+    MAX_BATCH_REQUESTS = 100000  # API limit per batch
+
+    def __init__(self, agent=None, client=None, structured=False, poll_interval=None, pre_grader=None):
+        """
+        agent builds the prompts and parses the results; client is the Anthropic client used for
+        the batch endpoints (pass one with a custom base_url to run against a local fake endpoint).
+        With structured=True each essay is a single tool-use request instead of score + feedback.
+        pre_grader, if given, is a PreGrader; essays it settles offline are written without a request.
+        """
+        self.agent = agent or IELTSWritingTask2Agent()
+        self._client = client
+        self.structured = structured
+        self.poll_interval = poll_interval if poll_interval is not None else self.POLL_INTERVAL
+        self.pre_grader = pre_grader
+
+    @property
+    def client(self):
+        return self._client or self.agent.anthropic
+
+    def grade_file(self, input_path, output_path, state_path=None):
+        """Grade every essay in input_path and write the results to output_path; returns the number graded"""
+        state_path = state_path or output_path + '.state.json'
+        essays = self._load_essays(input_path)
+        essays_by_id = {essay['essay_id']: essay for essay in essays}
+        state = self._load_state(state_path)
+        done = self._graded_essay_ids(output_path)
+        written = 0
+
+        if not state['chunks']:
+            pending = [essay for essay in essays if essay['essay_id'] not in done]
+            if not pending:
+                logger.info("All essays already graded")
+                return 0
+
+            pending, pre_graded = self._pre_grade(pending)
+            if pre_graded:
+                written += self._write_records(output_path, pre_graded, done)
+                logger.info(f"Graded {len(pre_graded)} essays offline, {len(pending)} left for the batch")
+            if not pending:
+                return written
+
+            # Plan every chunk before submitting any, so a crash part-way still knows what is left
+            state['chunks'] = [
+                {'essay_ids': [essay['essay_id'] for essay in chunk], 'status': 'pending', 'batch_id': None}
+                for chunk in self._chunk(pending)
+            ]
+            self._save_state(state_path, state)
+        else:
+            logger.info(f"Resuming {len(state['chunks'])} batch chunks from {state_path}")
+
+        for chunk in state['chunks']:
+            if chunk['status'] == 'submitting':
+                # The crash came between recording and submitting; resubmitting may duplicate a batch, never an output line
+                logger.warning(f"Chunk of {len(chunk['essay_ids'])} essays may not have been submitted, resubmitting")
+            if chunk['status'] in ('pending', 'submitting'):
+                chunk['status'] = 'submitting'
+                self._save_state(state_path, state)
+                requests = []
+                for essay_id in chunk['essay_ids']:
+                    requests.extend(self._build_requests(essays_by_id[essay_id]))
+                batch = self.client.beta.messages.batches.create(requests=requests)
+                chunk.update(status='submitted', batch_id=batch.id)
+                self._save_state(state_path, state)
+                logger.info(f"Submitted batch {batch.id}")
+
+        for chunk in state['chunks']:
+            if chunk['status'] != 'submitted':
+                continue
+            self._wait_for_batch(chunk['batch_id'])
+            results = {}
+            for result in self.client.beta.messages.batches.results(chunk['batch_id']):
+                results[result.custom_id] = result.result
+
+            chunk_essays = {essay_id: essays_by_id[essay_id] for essay_id in chunk['essay_ids'] or essays_by_id}
+            # Records already in the output (a crash after writing, before saving the state) are skipped
+            written += self._write_records(output_path, self._collect_results(results, chunk_essays), done)
+            chunk['status'] = 'written'
+            self._save_state(state_path, state)
+
+        os.remove(state_path)
+        logger.info(f"Wrote {written} graded essays to {output_path}")
+        return written
+
+    def _chunk(self, essays):
+        """Split essays into groups whose requests fit in one batch"""
+        per_batch = max(1, self.MAX_BATCH_REQUESTS // (1 if self.structured else 2))
+        return [essays[start:start + per_batch] for start in range(0, len(essays), per_batch)]
+
+    def _write_records(self, output_path, records, done):
+        """Append records whose essay is not in done (updated in place); returns the number written"""
+        count = 0
+        with open(output_path, 'a') as f:
+            for record in records:
+                if record['essay_id'] in done:
+                    continue
+                f.write(json.dumps(record) + '\n')
+                done.add(record['essay_id'])
+                count += 1
+        return count
+
+    def _load_essays(self, input_path):
+        """Read essays from JSONL; the line number is used as a stable essay id"""
+        essays = []
+        with open(input_path, 'r') as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                sample = self.agent.corpus.task_2_example(record.get('question_id'))
+                question = record.get('question') or (sample['description'] if sample else '')
+                essays.append({
+                    'essay_id': f"essay_{line_number}",
+                    'question_id': record.get('question_id'),
+                    # Same shape as the agent's current_question, which the prompts read it from
+                    'question': {'question': {'description': question}},
+                    'answer': record['answer']
+                })
+        return essays
+
+    def _pre_grade(self, essays):
+        """Split essays into (essays needing the LLM, records of essays graded offline)"""
+        if not self.pre_grader:
+            return essays, []
+
+        results = self.pre_grader.grade_many(
+            [essay['answer'] for essay in essays],
+            [essay['question']['question']['description'] for essay in essays]
+        )
+        pending = []
+        pre_graded = []
+        for essay, result in zip(essays, results):
+            if result['route'] != 'local':
+                pending.append(essay)
+                continue
+            record = {'essay_id': essay['essay_id'], 'question_id': essay['question_id'], 'errors': [], 'pre_graded': True}
+            record.update(self.pre_grader.evaluation(result))
+            pre_graded.append(record)
+        return pending, pre_graded
+
+    def _build_requests(self, essay):
+        """Build the batch requests (score and feedback, or one structured request) for an essay"""
+        answer_text = essay['answer']
+        word_count = len(answer_text.split())
+
+        if self.structured:
+            prompt = self.agent._create_structured_evaluation_prompt(answer_text, word_count, essay['question'])
+            return [{
+                'custom_id': f"{essay['essay_id']}_structured",
+                'params': self.agent._evaluation_request(prompt, structured=True)
+            }]
+
+        score_prompt = self.agent._create_score_prompt(answer_text, word_count, essay['question'])
+        feedback_prompt = self.agent._create_feedback_prompt(answer_text, word_count, essay['question'])
+        return [
+            {'custom_id': f"{essay['essay_id']}_score", 'params': self.agent._evaluation_request(score_prompt)},
+            {'custom_id': f"{essay['essay_id']}_feedback", 'params': self.agent._evaluation_request(feedback_prompt)}
+        ]
+
+    def _wait_for_batch(self, batch_id):
+        """Poll a batch until processing has ended"""
+        while True:
+            batch = self.client.beta.messages.batches.retrieve(batch_id)
+            if batch.processing_status == 'ended':
+                return batch
+            counts = batch.request_counts
+            logger.info(f"Batch {batch_id}: {counts.processing} processing, {counts.succeeded} succeeded, {counts.errored} errored")
+            time.sleep(self.poll_interval)
+
+    def _collect_results(self, results, essays_by_id):
+        """Parse the batch results into one record per essay, in input order"""
+        graded = []
+        for essay_id, essay in essays_by_id.items():
+            suffixes = ['structured'] if self.structured else ['score', 'feedback']
+            custom_ids = [f"{essay_id}_{suffix}" for suffix in suffixes]
+            if not any(custom_id in results for custom_id in custom_ids):
+                continue
+
+            record = {'essay_id': essay_id, 'question_id': essay['question_id'], 'errors': []}
+            messages = {}
+            for suffix, custom_id in zip(suffixes, custom_ids):
+                result = results.get(custom_id)
+                if result is None or result.type != 'succeeded':
+                    record['errors'].append(f"{suffix}: {getattr(result, 'type', 'missing')}")
+                    continue
+                messages[suffix] = result.message
+                self.agent.track_token_usage(result.message)
+
+            try:
+                if 'structured' in messages:
+                    record.update(self.agent._parse_structured_evaluation(messages['structured']))
+                if 'score' in messages:
+                    record.update(self.agent._parse_scores(self.agent._extract_text(messages['score'])))
+                if 'feedback' in messages:
+                    record.update(self.agent._parse_feedback(self.agent._extract_text(messages['feedback'])))
+            except Exception as e:
+                record['errors'].append(f"parse: {e}")
+
+            graded.append(record)
+        return graded
+
+    def _graded_essay_ids(self, output_path):
+        """Ids of essays already written to the output file"""
+        if not os.path.exists(output_path):
+            return set()
+        with open(output_path, 'r') as f:
+            return {json.loads(line)['essay_id'] for line in f if line.strip()}
+
+    def _load_state(self, state_path):
+        if os.path.exists(state_path):
+            with open(state_path, 'r') as f:
+                state = json.load(f)
+            # State files from before chunks were recorded only list submitted batch ids
+            for batch_id in state.pop('batches', []):
+                state.setdefault('chunks', []).append({'essay_ids': None, 'status': 'submitted', 'batch_id': batch_id})
+            return state
+        return {'chunks': []}
+
+    def _save_state(self, state_path, state):
+        # A temporary file of its own, so concurrent runs never write into each other's before the replace
+        with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(os.path.abspath(state_path)),
+                                         prefix=os.path.basename(state_path) + '.', suffix='.tmp', delete=False) as f:
+            json.dump(state, f, indent=2)
+        os.replace(f.name, state_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade IELTS Writing Task 2 essays through the Message Batches API")
+    parser.add_argument('input', help="JSONL file with question_id and answer per line")
+    parser.add_argument('output', help="JSONL file to append graded results to")
+    parser.add_argument('--structured', action='store_true', help="Use one structured request per essay")
+    parser.add_argument('--poll-interval', type=float, default=BatchGrader.POLL_INTERVAL, help="Seconds between status checks")
+    parser.add_argument('--base-url', help="Batch API base URL, e.g. a local fake endpoint for testing")
+    parser.add_argument('--pre-grade', action='store_true', help="Grade clearly low-band or off-task essays offline")
+    args = parser.parse_args()
+
+    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY, base_url=args.base_url) if args.base_url else None
+    pre_grader = PreGrader() if args.pre_grade else None
+    grader = BatchGrader(client=client, structured=args.structured, poll_interval=args.poll_interval, pre_grader=pre_grader)
+    grader.grade_file(args.input, args.output)
+    print(grader.agent.get_token_usage_report())
+    if pre_grader:
+        print(pre_grader.get_report())
+
+if __name__ == "__main__":
+    main()
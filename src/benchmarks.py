@@ -0,0 +1,392 @@
+"""
+Benchmarks for the IELTS agents.
+
+Usage:
+    python src/benchmarks.py evaluation [--runs N] [--essays N]
+    python src/benchmarks.py import-time [--module NAME] [--budget MS]
+    python src/benchmarks.py marker-scan [--essays N]
+    python src/benchmarks.py features [--essays N]
+    python src/benchmarks.py chart-render [--charts N] [--workers 1,2,4]
+    python src/benchmarks.py question-memory [--questions N]
+    python src/benchmarks.py chart-formats [--charts N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.dirname(CURRENT_DIR)
+
+
+def load_task_2_essays(limit):
+    """Load example answers from writing_2_samples.json as (question, answer_text) pairs"""
+    with open(os.path.join(PARENT_DIR, 'writing', 'writing_2_samples.json'), 'r') as f:
+        samples = json.load(f)
+
+    essays = []
+    for sample in samples['ielts_writing_task_2']['question_examples']:
+        answer_text = sample['answers']['example_answer']['text']
+        if isinstance(answer_text, list):
+            answer_text = '\n\n'.join(answer_text)
+        essays.append((sample['description'], answer_text))
+        if len(essays) >= limit:
+            break
+    return essays
+
+
+def _summarize(values):
+    """Mean / median / max of a list of numbers"""
+    if not values:
+        return {'mean': 0, 'median': 0, 'max': 0}
+    return {
+        'mean': statistics.mean(values),
+        'median': statistics.median(values),
+        'max': max(values)
+    }
+
+
+def benchmark_evaluation(runs=1, essay_limit=3):
+    """
+    Compare the two-call (score + feedback) evaluation path with the single structured call
+    on token cost and latency, using the example answers from writing_2_samples.json.
+    """
+    from writing_2_claude import IELTSWritingTask2Agent
+
+    agent = IELTSWritingTask2Agent()
+    # The sample answers are graded regardless of length
+    agent.MINIMUM_WORDS = 0
+
+    modes = {
+        'two-call (sequential)': {'concurrent': False},
+        'two-call (concurrent)': {'concurrent': True},
+        'structured': {'structured': True}
+    }
+    results = {}
+
+    for mode, options in modes.items():
+        latencies = []
+        input_tokens = []
+        output_tokens = []
+        for description, answer_text in load_task_2_essays(essay_limit):
+            agent.current_question = {'question': {'description': description}}
+            for _ in range(runs):
+                agent.evaluate_answer(answer_text, **options)
+                if not agent.last_evaluation_usage:
+                    continue
+                latencies.append(agent.last_evaluation_latency['total'])
+                input_tokens.append(agent.last_evaluation_usage['input_tokens'])
+                output_tokens.append(agent.last_evaluation_usage['output_tokens'])
+                agent.last_evaluation_usage = {}
+
+        results[mode] = {
+            'latency': _summarize(latencies),
+            'input_tokens': _summarize(input_tokens),
+            'output_tokens': _summarize(output_tokens)
+        }
+
+    print("╔═══════════════════ Evaluation Benchmark ═══════════════════╗")
+    for mode, result in results.items():
+        print(f"║ {mode}")
+        print(f"║   Latency (s):   mean {result['latency']['mean']:.2f}  median {result['latency']['median']:.2f}  max {result['latency']['max']:.2f}")
+        print(f"║   Input tokens:  mean {result['input_tokens']['mean']:,.0f}")
+        print(f"║   Output tokens: mean {result['output_tokens']['mean']:,.0f}")
+    print("╚════════════════════════════════════════════════════════════╝")
+    return results
+
+
+def benchmark_import_time(module='writing_1_claude', budget_ms=None,
+                          forbidden=('matplotlib', 'numpy')):
+    """
+    Import a module in a fresh interpreter under `python -X importtime` and report its cumulative
+    import time. Fails (returns False) if a forbidden heavy dependency is imported eagerly or the
+    import exceeds budget_ms.
+    """
+    env = dict(os.environ)
+    env.setdefault('ANTHROPIC_API_KEY', 'benchmark')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=CURRENT_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        return False
+
+    # Lines look like: "import time:  self [us] | cumulative | imported package"
+    imported = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imported[name.strip()] = int(cumulative_us)
+
+    total_ms = imported.get(module, 0) / 1000
+    eager = sorted(name for name in forbidden if name in imported)
+    over_budget = budget_ms is not None and total_ms > budget_ms
+    slowest = sorted(((us, name) for name, us in imported.items() if '.' not in name and name != module), reverse=True)[:5]
+
+    print("╔═══════════════════ Import Time Benchmark ══════════════════╗")
+    print(f"║ import {module}: {total_ms:.1f} ms" + (f" (budget {budget_ms:.0f} ms)" if budget_ms is not None else ""))
+    for us, name in slowest:
+        print(f"║   {name:<30} {us / 1000:8.1f} ms")
+    if eager:
+        print(f"║ FAIL: imported eagerly: {', '.join(eager)}")
+    if over_budget:
+        print("║ FAIL: over budget")
+    print("╚════════════════════════════════════════════════════════════╝")
+    return not eager and not over_budget
+
+
+def benchmark_marker_scan(essay_count=10000, repeats=3):
+    """
+    Throughput of the single-pass marker scanner used for local essay analysis, against the
+    previous approach of one substring search per marker, over essay_count sample essays.
+    Each scan keeps its best of repeats runs. Returns False (and the command exits 1) if the
+    scanner is the slower of the two.
+    """
+    from writing_2_claude import IELTSWritingTask2Agent
+
+    scanner = IELTSWritingTask2Agent.MARKER_SCANNER
+    samples = [answer_text for _, answer_text in load_task_2_essays(limit=1000)]
+    essays = [samples[i % len(samples)] for i in range(essay_count)]
+    megabytes = sum(len(essay) for essay in essays) / 1e6
+
+    def substring_scan(text):
+        text_lower = text.lower()
+        return {
+            category: [marker for marker in markers if marker in text_lower]
+            for category, markers in scanner.categories.items()
+        }
+
+    def regex_scan(text):
+        return scanner.count(text)
+
+    scans = [('substring (per marker)', substring_scan), ('regex (single pass)', regex_scan)]
+    best = {name: float('inf') for name, _ in scans}
+    # Alternate the scans so a noisy stretch does not favour either one
+    for _ in range(repeats):
+        for name, scan in scans:
+            start_time = time.perf_counter()
+            for essay in essays:
+                scan(essay)
+            best[name] = min(best[name], time.perf_counter() - start_time)
+    results = {
+        name: {'essays_per_second': essay_count / elapsed, 'mb_per_second': megabytes / elapsed}
+        for name, elapsed in best.items()
+    }
+
+    print("╔═══════════════════ Marker Scan Benchmark ══════════════════╗")
+    print(f"║ {essay_count:,} essays, {megabytes:.1f} MB, {len(scanner.markers)} markers")
+    for name, result in results.items():
+        print(f"║ {name:<26} {result['essays_per_second']:>10,.0f} essays/s {result['mb_per_second']:>7.2f} MB/s")
+    slower = results['regex (single pass)']['essays_per_second'] < results['substring (per marker)']['essays_per_second']
+    if slower:
+        print("║ FAIL: the marker scanner is slower than the substring scan it replaced")
+    print("╚════════════════════════════════════════════════════════════╝")
+    return not slower
+
+
+def benchmark_features(essay_count=10000, repeats=3):
+    """
+    Throughput of batch feature extraction against the per-essay _analyze_essay_structure
+    calls it is built on, each the best of repeats runs
+    """
+    from essay_features import EssayFeatureExtractor
+    from writing_2_claude import IELTSWritingTask2Agent
+
+    samples = [answer_text for _, answer_text in load_task_2_essays(limit=1000)]
+    essays = [samples[i % len(samples)] for i in range(essay_count)]
+    extractor = EssayFeatureExtractor()
+
+    per_essay = batch = float('inf')
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        for essay in essays:
+            IELTSWritingTask2Agent._analyze_essay_structure(essay)
+        per_essay = min(per_essay, time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        features = extractor.extract(essays)
+        batch = min(batch, time.perf_counter() - start_time)
+
+    print("╔═══════════════════ Feature Extraction Benchmark ═══════════╗")
+    print(f"║ {essay_count:,} essays, {features.shape[1]} features")
+    print(f"║ structure analysis only {essay_count / per_essay:>10,.0f} essays/s")
+    print(f"║ feature matrix          {essay_count / batch:>10,.0f} essays/s")
+    print("╚════════════════════════════════════════════════════════════╝")
+    return per_essay, batch
+
+
+def synthetic_charts(count, seed=0):
+    """(visual_type, question_data) pairs with distinct data, so the render cache never answers"""
+    import random
+    from chart_renderer import ChartRenderer
+
+    rng = random.Random(seed)
+    visual_types = ChartRenderer.VISUAL_TYPES
+    categories = [str(year) for year in range(2010, 2020)]
+    charts = []
+    for i in range(count):
+        series = [
+            {'name': f"Series {j}", 'categories': categories, 'values': [round(rng.uniform(10, 100), 1) for _ in categories]}
+            for j in range(2)
+        ]
+        charts.append((visual_types[i % len(visual_types)], {
+            'description': f"The chart shows series {i}.",
+            'key_features': ["Overall trend", "Highest and lowest values"],
+            'data': {'title': f"Chart {i}", 'x_axis': {'label': 'Year'}, 'y_axis': {'label': 'Value'}, 'series': series}
+        }))
+    return charts
+
+
+def benchmark_chart_render(chart_count=200, worker_counts=(1, 2, 4)):
+    """Charts per second rendered in-process and through ChartRenderer.render_many pools of each size"""
+    from chart_renderer import ChartRenderer
+
+    charts = synthetic_charts(chart_count)
+
+    results = {}
+    renderer = ChartRenderer(max_entries=0)
+    start_time = time.perf_counter()
+    for visual_type, question_data in charts:
+        renderer.render(visual_type, question_data)
+    results['in-process'] = chart_count / (time.perf_counter() - start_time)
+
+    for workers in worker_counts:
+        renderer = ChartRenderer(max_entries=0, workers=workers)
+        # Start and warm the pool outside the timed run, as a long-running service would
+        renderer.render_many(charts[:workers])
+        start_time = time.perf_counter()
+        renderer.render_many(charts)
+        results[f"{workers} worker{'s' if workers > 1 else ''}"] = chart_count / (time.perf_counter() - start_time)
+        renderer.close()
+
+    print("╔═══════════════════ Chart Rendering Benchmark ══════════════╗")
+    print(f"║ {chart_count:,} PNG charts, {os.cpu_count()} CPUs")
+    for name, charts_per_second in results.items():
+        print(f"║ {name:<24} {charts_per_second:>8.1f} charts/s")
+    print("╚════════════════════════════════════════════════════════════╝")
+    return results
+
+
+def benchmark_chart_formats(chart_count=40):
+    """Server CPU and bytes on the wire per Task 1 chart as PNG, optimized SVG and Vega-Lite spec"""
+    import gzip
+    from chart_renderer import ChartRenderer
+    from chart_spec import chart_spec_json
+
+    charts = synthetic_charts(chart_count)
+    renderer = ChartRenderer(max_entries=0)
+    producers = {
+        'png': lambda visual_type, question_data: renderer.render(visual_type, question_data, 'png'),
+        'svg': lambda visual_type, question_data: renderer.render(visual_type, question_data, 'svg'),
+        'vega-lite spec': lambda visual_type, question_data: chart_spec_json(visual_type, question_data).encode('utf-8')
+    }
+
+    results = {}
+    for name, produce in producers.items():
+        start_time = time.perf_counter()
+        outputs = [produce(visual_type, question_data) for visual_type, question_data in charts]
+        elapsed = time.perf_counter() - start_time
+        results[name] = {
+            'ms_per_chart': elapsed / chart_count * 1000,
+            'bytes': statistics.mean(len(output) for output in outputs),
+            'gzip_bytes': statistics.mean(len(gzip.compress(output)) for output in outputs)
+        }
+
+    print("╔═══════════════════ Chart Format Benchmark ═════════════════╗")
+    print(f"║ {chart_count:,} charts          ms/chart      bytes   gzipped")
+    for name, result in results.items():
+        print(f"║ {name:<18} {result['ms_per_chart']:>9.2f} {result['bytes']:>10,.0f} {result['gzip_bytes']:>9,.0f}")
+    print("╚════════════════════════════════════════════════════════════╝")
+    return results
+
+
+def _rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def benchmark_question_memory(question_count=10000, samples=10):
+    """RSS while serving question_count distinct Task 1 questions, each with a freshly rendered chart"""
+    from writing_1_claude import IELTSWritingAgent
+
+    agent = IELTSWritingAgent(display=False)
+    charts = synthetic_charts(question_count)
+    interval = max(1, question_count // samples)
+
+    readings = [(0, _rss_mb())]
+    for i, (visual_type, question_data) in enumerate(charts, start=1):
+        agent._serve_question(visual_type, question_data)
+        if i % interval == 0 or i == question_count:
+            readings.append((i, _rss_mb()))
+
+    # The first questions import matplotlib and fill the render cache, so growth is measured over the second half
+    settled = readings[len(readings) // 2][1]
+    print("╔═══════════════════ Question Memory Benchmark ══════════════╗")
+    print(f"║ {question_count:,} Task 1 questions served")
+    for served, rss in readings:
+        print(f"║ after {served:>7,} questions   RSS {rss:>8.1f} MB")
+    print(f"║ growth over second half   {readings[-1][1] - settled:>8.1f} MB")
+    print("╚════════════════════════════════════════════════════════════╝")
+    print(agent.chart_renderer.get_report())
+    return readings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IELTS agent benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    evaluation_parser = subparsers.add_parser('evaluation', help="Two-call vs structured Task 2 evaluation")
+    evaluation_parser.add_argument('--runs', type=int, default=1, help="Runs per essay")
+    evaluation_parser.add_argument('--essays', type=int, default=3, help="Number of sample essays")
+
+    import_parser = subparsers.add_parser('import-time', help="Cold import time, failing on eager heavy imports")
+    import_parser.add_argument('--module', default='writing_1_claude', help="Module to import")
+    import_parser.add_argument('--budget', type=float, help="Maximum cumulative import time in ms")
+
+    marker_parser = subparsers.add_parser('marker-scan', help="Cohesive device / paragraph marker scan throughput")
+    marker_parser.add_argument('--essays', type=int, default=10000, help="Number of essays to scan")
+
+    features_parser = subparsers.add_parser('features', help="Batch essay feature extraction throughput")
+    features_parser.add_argument('--essays', type=int, default=10000, help="Number of essays")
+
+    chart_parser = subparsers.add_parser('chart-render', help="Task 1 chart rendering throughput by worker count")
+    chart_parser.add_argument('--charts', type=int, default=200, help="Number of charts to render")
+    chart_parser.add_argument('--workers', default='1,2,4', help="Comma-separated worker pool sizes")
+
+    memory_parser = subparsers.add_parser('question-memory', help="RSS across many generated Task 1 questions")
+    memory_parser.add_argument('--questions', type=int, default=10000, help="Number of questions to serve")
+
+    formats_parser = subparsers.add_parser('chart-formats', help="CPU and bytes per chart for PNG, SVG and Vega-Lite")
+    formats_parser.add_argument('--charts', type=int, default=40, help="Number of charts")
+
+    args = parser.parse_args()
+    if args.benchmark == 'evaluation':
+        benchmark_evaluation(runs=args.runs, essay_limit=args.essays)
+    elif args.benchmark == 'import-time':
+        if not benchmark_import_time(module=args.module, budget_ms=args.budget):
+            sys.exit(1)
+    elif args.benchmark == 'marker-scan':
+        if not benchmark_marker_scan(essay_count=args.essays):
+            sys.exit(1)
+    elif args.benchmark == 'features':
+        benchmark_features(essay_count=args.essays)
+    elif args.benchmark == 'chart-render':
+        benchmark_chart_render(chart_count=args.charts, worker_counts=[int(n) for n in args.workers.split(',')])
+    elif args.benchmark == 'question-memory':
+        benchmark_question_memory(question_count=args.questions)
+    elif args.benchmark == 'chart-formats':
+        benchmark_chart_formats(chart_count=args.charts)
+
+
+if __name__ == "__main__":
+    main()
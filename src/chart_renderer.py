@@ -0,0 +1,347 @@
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+class ChartRenderer:
+    """
+    Headless renderer for Task 1 visuals.
+
+    Charts are drawn with matplotlib's object-oriented Figure API on an Agg canvas, so no pyplot
+    state or interactive backend is involved and rendering is safe on server threads. Rendered
+    images are cached by a hash of the visual type and the question's `data` block, so a question
+    served to many candidates is rendered once.
+    """
+
+    VISUAL_TYPES = ["bar graph", "line graph", "pie chart", "mixed charts"]
+    FORMATS = {'png', 'svg'}
+    FIGURE_SIZE = (12, 6)
+    DPI = 100
+    STYLE = 'classic'
+
+    # SVG output keeps text as <text> elements (instead of one path per glyph) and is reproducible
+    SVG_RC = {'svg.fonttype': 'none', 'svg.hashsalt': 'ielts-task-1'}
+    SVG_METADATA = {'Date': None, 'Creator': None, 'Format': None, 'Type': None}
+    SVG_GEOMETRY = re.compile(r'\b(d|points|transform|x|y|x1|x2|y1|y2|width|height|cx|cy|r)="([^"]*)"')
+    SVG_NUMBER = re.compile(r'-?\d+\.\d{3,}')
+    SVG_WHITESPACE = re.compile(rb'>\s+<')
+
+    # matplotlib's rcParams and font cache are process-wide, so figures are built one at a time
+    _render_lock = threading.RLock()
+
+    def __init__(self, max_entries=256, dpi=None, workers=None, max_bytes=64 * 1024 * 1024):
+        """
+        The cache holds at most max_entries images and max_bytes of image data.
+        workers is the size of the process pool used by render_many (default: one per CPU).
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.dpi = dpi or self.DPI
+        self.workers = workers or os.cpu_count() or 1
+
+        self._images = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self._pool = None
+
+        self.renders = 0
+        self.cache_hits = 0
+
+    def render(self, visual_type, question_data, format='png'):
+        """Image bytes for the question's visual in format ('png' or 'svg'), or None if it cannot be drawn"""
+        if format not in self.FORMATS:
+            raise ValueError(f"Unsupported image format: {format}")
+
+        key = self.cache_key(visual_type, question_data, format)
+        with self._lock:
+            if key in self._images:
+                self._images.move_to_end(key)
+                self.cache_hits += 1
+                return self._images[key]
+
+        image = self._render(visual_type, question_data, format)
+        if image is None:
+            return None
+
+        with self._lock:
+            self.renders += 1
+            self._store(key, image)
+        return image
+
+    def render_many(self, charts, format='png'):
+        """
+        Render a batch of (visual_type, question_data) charts across a pool of worker processes.
+        Returns the image bytes (or None) for each chart, in order. Cached charts, and repeats
+        within the batch, are not sent to the workers.
+        """
+        if format not in self.FORMATS:
+            raise ValueError(f"Unsupported image format: {format}")
+
+        keys = [self.cache_key(visual_type, question_data, format) for visual_type, question_data in charts]
+        images = {}
+        with self._lock:
+            for key in keys:
+                if key in self._images:
+                    self._images.move_to_end(key)
+                    images[key] = self._images[key]
+                    self.cache_hits += 1
+
+        missing = {}
+        for key, (visual_type, question_data) in zip(keys, charts):
+            if key not in images and key not in missing:
+                missing[key] = (visual_type, {'data': question_data.get('data')})
+
+        if missing:
+            pool = self._get_pool()
+            futures = {
+                key: pool.submit(_render_in_worker, visual_type, question_data, format, self.dpi)
+                for key, (visual_type, question_data) in missing.items()
+            }
+            for key, future in futures.items():
+                try:
+                    images[key] = future.result()
+                except BrokenProcessPool as e:
+                    logger.error(f"Chart worker pool failed, it will be restarted: {e}")
+                    images[key] = None
+                    self.close()
+                except Exception as e:
+                    logger.error(f"Error rendering chart in worker: {e}")
+                    images[key] = None
+
+            with self._lock:
+                for key in futures:
+                    if images[key] is not None:
+                        self.renders += 1
+                        self._store(key, images[key])
+
+        return [images[key] for key in keys]
+
+    def close(self):
+        """Shut down the worker pool, if render_many started one"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # Spawned rather than forked: the parent may hold client and pool threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_warm_worker
+                )
+            return self._pool
+
+    def cache_key(self, visual_type, question_data, format='png'):
+        data = json.dumps(question_data.get('data'), sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(f"{visual_type}\n{format}\n{data}".encode('utf-8')).hexdigest()
+
+    def figure(self, visual_type, question_data):
+        """Build the Figure (on an Agg canvas) for the question's visual, or None if it cannot be drawn"""
+        from matplotlib import style
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        data = question_data.get('data')
+        if not data or not data.get('series'):
+            logger.error("Invalid data structure for visualization")
+            return None
+        if visual_type not in self.VISUAL_TYPES:
+            logger.error(f"Unsupported visual type: {visual_type}")
+            return None
+
+        builders = {
+            "bar graph": self._bar_graph,
+            "line graph": self._line_graph,
+            "pie chart": self._pie_chart,
+            "mixed charts": self._mixed_charts
+        }
+        try:
+            with self._render_lock, style.context(self.STYLE):
+                fig = Figure(figsize=self.FIGURE_SIZE, facecolor='white')
+                FigureCanvasAgg(fig)
+                builders[visual_type](fig, data)
+                fig.tight_layout()
+            return fig
+        except Exception as e:
+            logger.error(f"Error generating {visual_type}: {e}")
+            return None
+
+    def get_report(self):
+        """Get a formatted report of the render cache"""
+        with self._lock:
+            return f"""
+╔══════════════════ Chart Renderer Report ═════════════════╗
+║ Charts rendered:  {self.renders:,}
+║ Cache hits:       {self.cache_hits:,}
+║ Cached images:    {len(self._images):,} ({self._cached_bytes / 1024:,.0f} KiB)
+╚══════════════════════════════════════════════════════════╝
+"""
+
+    def _store(self, key, image):
+        """Cache an image, evicting the least recently used ones over the limits; call with _lock held"""
+        if key in self._images:
+            self._cached_bytes -= len(self._images.pop(key))
+        self._images[key] = image
+        self._cached_bytes += len(image)
+        while self._images and (len(self._images) > self.max_entries or self._cached_bytes > self.max_bytes):
+            _, evicted = self._images.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+
+    def _render(self, visual_type, question_data, format):
+        with self._render_lock:
+            fig = self.figure(visual_type, question_data)
+            if fig is None:
+                return None
+            try:
+                buffer = io.BytesIO()
+                if format == 'svg':
+                    from matplotlib import rc_context
+                    with rc_context(self.SVG_RC):
+                        fig.savefig(buffer, format='svg', facecolor='white', bbox_inches='tight', metadata=self.SVG_METADATA)
+                    return self._optimize_svg(buffer.getvalue())
+                # 'tight' keeps the suptitle, which sits above the axes area
+                fig.savefig(buffer, format=format, dpi=self.dpi, facecolor='white', bbox_inches='tight')
+            finally:
+                # Artists and axes reference each other; clearing breaks the cycles so the figure
+                # is freed right away instead of at the next cyclic garbage collection
+                fig.clear()
+        return buffer.getvalue()
+
+    def _optimize_svg(self, svg):
+        """Round geometry to two decimals and drop the whitespace between tags"""
+        def round_numbers(match):
+            value = self.SVG_NUMBER.sub(lambda number: f"{float(number.group()):.2f}".rstrip('0').rstrip('.'), match.group(2))
+            value = ' '.join(value.split())
+            return f'{match.group(1)}="{value}"'
+
+        text = self.SVG_GEOMETRY.sub(round_numbers, svg.decode('utf-8'))
+        return self.SVG_WHITESPACE.sub(b'><', text.encode('utf-8'))
+
+    def _line_graph(self, fig, data):
+        ax = fig.add_subplot()
+        for series in data['series']:
+            ax.plot(series['categories'], series['values'], marker='o', label=series['name'])
+
+        ax.set_title(data['title'], pad=20)
+        ax.set_xlabel(data['x_axis']['label'])
+        ax.set_ylabel(data['y_axis']['label'])
+        ax.grid(True, linestyle='--', alpha=0.7)
+        ax.tick_params(axis='x', labelrotation=45)
+        ax.legend()
+
+    def _bar_graph(self, fig, data):
+        import numpy as np
+
+        ax = fig.add_subplot()
+        ax.set_facecolor('white')
+
+        categories = data['series'][0]['categories']
+        values = data['series'][0]['values']
+        x = np.arange(len(categories))
+        bars = ax.bar(x, values, width=0.6)
+        self._label_bars(ax, bars)
+
+        ax.set_title(data.get('title', ''), pad=20, fontsize=12, fontweight='bold')
+        ax.set_xlabel(data.get('x_axis', {}).get('label', ''), fontsize=10)
+        ax.set_ylabel(data.get('y_axis', {}).get('label', ''), fontsize=10)
+        ax.set_xticks(x)
+        ax.set_xticklabels(categories, rotation=45, ha='right')
+        ax.yaxis.grid(True, linestyle='--', alpha=0.3)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+
+    def _pie_chart(self, fig, data):
+        ax = fig.add_subplot()
+        series = data['series'][0]
+        _, texts, autotexts = ax.pie(series['values'], labels=series['categories'], autopct='%1.1f%%', startangle=90)
+
+        ax.set_title(data['title'], pad=20)
+        for text in autotexts:
+            text.set_size(8)
+            text.set_weight('bold')
+        for text in texts:
+            text.set_size(8)
+        # Equal aspect ratio ensures that pie is drawn as a circle
+        ax.axis('equal')
+
+    def _mixed_charts(self, fig, data):
+        import numpy as np
+
+        ax1, ax2 = fig.subplots(1, 2)
+        series = data['series']
+
+        # Bar chart of the first series on the left
+        first_series = series[0]
+        x = np.arange(len(first_series['categories']))
+        bars = ax1.bar(x, first_series['values'], width=0.6, color='skyblue')
+        ax1.set_title(first_series['name'], pad=20)
+        ax1.set_xticks(x)
+        ax1.set_xticklabels(first_series['categories'], rotation=45, ha='right')
+        self._label_bars(ax1, bars)
+
+        # Line chart of the second series on the right
+        if len(series) > 1:
+            second_series = series[1]
+            x_points = np.arange(len(second_series['categories']))
+            ax2.plot(x_points, second_series['values'], marker='o', linestyle='-', linewidth=2, color='forestgreen')
+            ax2.set_title(second_series['name'], pad=20)
+            ax2.set_xticks(x_points)
+            ax2.set_xticklabels(second_series['categories'], rotation=45, ha='right')
+            for i, value in enumerate(second_series['values']):
+                ax2.text(i, value, f'{value:,.1f}', ha='center', va='bottom')
+
+        # Each series may carry its own axis label, as two measures rarely share a unit
+        for index, ax in enumerate([ax1, ax2]):
+            label = series[index].get('label') if index < len(series) else None
+            ax.set_facecolor('white')
+            ax.grid(True, linestyle='--', alpha=0.7)
+            ax.set_xlabel(data.get('x_axis', {}).get('label', ''))
+            ax.set_ylabel(label or data.get('y_axis', {}).get('label', ''))
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+
+        fig.suptitle(data.get('title', ''), fontsize=12, fontweight='bold', y=1.05)
+
+    def _label_bars(self, ax, bars):
+        """Write each bar's value above it"""
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width() / 2., height, f'{height:,.1f}', ha='center', va='bottom')
+
+# Each pool worker keeps one uncached renderer; the parent process owns the cache
+_worker_renderer = None
+
+def _warm_worker():
+    """Pool initializer: import matplotlib and load the font cache before the first chart arrives"""
+    global _worker_renderer
+    _worker_renderer = ChartRenderer(max_entries=0)
+    _worker_renderer.render("pie chart", {'data': {'title': '', 'series': [{'categories': ['a'], 'values': [1]}]}})
+
+def _render_in_worker(visual_type, question_data, format, dpi):
+    _worker_renderer.dpi = dpi
+    return _worker_renderer._render(visual_type, question_data, format)
+
+# Process-wide renderer, shared by every agent so the image cache is shared too
+_chart_renderer = None
+_chart_renderer_lock = threading.Lock()
+
+def get_chart_renderer():
+    """Return the shared ChartRenderer, creating it on first use"""
+    global _chart_renderer
+    if _chart_renderer is None:
+        with _chart_renderer_lock:
+            if _chart_renderer is None:
+                _chart_renderer = ChartRenderer()
+    return _chart_renderer
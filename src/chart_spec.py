@@ -0,0 +1,95 @@
+"""
+Declarative (Vega-Lite v5) specs for Task 1 visuals, built from the question's `data` block
+(title, x_axis, y_axis and series), so web clients can draw the chart themselves instead of
+downloading a server-rendered image. The specs mirror the layouts ChartRenderer draws.
+"""
+import json
+
+VEGA_LITE_SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+WIDTH = 600
+HEIGHT = 300
+
+def chart_spec(visual_type, question_data):
+    """Vega-Lite spec for the question's visual, or None if it has no series to draw"""
+    data = question_data.get('data') or {}
+    series = data.get('series')
+    if not series:
+        return None
+
+    x_label = data.get('x_axis', {}).get('label', '')
+    y_label = data.get('y_axis', {}).get('label', '')
+
+    if visual_type == "bar graph":
+        spec = _bar(series[0], x_label, y_label)
+    elif visual_type == "line graph":
+        spec = _line(series, x_label, y_label)
+    elif visual_type == "pie chart":
+        spec = _pie(series[0])
+    elif visual_type == "mixed charts":
+        # Each series may carry its own axis label, as two measures rarely share a unit
+        spec = {'hconcat': [
+            dict(_bar(series[0], x_label, series[0].get('label') or y_label), title=series[0].get('name', '')),
+            *([dict(_line(series[1:2], x_label, series[1].get('label') or y_label), title=series[1].get('name', ''))] if len(series) > 1 else [])
+        ]}
+    else:
+        return None
+
+    return {'$schema': VEGA_LITE_SCHEMA, 'title': data.get('title', ''), **spec}
+
+def chart_spec_json(visual_type, question_data):
+    """chart_spec as compact JSON text, or None"""
+    spec = chart_spec(visual_type, question_data)
+    if spec is None:
+        return None
+    return json.dumps(spec, ensure_ascii=False, separators=(',', ':'))
+
+def _values(series_list):
+    """Long-format rows, one per (series, category) point"""
+    return [
+        {'series': series.get('name', ''), 'category': category, 'value': value}
+        for series in series_list
+        for category, value in zip(series['categories'], series['values'])
+    ]
+
+def _x(label):
+    # sort None keeps the categories in the order the question gives them
+    return {'field': 'category', 'type': 'ordinal', 'sort': None, 'title': label, 'axis': {'labelAngle': -45}}
+
+def _bar(series, x_label, y_label):
+    return {
+        'width': WIDTH, 'height': HEIGHT,
+        'data': {'values': _values([series])},
+        'encoding': {'x': _x(x_label), 'y': {'field': 'value', 'type': 'quantitative', 'title': y_label}},
+        'layer': [
+            {'mark': {'type': 'bar'}},
+            {'mark': {'type': 'text', 'dy': -6}, 'encoding': {'text': {'field': 'value', 'format': ',.1f'}}}
+        ]
+    }
+
+def _line(series_list, x_label, y_label):
+    return {
+        'width': WIDTH, 'height': HEIGHT,
+        'data': {'values': _values(series_list)},
+        'mark': {'type': 'line', 'point': True},
+        'encoding': {
+            'x': _x(x_label),
+            'y': {'field': 'value', 'type': 'quantitative', 'title': y_label},
+            'color': {'field': 'series', 'type': 'nominal', 'title': None}
+        }
+    }
+
+def _pie(series):
+    return {
+        'width': HEIGHT, 'height': HEIGHT,
+        'data': {'values': _values([series])},
+        'transform': [{'joinaggregate': [{'op': 'sum', 'field': 'value', 'as': 'total'}]},
+                      {'calculate': 'datum.value / datum.total', 'as': 'share'}],
+        'encoding': {
+            'theta': {'field': 'value', 'type': 'quantitative', 'stack': True},
+            'color': {'field': 'category', 'type': 'nominal', 'sort': None, 'title': None}
+        },
+        'layer': [
+            {'mark': {'type': 'arc', 'outerRadius': 120}},
+            {'mark': {'type': 'text', 'radius': 140}, 'encoding': {'text': {'field': 'share', 'format': '.1%'}}}
+        ]
+    }
@@ -0,0 +1,86 @@
+import anthropic
+import httpx
+import importlib.util
+import os
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Connection settings for the shared clients; override with configure() before the first call,
+# or through the environment variables below
+CLIENT_SETTINGS = {
+    'max_connections': int(os.getenv('ANTHROPIC_MAX_CONNECTIONS', 100)),
+    'max_keepalive_connections': int(os.getenv('ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS', 20)),
+    'keepalive_expiry': float(os.getenv('ANTHROPIC_KEEPALIVE_EXPIRY', 30.0)),
+    'connect_timeout': float(os.getenv('ANTHROPIC_CONNECT_TIMEOUT', 5.0)),
+    'timeout': float(os.getenv('ANTHROPIC_TIMEOUT', 600.0)),
+    'http2': os.getenv('ANTHROPIC_HTTP2', '1') != '0',
+    # Retries are handled by scheduler.RequestScheduler, so the SDK's own are off by default
+    'max_retries': int(os.getenv('ANTHROPIC_MAX_RETRIES', 0))
+}
+
+_client = None
+_async_client = None
+_lock = threading.Lock()
+
+def configure(**settings):
+    """
+    Change the connection settings of the shared clients.
+    The next get_client() or get_async_client() call creates a client with the new settings;
+    agents and the token counter look the shared client up on every call, so they switch to it.
+    Clients that were already created are left open, since calls may still be in flight on them.
+    """
+    global _client, _async_client
+    unknown = set(settings) - set(CLIENT_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown client settings: {', '.join(sorted(unknown))}")
+
+    with _lock:
+        CLIENT_SETTINGS.update(settings)
+        _client = None
+        _async_client = None
+
+def get_client():
+    """Return the process-wide Anthropic client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = anthropic.Anthropic(
+                    api_key=os.getenv('ANTHROPIC_API_KEY'),
+                    max_retries=CLIENT_SETTINGS['max_retries'],
+                    http_client=anthropic.DefaultHttpxClient(**_http_client_options())
+                )
+                logger.info(f"Created shared Anthropic client (http2={_http2_enabled()}, "
+                            f"max_connections={CLIENT_SETTINGS['max_connections']})")
+    return _client
+
+def get_async_client():
+    """Return the process-wide AsyncAnthropic client, creating it on first use"""
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = anthropic.AsyncAnthropic(
+                    api_key=os.getenv('ANTHROPIC_API_KEY'),
+                    max_retries=CLIENT_SETTINGS['max_retries'],
+                    http_client=anthropic.DefaultAsyncHttpxClient(**_http_client_options())
+                )
+    return _async_client
+
+def _http_client_options():
+    """httpx options for the shared connection pool"""
+    return {
+        'limits': httpx.Limits(
+            max_connections=CLIENT_SETTINGS['max_connections'],
+            max_keepalive_connections=CLIENT_SETTINGS['max_keepalive_connections'],
+            keepalive_expiry=CLIENT_SETTINGS['keepalive_expiry']
+        ),
+        'timeout': httpx.Timeout(CLIENT_SETTINGS['timeout'], connect=CLIENT_SETTINGS['connect_timeout']),
+        'http2': _http2_enabled()
+    }
+
+def _http2_enabled():
+    """HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it"""
+    return CLIENT_SETTINGS['http2'] and importlib.util.find_spec('h2') is not None
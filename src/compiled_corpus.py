@@ -0,0 +1,209 @@
+"""
+Compiled binary corpus: the writing/, reading/ and standards/ JSON files packed into one file
+with an offset index, so a process can memory-map it and decode single sample records on demand.
+
+Usage:
+    python src/compiled_corpus.py [--output PATH]
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import logging
+
+logger = logging.getLogger(__name__)
+
+PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_COMPILED_PATH = os.path.join(PARENT_DIR, '.cache', 'corpus.bin')
+
+SOURCE_DIRS = ['writing', 'reading', 'standards']
+# Runtime state that lives next to the corpus files but is not part of it
+EXCLUDED_FILES = {'topic_tracker.json'}
+EXCLUDED_PREFIXES = ('question_pool_',)
+
+# Lists under these keys are stored one record per element so they can be decoded individually
+RECORD_KEYS = {'question_examples'}
+
+# File layout: MAGIC | index offset (u64) | index length (u64) | records ... | index (JSON)
+MAGIC = b'IELTSCB1'
+HEADER = struct.Struct('<8sQQ')
+VERSION = 1
+
+def _encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def source_files(root=None):
+    """Relative paths ('/'-separated) of the JSON files that make up the corpus"""
+    root = root or PARENT_DIR
+    paths = []
+    for source_dir in SOURCE_DIRS:
+        for dirpath, _, filenames in os.walk(os.path.join(root, source_dir)):
+            for filename in filenames:
+                if not filename.endswith('.json') or filename in EXCLUDED_FILES or filename.startswith(EXCLUDED_PREFIXES):
+                    continue
+                relative_path = os.path.relpath(os.path.join(dirpath, filename), root)
+                paths.append(relative_path.replace(os.sep, '/'))
+    return sorted(paths)
+
+def _source_stamp(root, relative_path):
+    stat = os.stat(os.path.join(root, relative_path))
+    return [stat.st_mtime_ns, stat.st_size]
+
+def compile_corpus(root=None, output_path=None):
+    """
+    Compile the corpus JSON files under root into output_path.
+    Each file's skeleton is one record; every RECORD_KEYS list element is a record of its own.
+    The Corpus lookup indexes are computed here too, so loading never has to scan the samples.
+    Returns the index written.
+    """
+    from corpus import Corpus
+
+    root = root or PARENT_DIR
+    output_path = output_path or DEFAULT_COMPILED_PATH
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    index = {'version': VERSION, 'sources': {}, 'documents': {}, 'records': {}, 'indexes': {}}
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, 0, 0))
+
+        def write_record(value):
+            data = _encode(value)
+            offset = f.tell()
+            f.write(data)
+            return [offset, len(data)]
+
+        for relative_path in source_files(root):
+            with open(os.path.join(root, relative_path), 'r') as source:
+                document = json.load(source)
+            index['sources'][relative_path] = _source_stamp(root, relative_path)
+
+            records = {}
+            for pointer, items in _split_records(document):
+                records['/'.join(pointer)] = [write_record(item) for item in items]
+            index['records'][relative_path] = records
+            index['documents'][relative_path] = write_record(document)
+
+        # Indexes are built with a JSON-only corpus so they describe the sources just written
+        index['indexes'] = Corpus(root, compiled_path=False).build_indexes()
+
+        index_data = _encode(index)
+        index_offset = f.tell()
+        f.write(index_data)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, index_offset, len(index_data)))
+
+    os.replace(tmp_path, output_path)
+    logger.info(f"Compiled {len(index['documents'])} corpus files into {output_path}")
+    return index
+
+def _split_records(document, pointer=()):
+    """
+    Find RECORD_KEYS lists in document, replacing each with None in place.
+    Yields (pointer, items) where pointer is the key path to the list.
+    """
+    if not isinstance(document, dict):
+        return
+    for key, value in document.items():
+        if key in RECORD_KEYS and isinstance(value, list):
+            document[key] = None
+            yield pointer + (key,), value
+        elif isinstance(value, dict):
+            yield from _split_records(value, pointer + (key,))
+
+class CompiledCorpus:
+    """Memory-mapped reader for a file written by compile_corpus"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            # The map is shared between forked workers; the file handle is not needed once mapped
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._records = {}
+
+        magic, index_offset, index_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled corpus")
+        self.index = self.decode([index_offset, index_length])
+        if self.index.get('version') != VERSION:
+            raise ValueError(f"{path} has unsupported version {self.index.get('version')}")
+
+    def is_fresh(self, root):
+        """True if every source file is unchanged since compilation and no new ones were added"""
+        sources = self.index['sources']
+        try:
+            return set(source_files(root)) == set(sources) and all(
+                _source_stamp(root, relative_path) == stamp for relative_path, stamp in sources.items()
+            )
+        except OSError:
+            return False
+
+    def has_document(self, relative_path):
+        return relative_path.replace(os.sep, '/') in self.index['documents']
+
+    def document(self, relative_path):
+        """
+        Decode a whole file, with the same structure (plain dicts and lists) json.load gives.
+        Its records are the same objects record() returns.
+        """
+        relative_path = relative_path.replace(os.sep, '/')
+        document = self.decode(self.index['documents'][relative_path])
+        for pointer, spans in self.index['records'][relative_path].items():
+            *parents, key = pointer.split('/')
+            target = document
+            for parent in parents:
+                target = target[parent]
+            target[key] = [self.record(relative_path, pointer, position) for position in range(len(spans))]
+        return document
+
+    def record(self, relative_path, pointer, position):
+        """
+        Decode one record of a RECORD_KEYS list on its own, without the rest of the file.
+        pointer is the '/'-joined key path to the list, e.g. 'ielts_writing_task_2/question_examples'.
+        """
+        relative_path = relative_path.replace(os.sep, '/')
+        key = (relative_path, pointer, position)
+        record = self._records.get(key)
+        if record is None:
+            # Decoding twice under a race is harmless; the first record stored wins
+            record = self._records.setdefault(key, self.decode(self.index['records'][relative_path][pointer][position]))
+        return record
+
+    def decode(self, span):
+        offset, length = span
+        return json.loads(self._map[offset:offset + length])
+
+    def close(self):
+        self._map.close()
+
+def open_compiled_corpus(path=None, root=None):
+    """Open the compiled corpus at path, or return None if it is missing, invalid or stale"""
+    path = path or DEFAULT_COMPILED_PATH
+    if not os.path.exists(path):
+        return None
+    try:
+        compiled = CompiledCorpus(path)
+    except (OSError, ValueError, struct.error) as e:
+        logger.error(f"Error opening compiled corpus {path}: {e}")
+        return None
+    if not compiled.is_fresh(root or PARENT_DIR):
+        logger.warning(f"Compiled corpus {path} is out of date, loading JSON instead; rerun compiled_corpus.py")
+        compiled.close()
+        return None
+    return compiled
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the IELTS corpus JSON files into a memory-mappable binary file")
+    parser.add_argument('--output', default=DEFAULT_COMPILED_PATH, help="Path of the compiled corpus")
+    args = parser.parse_args()
+
+    index = compile_corpus(output_path=args.output)
+    records = sum(len(spans) for pointers in index['records'].values() for spans in pointers.values())
+    print(f"Compiled {len(index['documents'])} files ({records} sample records) into {args.output} "
+          f"({os.path.getsize(args.output):,} bytes)")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,196 @@
+import json
+import os
+import logging
+import threading
+from collections import defaultdict
+from compiled_corpus import open_compiled_corpus
+
+logger = logging.getLogger(__name__)
+
+PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def determine_question_type(description):
+    """Determine the type of a Task 2 question based on its description"""
+    text = ' '.join(description).lower() if isinstance(description, list) else description.lower()
+
+    if "agree or disagree" in text:
+        return "agree_disagree"
+    elif "discuss both" in text:
+        return "discuss_both_views"
+    elif "advantages and disadvantages" in text:
+        return "advantages_disadvantages"
+    elif "positive or negative" in text:
+        return "positive_negative"
+    elif "problem" in text and "solution" in text:
+        return "problem_solution"
+    else:
+        return "discuss_both_views"  # default type
+
+class Corpus:
+    """
+    Process-wide store for the sample, template and standards files.
+
+    Each file is parsed once, on first access, and shared by every agent; callers must treat the
+    returned data as read-only. Indexes are built alongside: Task 1 examples by visual type,
+    Task 2 examples by question type and by id, and band descriptors by band.
+
+    If an up-to-date compiled corpus (see compiled_corpus.py) exists, files are read from its
+    memory map instead: the indexed lookups decode only the sample records they return, and the
+    indexes come precomputed. Whole files decode to the same plain dicts and lists as the JSON.
+    """
+
+    WRITING_1_SAMPLES = os.path.join('writing', 'writing_1_samples.json')
+    WRITING_2_SAMPLES = os.path.join('writing', 'writing_2_samples.json')
+    WRITING_TEMPLATES = os.path.join('writing', 'ielts_templates_writing.json')
+    TASK_2_GRADING_REFERENCE = os.path.join('writing', 'references', 'task_2_grading_reference.json')
+    TEMPLATES = os.path.join('standards', 'ielts_templates.json')
+    CEFR_STANDARDS = os.path.join('standards', 'cefr_standards.json')
+    READING_TEMPLATES = os.path.join('reading', 'ielts_templates_reading.json')
+    READING_SAMPLES = os.path.join('reading', 'reading_samples.json')
+    READING_STANDARDS = os.path.join('reading', 'cefr_standards_reading.json')
+
+    def __init__(self, root=None, compiled_path=None):
+        """compiled_path overrides the compiled corpus location; pass False to always read the JSON files"""
+        self.root = root or PARENT_DIR
+        self._files = {}
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+        self.compiled = None
+        if compiled_path is not False:
+            self.compiled = open_compiled_corpus(compiled_path, self.root)
+            if self.compiled:
+                self._indexes.update(self.compiled.index['indexes'])
+
+    def load(self, relative_path):
+        """
+        Parse a JSON file under the repository root, once.
+        Raises FileNotFoundError or json.JSONDecodeError like json.load would.
+        """
+        data = self._files.get(relative_path)
+        if data is None:
+            with self._lock:
+                data = self._files.get(relative_path)
+                if data is None and self.compiled and self.compiled.has_document(relative_path):
+                    data = self.compiled.document(relative_path)
+                    self._files[relative_path] = data
+                elif data is None:
+                    with open(os.path.join(self.root, relative_path), 'r') as f:
+                        data = json.load(f)
+                    self._files[relative_path] = data
+                    logger.info(f"Loaded {relative_path} into the shared corpus")
+        return data
+
+    @property
+    def writing_1_samples(self):
+        return self.load(self.WRITING_1_SAMPLES)
+
+    @property
+    def writing_2_samples(self):
+        return self.load(self.WRITING_2_SAMPLES)
+
+    @property
+    def writing_templates(self):
+        return self.load(self.WRITING_TEMPLATES)
+
+    @property
+    def task_2_grading_reference(self):
+        return self.load(self.TASK_2_GRADING_REFERENCE)
+
+    @property
+    def templates(self):
+        return self.load(self.TEMPLATES)
+
+    @property
+    def cefr_standards(self):
+        return self.load(self.CEFR_STANDARDS)
+
+    @property
+    def reading_templates(self):
+        return self.load(self.READING_TEMPLATES)
+
+    @property
+    def reading_samples(self):
+        return self.load(self.READING_SAMPLES)
+
+    @property
+    def reading_standards(self):
+        return self.load(self.READING_STANDARDS)
+
+    def task_1_examples(self, visual_type):
+        """Task 1 sample questions of the given visual type"""
+        positions = self._index('task_1_by_type', self._build_task_1_index).get(visual_type, ())
+        return tuple(self._example(self.WRITING_1_SAMPLES, 'ielts_writing_task_1', position) for position in positions)
+
+    def task_2_examples(self, question_type):
+        """Task 2 sample questions of the given question type"""
+        positions = self._index('task_2_by_type', self._build_task_2_index).get(question_type, ())
+        return tuple(self._example(self.WRITING_2_SAMPLES, 'ielts_writing_task_2', position) for position in positions)
+
+    def task_2_example(self, question_id):
+        """Task 2 sample question by id, or None"""
+        position = self._index('task_2_by_id', self._build_task_2_id_index).get(question_id)
+        if position is None:
+            return None
+        return self._example(self.WRITING_2_SAMPLES, 'ielts_writing_task_2', position)
+
+    def build_indexes(self):
+        """
+        All lookup indexes, as JSON-serializable positions into the sample lists.
+        Used by compiled_corpus.py to store them precomputed.
+        """
+        return {
+            'task_1_by_type': self._index('task_1_by_type', self._build_task_1_index),
+            'task_2_by_type': self._index('task_2_by_type', self._build_task_2_index),
+            'task_2_by_id': self._index('task_2_by_id', self._build_task_2_id_index)
+        }
+
+    def band_descriptors(self, task):
+        """Band descriptors for a writing task ('academic_writing_task_1' or '_2'), keyed by band as a string"""
+        return self.writing_templates['writing']['types_of_questions'][task]['band_descriptors']
+
+    def band_descriptor(self, task, band):
+        """Descriptor for a single band; half bands use the descriptor of the band below"""
+        return self.band_descriptors(task).get(str(int(float(band))))
+
+    def _example(self, relative_path, task, position):
+        """One question_examples entry; decoded on its own from the compiled corpus unless the file is loaded"""
+        if relative_path not in self._files and self.compiled and self.compiled.has_document(relative_path):
+            return self.compiled.record(relative_path, f"{task}/question_examples", position)
+        return self.load(relative_path)[task]['question_examples'][position]
+
+    def _index(self, name, build):
+        index = self._indexes.get(name)
+        if index is None:
+            # Built outside the lock (building loads files, which takes it); the first index stored wins
+            index = self._indexes.setdefault(name, build())
+        return index
+
+    def _build_task_1_index(self):
+        index = defaultdict(list)
+        for position, example in enumerate(self.writing_1_samples['ielts_writing_task_1']['question_examples']):
+            index[example['type']].append(position)
+        return dict(index)
+
+    def _build_task_2_index(self):
+        index = defaultdict(list)
+        for position, example in enumerate(self.writing_2_samples['ielts_writing_task_2']['question_examples']):
+            index[determine_question_type(example['description'])].append(position)
+        return dict(index)
+
+    def _build_task_2_id_index(self):
+        examples = self.writing_2_samples['ielts_writing_task_2']['question_examples']
+        return {example['id']: position for position, example in enumerate(examples)}
+
+# Process-wide corpus, shared by every agent
+_corpus = None
+_corpus_lock = threading.Lock()
+
+def get_corpus():
+    """Return the shared Corpus, creating it on first use"""
+    global _corpus
+    if _corpus is None:
+        with _corpus_lock:
+            if _corpus is None:
+                _corpus = Corpus()
+    return _corpus
@@ -0,0 +1,80 @@
+import numpy as np
+
+class EssayFeatureExtractor:
+    """
+    Batch feature extraction for Task 2 essays.
+
+    extract() turns N essays into an (N, len(feature_names)) float matrix. The structure
+    features (paragraphs, introduction and conclusion, cohesive devices, structure score) come
+    straight from the analyzer's _analyze_essay_structure, so they always match what the agent
+    reports; sentence and lexical features come from the analyzer's MARKER_SCANNER tokens. Each
+    essay is analyzed once and the per-essay values are stacked into the matrix with NumPy.
+    """
+
+    SENTENCE_ENDINGS = {'.', '!', '?'}
+
+    def __init__(self, analyzer=None):
+        """
+        analyzer provides _analyze_essay_structure, MARKER_SCANNER and COHESIVE_DEVICES; it
+        defaults to IELTSWritingTask2Agent, whose analysis needs no client or instance
+        """
+        if analyzer is None:
+            from writing_2_claude import IELTSWritingTask2Agent
+            analyzer = IELTSWritingTask2Agent
+
+        self.analyzer = analyzer
+        self.scanner = analyzer.MARKER_SCANNER
+        self.cohesive_categories = list(analyzer.COHESIVE_DEVICES)
+        self.feature_names = [
+            'word_count', 'paragraph_count', 'body_paragraph_count',
+            'sentence_count', 'mean_sentence_length', 'std_sentence_length', 'max_sentence_length',
+            'type_token_ratio', 'has_introduction', 'has_conclusion',
+            *(f'cohesive_{category}' for category in self.cohesive_categories),
+            'cohesive_device_variety', 'structure_score'
+        ]
+        self._columns = {name: index for index, name in enumerate(self.feature_names)}
+
+    def column(self, features, name):
+        """The column of a feature matrix for one feature name"""
+        return features[:, self._columns[name]]
+
+    def extract(self, essays):
+        """Return the (len(essays), len(feature_names)) feature matrix"""
+        return np.array([self._essay_features(essay) for essay in essays], dtype=float).reshape(len(essays), len(self.feature_names))
+
+    def _essay_features(self, essay):
+        """One row of the feature matrix"""
+        analysis = self.analyzer._analyze_essay_structure(essay)
+        device_counts = analysis['cohesive_device_counts']
+
+        tokens = self.scanner.tokenize(essay)
+        words = [token for token in tokens if token[0].isalnum()]
+        sentences = self._sentence_lengths(tokens)
+
+        return [
+            len(essay.split()), analysis['paragraph_count'], len(analysis['body_paragraphs']),
+            len(sentences),
+            sentences.mean() if len(sentences) else 0,
+            sentences.std() if len(sentences) else 0,
+            sentences.max() if len(sentences) else 0,
+            len(set(words)) / len(words) if words else 0,
+            analysis['has_introduction'], analysis['has_conclusion'],
+            *(sum(device_counts.get(category, {}).values()) for category in self.cohesive_categories),
+            sum(len(devices) for devices in device_counts.values()),
+            analysis['structure_score']
+        ]
+
+    def _sentence_lengths(self, tokens):
+        """Word counts of the sentences in a token list, ending at '.', '!' or '?'"""
+        lengths = []
+        length = 0
+        for token in tokens:
+            if token in self.SENTENCE_ENDINGS:
+                if length:
+                    lengths.append(length)
+                length = 0
+            elif token[0].isalnum():
+                length += 1
+        if length:
+            lengths.append(length)
+        return np.array(lengths, dtype=float)
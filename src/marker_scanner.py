@@ -0,0 +1,167 @@
+import re
+from collections import Counter
+
+class MarkerScanner:
+    """
+    One precompiled, word-bounded regex over a fixed set of marker phrases, grouped by category.
+
+    The markers are folded into a single alternation, factored character by character like a
+    trie, and matched case-insensitively as whole words: a marker starts the text or follows
+    whitespace or PUNCTUATION, and ends before a non-word character ("then" does not match inside
+    "strengthen", and "such as" does not match across "such. As"). count() first puts a space
+    before every such start, so its regex begins with a literal space and the engine jumps from
+    word to word in C. A marker may belong to several categories, and markers nested inside a
+    longer match ("result" in "as a result") are reported too. Built once; safe to share between
+    threads.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+    # Punctuation a marker may directly follow, e.g. "reasons.However" or "(for example"; count() adds a space after it
+    PUNCTUATION = '.,;:!?()[]"\'/-‘’“”–—'
+    WHITESPACE = ''.join(character for character in map(chr, range(0x3001)) if character.isspace() and character != ' ')
+
+    def __init__(self, categories):
+        """categories maps a category name to its list of marker phrases"""
+        self.categories = {category: list(markers) for category, markers in categories.items()}
+
+        self.markers = []
+        self.marker_categories = []
+        self._marker_ids = {}
+        for category, markers in self.categories.items():
+            for marker in markers:
+                marker = self._normalize(marker)
+                if marker not in self._marker_ids:
+                    self._marker_ids[marker] = len(self.markers)
+                    self.markers.append(marker)
+                    self.marker_categories.append([])
+                self.marker_categories[self._marker_ids[marker]].append(category)
+
+        self._build()
+
+    def _normalize(self, text):
+        """Lowercased tokens joined by single spaces, the form markers are stored and reported in"""
+        return ' '.join(self.TOKEN_PATTERN.findall(text.lower()))
+
+    def _build(self):
+        # Character-level trie over the markers, turned into one nested alternation. Branching on
+        # single characters lets the engine reject most words after one or two comparisons.
+        trie = {}
+        for marker in self.markers:
+            node = trie
+            for unit in self._units(marker):
+                node = node.setdefault(unit, {})
+            node[None] = {}
+
+        def alternation(node):
+            branches = [unit + alternation(child) for unit, child in node.items() if unit is not None]
+            if None in node:
+                # A marker ends here; tried last, so the longest marker at a position wins
+                branches.append('')
+            if len(branches) == 1:
+                return branches[0]
+            return '(?:' + '|'.join(branches) + ')'
+
+        markers = alternation(trie)
+        # count() runs over prepared text; scan() needs positions in the original, so it checks the boundary itself
+        self._pattern = re.compile(' ' + markers + r'(?!\w)')
+        self._scan_pattern = re.compile(r'(?<![^\s' + re.escape(self.PUNCTUATION) + '])' + markers + r'(?!\w)')
+
+        # Markers that occur inside longer markers, which a single regex pass cannot report on its own
+        self._nested = []
+        for marker in self.markers:
+            tokens = marker.split(' ')
+            nested = Counter()
+            for other_id, other in enumerate(self.markers):
+                other_tokens = other.split(' ')
+                if len(other_tokens) >= len(tokens):
+                    continue
+                for start in range(len(tokens) - len(other_tokens) + 1):
+                    if tokens[start:start + len(other_tokens)] == other_tokens:
+                        nested[other_id] += 1
+            self._nested.append(dict(nested))
+        self._nesting = any(self._nested)
+        # count() matches include the space before the marker
+        self._spaced_ids = {' ' + marker: marker_id for marker, marker_id in self._marker_ids.items()}
+        self._nested_patterns = [
+            [(nested_id, re.compile(r'(?<!\w)' + self._phrase(self.markers[nested_id]) + r'(?!\w)')) for nested_id in nested]
+            for nested in self._nested
+        ]
+
+    def _units(self, marker):
+        """A marker's regex as a list of escaped characters and the separators between its tokens"""
+        tokens = marker.split(' ')
+        units = [re.escape(character) for character in tokens[0]]
+        for previous, token in zip(tokens, tokens[1:]):
+            # Words need whitespace between them; punctuation may touch its neighbours
+            units.append(r'\s+' if previous[-1].isalnum() and token[0].isalnum() else r'\s*')
+            units.extend(re.escape(character) for character in token)
+        return units
+
+    def _phrase(self, marker):
+        """Regex for one marker on its own"""
+        return ''.join(self._units(marker))
+
+    def _marker_id(self, found):
+        marker_id = self._marker_ids.get(found)
+        if marker_id is None:
+            # Matched with other whitespace or punctuation spacing than the marker's own
+            marker_id = self._marker_ids[self._normalize(found)]
+        return marker_id
+
+    def scan(self, text):
+        """Return (start, marker) for every marker occurrence in text, in order of their ends"""
+        matches = []
+        for match in self._scan_pattern.finditer(text.lower()):
+            marker_id = self._marker_id(match.group())
+            matches.append((match.end(), match.start(), self.markers[marker_id]))
+            for nested_id, nested_pattern in self._nested_patterns[marker_id]:
+                for nested in nested_pattern.finditer(match.group()):
+                    matches.append((match.start() + nested.end(), match.start() + nested.start(), self.markers[nested_id]))
+        matches.sort()
+        return [(start, marker) for _, start, marker in matches]
+
+    def tokenize(self, text):
+        """The lowercased word and punctuation tokens of text"""
+        return self.TOKEN_PATTERN.findall(text.lower())
+
+    def count(self, text):
+        """
+        Count marker occurrences in text by category, without recording positions.
+        Returns {category: {marker: occurrences}} with an entry for every category.
+        """
+        text = ' ' + text.lower()
+        for character in self.WHITESPACE:
+            if character in text:
+                text = text.replace(character, ' ')
+        for character in self.PUNCTUATION:
+            if character in text:
+                text = text.replace(character, character + ' ')
+
+        occurrences = {}
+        for found in self._pattern.findall(text):
+            marker_id = self._spaced_ids.get(found)
+            if marker_id is None:
+                marker_id = self._marker_id(found[1:])
+            occurrences[marker_id] = occurrences.get(marker_id, 0) + 1
+        if self._nesting:
+            for marker_id, occurrence_count in list(occurrences.items()):
+                for nested_id, nested_count in self._nested[marker_id].items():
+                    occurrences[nested_id] = occurrences.get(nested_id, 0) + nested_count * occurrence_count
+        return self._group(occurrences)
+
+    def count_matches(self, matches):
+        """Group matches from scan by category, like count"""
+        occurrences = {}
+        for _, marker in matches:
+            marker_id = self._marker_ids[marker]
+            occurrences[marker_id] = occurrences.get(marker_id, 0) + 1
+        return self._group(occurrences)
+
+    def _group(self, occurrences):
+        """{category: {marker: occurrences}} from {marker_id: occurrences}, in marker order"""
+        counts = {category: {} for category in self.categories}
+        for marker_id in sorted(occurrences):
+            marker = self.markers[marker_id]
+            for category in self.marker_categories[marker_id]:
+                counts[category][marker] = occurrences[marker_id]
+        return counts
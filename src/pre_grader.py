@@ -0,0 +1,315 @@
+import re
+import importlib.util
+import logging
+import threading
+import numpy as np
+
+from corpus import get_corpus
+from essay_features import EssayFeatureExtractor
+
+logger = logging.getLogger(__name__)
+
+class PreGrader:
+    """
+    Offline band estimate for Task 2 essays, used to decide which essays need the LLM evaluation.
+
+    A ridge regression over the EssayFeatureExtractor features is fitted to the scored example
+    answers in writing_2_samples.json, and its estimates are clamped to the range of their
+    scores. Each estimate gets an interval from the fit's leave-one-out error, narrowed to the
+    confidence_thresholds range of its band in writing/references/task_2_grading_reference.json.
+
+    The few low-band samples are not enough for the regression to find low-band essays, so
+    those are recognised by the reference's own band 4 indicators and capped at a low band:
+    off-task essays, essays far under the minimum length, and essays with both a high density
+    of spelling errors and limited relevance to the question. Essays are graded locally only
+    when they are clearly off-task or the whole interval lies below LLM_BAND_THRESHOLD. Essays
+    whose features lie outside the calibration samples get no regression estimate and, unless
+    capped, go to the LLM like anything uncertain or possibly mid/high band.
+
+    Spelling is checked with the optional pyspellchecker package; without it the spelling
+    indicator is never met and those essays go to the LLM.
+    """
+
+    LLM_BAND_THRESHOLD = 5.0  # essays that could reach this band always get the full evaluation
+    RIDGE = 1.0
+    CONFIDENCE_Z = 0.84  # one-sided 80% bound on the regression error
+    MAX_FEATURE_Z = 4.0  # standardized features beyond this are outside what the fit has seen
+    OFF_TASK_OVERLAP = 0.1  # minimum share of the question's key words the essay must use
+    OFF_TASK_BAND = 4.0
+    UNDER_LENGTH_WORDS = 150  # well under the 250-word minimum, which costs Task Response marks
+    UNDER_LENGTH_BAND = 4.0
+    # Band 4 in the grading reference: "high density of spelling errors" and "limited relevance to
+    # actual question topic". No calibration sample above band 4 shows both.
+    SPELLING_ERROR_RATE = 0.05  # share of lowercase words the spell checker does not know
+    LIMITED_RELEVANCE_OVERLAP = 0.5  # share of the question's key words
+    LOW_BAND = 4.0
+
+    FEATURES = [
+        'word_count', 'paragraph_count', 'mean_sentence_length', 'std_sentence_length',
+        'type_token_ratio', 'has_introduction', 'has_conclusion',
+        'cohesive_device_variety', 'structure_score'
+    ]
+
+    WORD_PATTERN = re.compile(r"[a-z]+")
+    # Whole lowercase words; capitalised words (often names) and contractions are not spell-checked
+    SPELLING_PATTERN = re.compile(r"(?<![\w'])[a-z]+(?![\w'])")
+    # Applied to words the (American English) dictionary does not know before counting them as errors
+    BRITISH_SPELLINGS = [('our', 'or'), ('is', 'iz'), ('ys', 'yz'), ('tre', 'ter'), ('mme', 'm'), ('ll', 'l')]
+    # Common words and the standard Task 2 instructions, which say nothing about the topic
+    STOP_WORDS = {
+        'about', 'above', 'after', 'also', 'answer', 'because', 'before', 'being', 'both', 'could',
+        'discuss', 'does', 'each', 'example', 'examples', 'experience', 'following', 'from', 'give',
+        'have', 'include', 'knowledge', 'least', 'minutes', 'more', 'most', 'opinion', 'other',
+        'others', 'people', 'reasons', 'relevant', 'should', 'some', 'spend', 'such', 'task', 'than',
+        'that', 'their', 'them', 'there', 'these', 'they', 'think', 'this', 'those', 'topic', 'very',
+        'views', 'what', 'when', 'which', 'while', 'will', 'with', 'would', 'words', 'write', 'your'
+    }
+
+    def __init__(self, corpus=None, extractor=None, llm_band_threshold=None):
+        """corpus and extractor default to the shared Corpus and a default EssayFeatureExtractor"""
+        self.corpus = corpus or get_corpus()
+        self.extractor = extractor or EssayFeatureExtractor()
+        self.llm_band_threshold = llm_band_threshold if llm_band_threshold is not None else self.LLM_BAND_THRESHOLD
+        self._lock = threading.Lock()
+        self._model = None
+        self._spell_checker = None
+
+        self.local_count = 0
+        self.llm_count = 0
+
+    def grade(self, answer_text, question=None):
+        """Pre-grade one essay; see grade_many"""
+        return self.grade_many([answer_text], [question])[0]
+
+    def grade_many(self, essays, questions=None):
+        """
+        Pre-grade a batch of essays. questions, if given, holds each essay's question text
+        (a string, a list of lines, or None to skip the checks against the question).
+        Returns one dict per essay: band, low, high, reference_band, topic_overlap,
+        spelling_error_rate, off_task, under_length, low_band (the spelling and relevance
+        indicators), out_of_range (features outside the calibration samples), and route, which
+        is 'local' or 'llm'.
+        """
+        model = self._fit()
+        questions = questions or [None] * len(essays)
+
+        features = self.extractor.extract(essays)
+        standardized = self._standardize(self._select(features), model)
+        estimates = np.clip(model['intercept'] + standardized @ model['weights'], model['min_score'], model['max_score'])
+        out_of_range = np.abs(standardized).max(axis=1) > self.MAX_FEATURE_Z
+        word_counts = self.extractor.column(features, 'word_count')
+
+        results = []
+        for estimate, outlier, word_count, essay, question in zip(estimates, out_of_range, word_counts, essays, questions):
+            overlap = self._topic_overlap(essay, question)
+            spelling_error_rate = self._spelling_error_rate(essay)
+            off_task = overlap is not None and overlap < self.OFF_TASK_OVERLAP
+            under_length = bool(word_count < self.UNDER_LENGTH_WORDS)
+            low_band = (spelling_error_rate is not None and spelling_error_rate >= self.SPELLING_ERROR_RATE
+                        and overlap is not None and overlap < self.LIMITED_RELEVANCE_OVERLAP)
+
+            # Caps bound the band whatever the regression says, so they hold for outliers too
+            ceiling = 9.0
+            if off_task:
+                ceiling = min(ceiling, self.OFF_TASK_BAND)
+            if under_length:
+                ceiling = min(ceiling, self.UNDER_LENGTH_BAND)
+            if low_band:
+                ceiling = min(ceiling, self.LOW_BAND)
+            capped = ceiling < 9.0 and (outlier or estimate > ceiling)
+
+            if outlier and not capped:
+                # The regression would be extrapolating; only the calibration range is known
+                band, low, high = model['intercept'], model['min_score'], model['max_score']
+                reference_band = self._nearest_reference_band(band)
+            else:
+                band = ceiling if capped else estimate
+                reference_band, reference_low, reference_high = self._reference_interval(band)
+                low, high = max(band - model['error'], reference_low), min(band + model['error'], reference_high)
+
+            local = off_task or high < self.llm_band_threshold
+            results.append({
+                'band': self._round_band(band),
+                'low': self._round_band(max(0.0, low)),
+                'high': self._round_band(min(9.0, high)),
+                'reference_band': reference_band,
+                'topic_overlap': overlap,
+                'spelling_error_rate': spelling_error_rate,
+                'off_task': off_task,
+                'under_length': under_length,
+                'low_band': low_band,
+                'out_of_range': bool(outlier),
+                'route': 'local' if local else 'llm'
+            })
+
+        with self._lock:
+            local_count = sum(result['route'] == 'local' for result in results)
+            self.local_count += local_count
+            self.llm_count += len(results) - local_count
+        return results
+
+    def evaluation(self, result):
+        """
+        Evaluation fields (as parsed from an LLM evaluation) for a locally graded essay: the
+        reference's common features of its band, and the next band's requirements as improvements.
+        """
+        reference = self.reference[result['reference_band']]
+        next_bands = sorted((band for band in self.reference if float(band) > float(result['reference_band'])), key=float)
+        next_requirements = self.reference[next_bands[0]]['requirements'] if next_bands else []
+
+        improvements = list(next_requirements[:3])
+        if result['low_band']:
+            improvements.insert(0, "Check your spelling; frequent spelling errors make the essay hard to follow")
+        if result['under_length']:
+            improvements.insert(0, "Write at least 250 words; the essay is far under the minimum length")
+        if result['off_task']:
+            improvements.insert(0, "Answer the question that was asked; the essay does not address its topic")
+
+        return {
+            'band_score': result['band'],
+            'tr_score': None,
+            'cc_score': None,
+            'lr_score': None,
+            'gra_score': None,
+            'strengths': [],
+            'improvements': improvements,
+            'detailed_feedback': (
+                f"Estimated offline at band {result['band']} (likely range {result['low']}-{result['high']}) "
+                f"without a full examiner evaluation. Essays at this level typically show: "
+                f"{'; '.join(feature.lower() for feature in reference['common_features'][:3])}."
+            )
+        }
+
+    def get_report(self):
+        """Get a formatted report of the pre-grading routing"""
+        total = self.local_count + self.llm_count
+        local_share = self.local_count / total * 100 if total else 0
+        model = self._model
+        return f"""
+╔═══════════════════ Pre-Grading Report ══════════════════╗
+║ Essays pre-graded:   {total:,}
+║ Graded locally:      {self.local_count:,} ({local_share:.1f}%)
+║ Sent to the LLM:     {self.llm_count:,}
+║ Calibration samples: {model['samples'] if model else 0}
+║ Estimate error (±):  {model['error'] if model else 0:.2f} bands
+╚═════════════════════════════════════════════════════════╝
+"""
+
+    @property
+    def reference(self):
+        return self.corpus.task_2_grading_reference
+
+    def _fit(self):
+        """Fit the regression to the scored corpus samples, once"""
+        if self._model is not None:
+            return self._model
+        with self._lock:
+            if self._model is None:
+                self._model = self._build_model()
+        return self._model
+
+    def _build_model(self):
+        essays = []
+        scores = []
+        for sample in self.corpus.writing_2_samples['ielts_writing_task_2']['question_examples']:
+            answer = sample.get('answers', {}).get('example_answer', {})
+            try:
+                score = float(answer['score'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            text = answer.get('text', '')
+            essays.append('\n\n'.join(text) if isinstance(text, list) else text)
+            scores.append(score)
+
+        features = self._select(self.extractor.extract(essays))
+        scores = np.asarray(scores)
+        model = {
+            'mean': features.mean(axis=0),
+            'scale': np.where(features.std(axis=0) > 0, features.std(axis=0), 1.0),
+            'intercept': scores.mean(),
+            'min_score': scores.min(),
+            'max_score': scores.max(),
+            'samples': len(scores)
+        }
+
+        # Ridge regression on standardized features, centred so the intercept is not penalized
+        x = self._standardize(features, model)
+        y = scores - model['intercept']
+        inverse = np.linalg.inv(x.T @ x + self.RIDGE * np.eye(x.shape[1]))
+        model['weights'] = inverse @ x.T @ y
+
+        # Leave-one-out residuals come straight from the hat matrix, without refitting
+        leverage = np.einsum('ij,jk,ik->i', x, inverse, x) + 1 / len(scores)
+        residuals = (y - x @ model['weights']) / (1 - leverage)
+        model['error'] = self.CONFIDENCE_Z * float(np.sqrt(np.mean(residuals ** 2)))
+
+        logger.info(f"Pre-grader fitted to {len(scores)} samples, estimate error ±{model['error']:.2f} bands")
+        return model
+
+    def _select(self, features):
+        return np.column_stack([self.extractor.column(features, name) for name in self.FEATURES])
+
+    def _standardize(self, features, model):
+        return (features - model['mean']) / model['scale']
+
+    def _topic_overlap(self, answer_text, question):
+        """Share of the question's key words that appear in the essay, or None without a question"""
+        if not question:
+            return None
+        if isinstance(question, list):
+            question = ' '.join(question)
+        key_words = {word for word in self.WORD_PATTERN.findall(question.lower())
+                     if len(word) > 3 and word not in self.STOP_WORDS}
+        if not key_words:
+            return None
+        essay_words = set(self.WORD_PATTERN.findall(answer_text.lower()))
+        return len(key_words & essay_words) / len(key_words)
+
+    def _spelling_error_rate(self, answer_text):
+        """Share of the essay's lowercase words that are not in the dictionary, or None without a spell checker"""
+        checker = self._get_spell_checker()
+        if checker is None:
+            return None
+        words = self.SPELLING_PATTERN.findall(answer_text)
+        if not words:
+            return 0.0
+        unknown = {word for word in checker.unknown(set(words)) if not checker.known([self._american_spelling(word)])}
+        return sum(word in unknown for word in words) / len(words)
+
+    def _american_spelling(self, word):
+        for british, american in self.BRITISH_SPELLINGS:
+            word = word.replace(british, american)
+        return word
+
+    def _get_spell_checker(self):
+        """pyspellchecker's English dictionary, loaded once; None if the package is not installed"""
+        if self._spell_checker is None:
+            with self._lock:
+                if self._spell_checker is None:
+                    if importlib.util.find_spec('spellchecker') is None:
+                        logger.warning("pyspellchecker is not installed; low-band essays are not recognised by their spelling")
+                        self._spell_checker = False
+                    else:
+                        from spellchecker import SpellChecker
+                        self._spell_checker = SpellChecker()
+        return self._spell_checker or None
+
+    def _reference_interval(self, band):
+        """
+        (reference band, low, high): the nearest reference band whose confidence_thresholds range
+        (min_score to max_score, widened by variance) holds band, and that range
+        """
+        ranges = {}
+        for reference_band, reference in self.reference.items():
+            thresholds = reference['confidence_thresholds']
+            ranges[reference_band] = (thresholds['min_score'] - thresholds['variance'], thresholds['max_score'] + thresholds['variance'])
+        holding = [reference_band for reference_band, (low, high) in ranges.items() if low <= band <= high] or list(ranges)
+        reference_band = min(holding, key=lambda reference_band: abs(float(reference_band) - band))
+        return (reference_band, *ranges[reference_band])
+
+    def _nearest_reference_band(self, band):
+        return min(self.reference, key=lambda reference_band: abs(float(reference_band) - band))
+
+    def _round_band(self, band):
+        """Round to the nearest half band, as IELTS reports scores"""
+        return float(round(band * 2) / 2)
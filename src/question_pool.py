@@ -0,0 +1,148 @@
+import json
+import os
+import random
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+class QuestionPool:
+    """
+    Persistent pool of pre-generated questions, one bucket per question type,
+    kept topped up to a fixed depth by a background worker thread.
+    """
+
+    def __init__(self, generate, question_types, path, depth=3, refill_interval=5.0, topic_of=None):
+        """
+        generate(question_type, pooled_topics) must return a new question dict (or raise).
+        topic_of(question), if given, returns a question's topic so the pool can keep topics diverse.
+        """
+        self.generate = generate
+        self.question_types = list(question_types)
+        self.path = path
+        self.depth = depth
+        self.refill_interval = refill_interval
+        self.topic_of = topic_of
+
+        self.buckets = {question_type: deque() for question_type in self.question_types}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._dirty = False
+        self._worker = None
+
+        self._load()
+
+    def pop(self, question_type=None, avoid_topics=None):
+        """
+        Take a pre-generated question from the pool without calling the LLM.
+        Returns (question_type, question), or None if the bucket is empty.
+        Questions whose topic is in avoid_topics are skipped when an alternative is queued.
+        """
+        with self._lock:
+            if question_type is None:
+                available = [t for t, bucket in self.buckets.items() if bucket]
+                if not available:
+                    return None
+                question_type = random.choice(available)
+
+            bucket = self.buckets.get(question_type)
+            if not bucket:
+                return None
+
+            question = None
+            if avoid_topics and self.topic_of:
+                for index, candidate in enumerate(bucket):
+                    if self.topic_of(candidate) not in avoid_topics:
+                        question = candidate
+                        del bucket[index]
+                        break
+            if question is None:
+                question = bucket.popleft()
+            self._dirty = True
+
+        # Let the worker refill the bucket straight away
+        self._wake.set()
+        return question_type, question
+
+    def sizes(self):
+        """Number of queued questions per type"""
+        with self._lock:
+            return {question_type: len(bucket) for question_type, bucket in self.buckets.items()}
+
+    def refill(self):
+        """Top every bucket up to the configured depth"""
+        for question_type in self.question_types:
+            while len(self.buckets[question_type]) < self.depth and not self._stop.is_set():
+                try:
+                    question = self.generate(question_type, self._pooled_topics())
+                except Exception as e:
+                    logger.error(f"Error generating {question_type} question for the pool: {e}")
+                    break
+
+                with self._lock:
+                    self.buckets[question_type].append(question)
+                    self._dirty = True
+        self.save()
+
+    def start(self):
+        """Start the background refill worker"""
+        if self._worker and self._worker.is_alive():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name="question-pool-refill", daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout=None):
+        """Stop the background refill worker and save the pool"""
+        self._stop.set()
+        self._wake.set()
+        if self._worker:
+            self._worker.join(timeout)
+        self.save()
+
+    def save(self):
+        """Write the pool to disk if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                'depth': self.depth,
+                'questions': {question_type: list(bucket) for question_type, bucket in self.buckets.items()}
+            }
+            self._dirty = False
+
+        try:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error saving question pool: {e}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refill()
+            self._wake.wait(self.refill_interval)
+            self._wake.clear()
+
+    def _pooled_topics(self):
+        if not self.topic_of:
+            return []
+        with self._lock:
+            return [self.topic_of(question) for bucket in self.buckets.values() for question in bucket]
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Error loading question pool: {e}")
+            return
+
+        for question_type, questions in data.get('questions', {}).items():
+            if question_type in self.buckets:
+                self.buckets[question_type].extend(questions)
@@ -1,15 +1,441 @@
 import anthropic
+import json
+import random
+import os
+from dotenv import load_dotenv
+import logging
+import traceback
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from clients import get_client
+from scheduler import get_scheduler
+from corpus import get_corpus
 
-client = anthropic.Anthropic()
-
-message = client.messages.create(
-    model="claude-3-5-sonnet-20241022",
-    max_tokens=100,
-    temperature=0,
-    system= "This is a system prompt. The assistant is Claude created by anthropic \\n Claude's purpose is to generate IELTS exams for human practice.\\n When Human asks for an IELTS reading example Claude generates a novel reading IELTS exam that will be used by human to practice. The reading exam generated by Claude follows the international IELTS standards and formats like the question types, templates and length. \\n Claude follows the IELTS question generation template as given \\n\n\n{\n    \"reading\": {\n        \"description\": [\n            \"Texts come from books, journals, magazines, newspapers and online resources, written for a non-specialist audience. All the topics are of general interest to students at undergraduate or postgraduate level. The texts may be written in different styles, for example, narrative, descriptive or discursive/argumentative. At least one text contains detailed logical argument. Texts may also contain diagrams, graphs or illustrations. If texts use technical vocabulary, then a simple dictionary definition is provided.\",\n            \"Students will need to transfer their answers to an answer sheet. Students must transfer their answers during the hour they are given for the Reading test. Unlike the Listening test, no extra transfer time is given. Students should be careful when writing their answers on the answer sheet because they will lose marks for incorrect spelling and grammar.\"\n        ],\n        \"summary\": {\n            \"time_allowed\": \"60 minutes\",\n            \"number_of_sections\": [\n                3,\n                \"the total text length is 2,150-2,750 words\"\n            ],\n            \"number_of_questions\": 40,\n            \"marking\": \"Each correct answer receives 1 mark. Students' final score is given as a band score from 1-9 in whole or half bands, e.g. 4 or 6.5.\"\n        },\n        \"types_of_questions\": {\n            \"multiple_choice\": {\n                \"what_is_involved\": [\n                    \"This type of question may be a question with three possible answers or the first half of a sentence with three possible sentence endings. Students have to choose one correct answer, A, B or C, then write the correct letter on the answer sheet.\",\n                    \"Sometimes students are given a longer list of possible answers and they have to choose more than one answer. Students should read the question carefully to check how many answers they need to choose.\",\n                    \"The questions are in the same order as the information in the text: that is, the answer to the first question will be before the answer to the second question, and so on.\"\n                ],\n                \"tested_skills\": \"This type of question tests many different reading skills including: detailed understanding of specific points or general understanding of the main points of the text.\",\n                \"number_of_questions\": \"Varies\"\n            },\n            \"identifying_information\": {\n                \"what_is_involved\": \"In this type of question, students are given a number of statements and are asked: 'Do the following statements agree with the information in the text?' Students have to write 'True', 'False' or 'Not given' in the boxes on their answer sheet. It is important to understand the difference between 'False' and 'Not given'. 'False' means that the statement contradicts the information in the text. 'Not given' means that the statement neither agrees with nor contradicts the information in the text. Students must be careful not to use any information they already know about the topic of the text when choosing their answer.\",\n                \"tested_skills\": [\n                    \"This type of question tests students ability to recognise specific information given in the text.\"\n                ],\n                \"number_of_questions\": \"Varies\"\n            },\n            \"identifying_writer_opinion\": {\n                \"what_is_involved\": \"In this type of question, students are given a number of statements and asked: 'Do the following statements agree with the views of the writer?' or 'Do the following statements agree with the claims of the writer?' Students have to write 'Yes', 'No' or 'Not given' in the boxes on their answer sheet. It is important to understand the difference between 'no' and 'not given'. 'No' means that the statement contradicts the writer's view or claim. 'Not given' means that the statement neither agrees with nor contradicts the writer's view or claim. Students must be careful not to use any information they already know about the topic of the text when choosing their answer.\",\n                \"tested_skills\": \"This type of question tests students' ability to recognise opinions or ideas.\",\n                \"number_of_questions\": \"Varies\"\n            },\n            \"matching_information\": {\n                \"what_is_involved\": \"In this type of question, students have to find specific information in the paragraphs (or sections) of a text. The paragraphs (or sections) are identified by letters (A, B, C, etc.). Students will need to write the letters of the correct paragraphs (or sections) in the boxes on their answer sheet. Not every paragraph (or section) may be used and some paragraphs (or sections) may be used more than once. When the paragraphs (or sections) may be used more than once, the instructions will say: 'Students may use any letter more than once'.\",\n                \"tested_skills\": \"This type of question assesses students' ability to scan a text in order to find specific information. Unlike Task Type 5 (Matching headings), it focuses on specific information rather than the main idea. Students may have to find: specific details, an example, reason, description, comparison, summary or explanation.\",\n                \"number_of_questions\": \"Varies\"\n            },\n            \"matching_headings\": {\n                \"what_is_involved\": \"In this type of question, there is a list of headings which are identified by Roman numerals (i, ii, iii, etc.). A heading summarises the main idea of a paragraph or section of the text. Students must match the heading to the correct paragraph or section. Students will need to write the correct Roman numerals in the boxes on their answer sheet. There will always be more headings than paragraphs or sections, so some headings will not be used. It is also possible that some paragraphs or sections may not be included in the task. One or more paragraphs or sections may already be matched with a heading as an example on the question paper. No heading may be used more than once.\",\n                \"tested_skills\": \"This type of question tests students' ability to identify the general topic of a paragraph (or section) and to recognise the difference between the main idea and a supporting idea.\",\n                \"number_of_questions\": \"Varies\"\n            },\n            \"matching_features\": {\n                \"what_is_involved\": \"In this type of question, students have to match a set of statements or pieces of information to a list of options. The options are a group of features from the text, and letters (A, B, C, etc.) are used to identify them. Students will need to write the correct letter on the answer sheet. Students may, for example, have to match descriptions of inventions to the people who invented them. It is possible that some options will not be used, and that others may be used more than once. When it is possible to use any option more than once, the instructions will say: 'Students may use any option more than once'.\",\n                \"tested_skills\": \"This type of question tests students' ability to recognise relationships and connections between facts in the text and their ability to recognise opinions and theories. Students need to be able to skim and scan the text to find the information quickly so that they can then read that part more carefully for detail.\",\n                \"number_of_questions\": \"Varies\"\n            },\n            \"matching_sentence_endings\": {\n                \"what_is_involved\": \"In this type of question, students are given the first half of a sentence based on information in the text and they have to choose the best way to complete the sentence by choosing from a list of possible endings. The endings are identified by letters (A, B, C, etc.). There will be more sentence endings than beginnings, so students will not use all of them. Students must write the letter they choose on the answer sheet. The sentence beginnings are in the same order as the information in the text.\",\n                \"tested_skills\": \"This type of question tests students' ability to understand the main ideas in the text.\",\n                \"number_of_questions\": \"Varies\"\n            },\n            \"sentence_completion\": {\n                \"what_is_involved\": [\n                    \"In this type of question, students have to fill in a gap in each sentence by choosing words from the text. Students must write the words they choose on the answer sheet.\",\n                    \"Students should read the instructions very carefully as the number of words or numbers they may use to fill the gaps can change. A word limit is given, for example, 'NO MORE THAN TWO WORDS AND/OR A NUMBER'. Students will lose the mark for writing more than the word limit. Contracted words such as 'they`re' will not be tested. Hyphenated words such as 'check-in' count as single words.\",\n                    \"The questions are in the same order as the information in the text.\"\n                ],\n                \"tested_skills\": \"This type of question tests students' ability to find detail/specific information in a text.\",\n                \"number_of_questions\": \"Varies\"\n            },\n            \"summary/note/table/flow_chart_completion\": {\n                \"what_is_involved\": [\n                    \"In this type of question, students are given a summary of a part of the text, and have to complete it using words taken from the text. Note that the summary is not normally of the whole text. The summary may be in the form of:\",\n                    \"a continuous text (called 'a summary' in the instructions)\",\n                    \"several notes (called 'notes' in the instructions)\",\n                    \"a table with some parts of it left empty or partially empty (called 'a table' in the instructions)\",\n                    \"a series of boxes or steps linked by arrows to show the order of events, with some of the boxes or steps empty or partially empty (called 'a flow chart' in the instructions).\",\n                    \"The answers may not come in the same order as in the text. However, they will usually come from one part of the text rather than the whole text.\",\n                    \"There are two variations of this task type. In the first variation, students need to select words from the text which fit into gaps on the question paper. Students must write the words they choose on the answer sheet.\",\n                    \"Students should read the instructions very carefully as the number of words or numbers they may use to fill the gaps can change. A word limit is given, for example, 'NO MORE THAN TWO WORDS AND/OR A NUMBER'. Students will lose the mark for writing more than the word limit. Contracted words such as 'they`re' will not be tested. Hyphenated words such as 'check-in' count as single words.\",\n                    \"In the second variation, students have to choose from a list of words to fill the gaps. The words are identified by letters (A, B, C, etc.).\",\n                    \"Students must write the letter they choose on the answer sheet.\"\n                ],\n                \"tested_skills\": \"This type of question tests students' ability to understand details and/or the main ideas of a part of the text. When completing this type of question, students will need to think about the type of word(s) that will fit into a gap (for example, whether a noun is needed, or a verb, etc.).\",\n                \"number_of_questions\": \"Varies\"\n            },\n            \"diagram_label_completion\": {\n                \"what_is_involved\": [\n                    \"In this type of question, students have to complete the labels on a diagram. The diagram is based on a description given in the text. The diagram may be a type of machine, part of a building or of other information in the text that can be shown through pictures. Students must write the words that fit into the gap on the answer sheet.\",\n                    \"Students should read the instructions very carefully as the number of words or numbers they may use to fill the gaps can change. A word limit is given, for example, 'NO MORE THAN TWO WORDS AND/OR A NUMBER'. Students will lose the mark for writing more than the word limit. Contracted words such as 'they`re' will not be tested. Hyphenated words such as 'check-in' count as single words.\",\n                    \"The answers may not come in the same order as in the text. However, they will usually come from one part of the text rather than the whole text.\"\n                ],\n                \"tested_skills\": \"This type of question tests students' ability to understand a detailed description in the text, and then relate that description to information given in a diagram.\",\n                \"number_of_questions\": \"Varies\"\n            },\n            \"short_answer_questions\": {\n                \"what_is_involved\": [\n                    \"In this type of question, students have to answer questions about factual details in the text. Students must write their answers in words or numbers on the answer sheet.\",\n                    \"Answers must be taken from words in the text. A word limit is given, for example, 'NO MORE THAN TWO WORDS AND/OR A NUMBER'. Students will lose the mark for writing more than the word limit. Numbers can be written using figures (1, 2, etc.) or words (one, two, etc.). Contracted words such as 'they`re' will not be tested. Hyphenated words such as 'check-in' count as single words. The answers come in the same order as the information in the text.\"\n                ],\n                \"tested_skills\": \"This type of question tests students' ability to find and understand specific information in the text.\",\n                \"number_of_questions\": \"Varies\"\n            }\n        }\n    }\n}\n\nClaude also follows a consistent level of proficiency in the generated exams for the human so all generated IELTS exams are of similiar difficulty.\\n Claude generates the questions on the basis of measurability by at least these metrics:\\n\n\n{\n    \"A1\": {\n        \"level_name\": \"Beginner\",\n        \"general_description\": \"Can understand and use familiar everyday expressions and very basic phrases aimed at the satisfaction of needs of a concrete type. Can introduce themselves and others and can ask and answer questions about personal details such as where someone lives, people they know and things they have. Can interact in a simple way provided the other person talks slowly and clearly and is prepared to help.\",\n        \"skills\": {\n            \"reading\": [\n                \"Can understand short texts and simple signs, such as labels and instructions. They can recognize familiar words and phrases.\"\n            ]\n        },\n        \"ielts_equivalent\": \"Below 4.0\"\n    },\n    \"A2\": {\n        \"level_name\": \"Elementary\",\n        \"general_description\": \"Can understand sentences and frequently used expressions related to areas of most immediate relevance (e.g. very basic personal and family information, shopping, local geography, employment). Can communicate in simple and routine tasks requiring a simple and direct exchange of information on familiar and routine matters. Can describe in simple terms aspects of their background, immediate environment and matters in areas of immediate need.\",\n        \"skills\": {\n            \"reading\": [\n                \"Can understand sentences and frequently used expressions related to everyday situations, such as personal information, shopping, and places of interest. They can read short texts on familiar subjects.\"\n            ]\n        },\n        \"ielts_equivalent\": \"Up to 4.0\"\n    },\n    \"B1\": {\n        \"level_name\": \"Intermediate\",\n        \"general_description\": \"Can understand the main points of clear standard input on familiar matters regularly encountered in work, school, leisure, etc. Can deal with most situations likely to arise whilst travelling in an area where the language is spoken. Can produce simple connected text on topics, which are familiar, or of personal interest. Can describe experiences and events, dreams, hopes & ambitions and briefly give reasons and explanations for opinions and plans.\",\n        \"skills\": {\n            \"reading\": [\n                \"Can read straightforward texts on subjects related to their interests.\",\n                \"Can understand descriptions of events, feelings, and wishes in personal letters.\"\n            ]\n        },\n        \"ielts_equivalent\": \"4.5-5.5\"\n    },\n    \"B2\": {\n        \"level_name\": \"Upper-Intermediate\",\n        \"general_description\": \"Can understand the main ideas of complex text on both concrete and abstract topics, including technical discussions in their field of specialisation. Can interact with a degree of fluency and spontaneity that makes regular interaction with native speakers quite possible without strain for either party. Can produce clear, detailed text on a wide range of subjects and explain a viewpoint on a topical issue giving the advantages and disadvantages of various options.\",\n        \"skills\": {\n            \"reading\": [\n                \"Can read articles and reports concerned with contemporary problems in which the writers adopt particular attitudes or viewpoints.\",\n                \"Can understand a wide range of texts, including some that are more complex or specialized.\"\n            ]\n        },\n        \"ielts_equivalent\": \"5.5-6.5\"\n    },\n    \"C1\": {\n        \"level_name\": \"Advanced\",\n        \"general_description\": \"Can understand a wide range of demanding, longer texts, and recognise implicit meaning. Can express themself fluently and spontaneously without much obvious searching for expressions. Can use language flexibly and effectively for social, academic and professional purposes. Can produce clear, well-structured, detailed text on complex subjects, showing controlled use of organisational patterns, connectors and cohesive devices.\",\n        \"skills\": {\n            \"reading\": [\n                \"Can understand a wide range of demanding texts, including abstract topics and implicit meanings. They can analyze and interpret complex materials effectively.\"\n            ]\n        },\n        \"ielts_equivalent\": \"7.0-8.0\"\n    },\n    \"C2\": {\n        \"level_name\": \"Proficient\",\n        \"general_description\": \"Can understand with ease virtually everything heard or read. Can summarise information from different spoken and written sources, reconstructing arguments and accounts in a coherent presentation. Can express themself spontaneously, very fluently and precisely, differentiating finer shades of meaning even in more complex situations.\",\n        \"skills\": {\n            \"reading\": [\n                \"Can understand virtually everything read with ease, including complex texts and literary works. They can analyze and interpret nuanced meanings and implicit themes in a variety of genres.\"\n            ]\n        },\n        \"ielts_equivalent\": \"8.0-9.0\"\n    }\n}\n\nHere is an example IELTS reading exam for Claude given in json format: \\n\n\n{\n    \"books\": [\n        {\n            \"id\": \"ielts_16_1\",\n            \"tests\": [\n                {\n                    \"id\": \"test_1_1\",\n                    \"passage_number\": 1,\n                    \"heading\": \"Why we need to protect polar bears\",\n                    \"text\": [\n                        \"Polar bears are being increasingly threatened by the effects of climate change, but their disappearance could have far-reaching consequences. They are uniquely adapted to the extreme conditions of the Arctic Circle, where temperatures can reach -40°C. One reason for this is that they have up to 11 centimetres of fat underneath their skin. Humans with comparative levels of adipose tissue would be considered obese and would be likely to suffer from diabetes and heart disease. Yet the polar bear experiences no such consequences.\",\n                        \"A 2014 study by Shi Ping Liu and colleagues sheds light on this mystery. They compared the genetic structure of polar bears with that of their closest relatives from a warmer climate, the brown bears. This allowed them to determine the genes that have allowed polar bears to survive in one of the toughest environments on Earth. Liu and his colleagues found the polar bears had a gene known as APoB, which reduces levels of low-density lipoproteins (LDLs) – a form of 'bad' cholesterol. In humans, mutations of this gene are associated with increased risk of heart disease. Polar bears may therefore be an important study model to understand heart disease in humans.\",\n                        \"The genome of the polar bear may also provide the solution for another condition, one that particularly affects our older generation: osteoporosis. This is a disease where bones show reduced density, usually caused by insufficient exercise, reduced calcium intake or food starvation. Bone tissue is constantly being remodelled, meaning that bone is added or removed, depending on nutrient availability and the stress that the bone is under. Female polar bears, however, undergo extreme conditions during every pregnancy. Once autumn comes around, these females will dig maternity dens in the snow and will remain there throughout the winter, both before and after the birth of their cubs. This process results in about six months of fasting, where the female bears have to keep themselves and their cubs alive, depleting their own calcium and calorie reserves. Despite this, their bones remain strong and dense.\",\n                        \"Physiologists Alanda Lennox and Allen Goodship found an explanation for this paradox in 2008. They discovered that pregnant bears were able to increase the density of their bones before they started to build their dens. In addition, six months later, when they finally emerged from the den with their cubs, there was no evidence of significant loss of bone density. Hibernating brown bears do not have this capacity and must therefore resort to major bone reformation in the following spring. If the mechanism of bone remodelling in polar bears can be understood, many bedridden humans, and even astronauts, could potentially benefit.\",\n                        \"The medical benefits of the polar bear for humanity certainly have their importance in our conservation efforts, but these should not be the only factors taken into consideration. We tend to want to protect animals we think are intelligent and possess emotions, such as elephants and primates. Bears, on the other hand, seem to be perceived as stupid and in many cases violent. And yet anecdotal evidence from the field challenges those assumptions, suggesting for example that polar bears have good problem-solving abilities. A male bear called GoGo in Tennoji Zoo, Osaka, has even been observed making use of a tool to manipulate his environment. The bear used a tree branch on multiple occasions to dislodge a piece of meat hung out of his reach. Problem-solving ability has also been witnessed in wild polar bears, although not as obviously as with GoGo. A calculated move by a male bear involved running and jumping onto barrels in an attempt to get to a photographer standing on a platform four metres high.\",\n                        \"In other studies, such as one by Alison Ames in 2008, polar bears showed deliberate and focussed manipulation. For example, Ames observed bears putting objects in piles and then knocking them over in what appeared to be a game. The study demonstrates that bears are capable of agile and thought-out behaviours. These examples suggest bears have greater creativity and problem-solving abilities than previously thought.\",\n                        \"As for emotions, while the evidence is once again anecdotal, many bears have been seen to hit out at ice and snow – seemingly out of frustration – when they have just missed out on a kill. Moreover, polar bears can form unusual relationships with other species, including playing with the dogs used to pull sleds in the Arctic. Remarkably, one hand-raised polar bear called Agee has formed a close relationship with her owner Mark Dumas to the point where they even swim together. This is even more astonishing since polar bears are known to actively hunt humans in the wild.\",\n                        \"If climate change were to lead to their extinction, this would mean not only the loss of potential breakthroughs in human medicine, but more importantly, the disappearance of an intelligent, majestic animal.\"\n                    ],\n                    \"questions\": [\n                        {\n                            \"id\": \"question_set_1\",\n                            \"type\": \"identifying_information\",\n                            \"question\": [\n                                \"TRUE if the statement agrees with the information\",\n                                \"FALSE if the statement contradicts the information\",\n                                \"NOT GIVEN if there is no information on this\",\n                                \"Polar bears suffer from various health problems due to the build-up of fat under their skin.\",\n                                \"The study done by Liu and his colleagues compared different groups of polar bears.\",\n                                \"Liu and colleagues were the first researchers to compare polar bears and brown bears genetically.\",\n                                \"Polar bears are able to control their levels of 'bad' cholesterol by genetic means.\",\n                                \"Female polar bears are able to survive for about six months without food.\",\n                                \"It was found that the bones of female polar bears were very weak when they came out of their dens in spring.\",\n                                \"The polar bear's mechanism for increasing bone density could also be used by people one day.\"\n                            ],\n                            \"answers\": [\n                                \"FALSE\",\n                                \"FALSE\",\n                                \"NOT GIVEN\",\n                                \"TRUE\",\n                                \"TRUE\",\n                                \"TRUE\"\n                            ]\n                        },\n                        {\n                            \"id\": \"question_set_2\",\n                            \"type\": \"sentence_completion\",\n                            \"question\": [\n                                \"People think of bears as unintelligent and ...........\",\n                                \"However, this may not be correct. For example:\",\n                                \"* In Tennoji Zoo, a bear has been seen using a branch as a ...........\",\n                                \"* This allowed him to knock down some ...........\",\n                                \"* A wild polar bear worked out a method of reaching a platform where a ........... was located.\",\n                                \"* Polar bears have displayed behaviour such as conscious manipulation of objects and activity similar to a ...........\",\n                                \"Bears may also display emotions. For example:\",\n                                \"* They may make movements suggesting ........... if disappointed when hunting.\",\n                                \"* They may form relationships with other species.\"\n\n                            ],\n                            \"answers\": [\n                                \"violent\",\n                                \"tool\",\n                                \"meat\",\n                                \"photographer\",\n                                \"game\",\n                                \"frustration\"\n                            ]\n                        }\n                    ]\n                },\n                {\n                    \"id\": \"test_1_2\",\n                    \"passage_number\": 2,\n                    \"heading\": \"The Step Pyramid of Djoser\",\n                    \"text\": [\n                        \"A: The pyramids are the most famous monuments of ancient Egypt and still hold enormous interest for people in the present day. These grand, impressive tributes to the memory of the Egyptian kings have become linked with the country even though other cultures, such as the Chinese and Mayan, also built pyramids. The evolution of the pyramid form has been written and argued about for centuries. However, there is no question that, as far as Egypt is concerned, it began with one monument to one king designed by one brilliant architect: the Step Pyramid of Djoser at Saqqara.\",\n                        \"B: Djoser was the first king of the Third Dynasty of Egypt and the first to build in stone. Prior to Djoser's reign, tombs were rectangular monuments made of dried clay brick, which covered underground passages where the deceased person was buried. For reasons which remain unclear, Djoser's main official, whose name was Imhotep, conceived of building a taller, more impressive tomb for his king by stacking stone slabs on top of one another, progressively making them smaller, to form the shape now known as the Step Pyramid. Djoser is thought to have reigned for 19 years, but some historians and scholars attribute a much longer time for his rule, owing to the number and size of the monuments he built.\",\n                        \"C: The Step Pyramid has been thoroughly examined and investigated over the last century, and it is now known that the building process went through many different stages. Historian Marc Van de Mieroop comments on this, writing 'Much experimentation was involved, which is especially clear in the construction of the pyramid in the center of the complex. It had several plans ... before it became the first Step Pyramid in history, piling six levels on top of one another ... The weight of the enormous mass was a challenge for the builders, who placed the stones at an inward incline in order to prevent the monument breaking up.'\",\n                        \"D: When finally completed, the Step Pyramid rose 62 meters high and was the tallest structure of its time. The complex in which it was built was the size of a city in ancient Egypt and included a temple, courtyards, shrines, and living quarters for the priests. It covered a region of 16 hectares and was surrounded by a wall 10.5 meters high. The wall had 13 false doors cut into it with only one true entrance cut into the south-east corner; the entire wall was then ringed by a trench 750 meters long and 40 meters wide. The false doors and the trench were incorporated into the complex to discourage unwanted visitors. If someone wished to enter, he or she would have needed to know in advance how to find the location of the true opening in the wall. Djoser was so proud of his accomplishment that he broke the tradition of having only his own name on the monument and had Imhotep's name carved on it as well.\",\n                        \"E: The burial chamber of the tomb, where the king's body was laid to rest, was dug beneath the base of the pyramid, surrounded by a vast maze of long tunnels that had rooms off them to discourage robbers. One of the most mysterious discoveries found inside the pyramid was a large number of stone vessels. Over 40,000 of these vessels, of various forms and shapes, were discovered in storerooms off the pyramid's underground passages. They are inscribed with the names of rulers from the First and Second Dynasties of Egypt and made from different kinds of stone. There is no agreement among scholars and archaeologists on why the vessels were placed in the tomb of Djoser or what they were supposed to represent. The archaeologist Jean-Philippe Lauer, who excavated most of the pyramid and complex, believes they were originally stored and then given a 'proper burial' by Djoser in his pyramid to honor his predecessors. There are other historians, however, who claim the vessels were dumped into the shafts as yet another attempt to prevent grave robbers from getting to the king's burial chamber.\",\n                        \"F: Unfortunately, all of the precautions and intricate design of the underground network did not prevent ancient robbers from finding a way in. Djoser's grave goods, and even his body, were stolen at some point in the past and all archaeologists found were a small number of his valuables overlooked by the thieves. There was enough left throughout the pyramid and its complex, however, to astonish and amaze the archaeologists who excavated it.\",\n                        \"G: Egyptologist Miroslav Verner writes, 'Few monuments hold a place in human history as significant as that of the Step Pyramid in Saqqara ... It can be said without exaggeration that this pyramid complex constitutes a milestone in the evolution of monumental stone architecture in Egypt and in the world as a whole.' The Step Pyramid was a revolutionary advance in architecture and became the archetype which all the other great pyramid builders of Egypt would follow.\"\n                    ],\n                    \"questions\": [\n                        {\n                            \"id\": \"question_set_1\",\n                            \"type\": \"matching_headings\",\n                            \"question\": [\n                                \"List of Headings:\",\n                                \"i: The areas and artefacts within the pyramid itself\",\n                                \"ii: A difficult task for those involved\",\n                                \"iii: A king who saved his people\",\n                                \"iv: A single certainty among other less definite facts\",\n                                \"v: An overview of the external buildings and areas\",\n                                \"vi: A pyramid design that others copied\",\n                                \"vii: An idea for changing the design of burial structures\",\n                                \"viii: An incredible experience despite the few remains\",\n                                \"ix: The answers to some unexpected questions\"\n                            ],\n                            \"answers\": [\n                                \"A is iv\",\n                                \"B is vii\",\n                                \"C is ii\",\n                                \"D is v\",\n                                \"E is i\",\n                                \"F is viii\",\n                                \"G is vi\"\n                            ]\n                        },\n                        {\n                            \"id\": \"question_set_2\",\n                            \"type\": \"sentence_completion\",\n                            \"question\": [\n                                \"The complex that includes the Step Pyramid and its surroundings is considered to be as big as an Egyptian .......... of the past. The area outside the pyramid included accommodation that was occupied by .......... , along with many other buildings and features.\",\n                                \"A wall ran around the outside of the complex and a number of false entrances were built into this. In addition, a long .......... encircled the wall. As a result, any visitors who had not been invited were cleverly prevented from entering the pyramid grounds unless they knew the .......... of the real entrance.\"\n                            ],\n                            \"answers\": [\n                                \"city\",\n                                \"priests\",\n                                \"trench\",\n                                \"location\"\n                            ]\n                        },\n                        {\n                            \"id\": \"question_set_3\",\n                            \"type\": \"matching_features\",\n                            \"question\": [\n                                \"Which TWO of the following points does the writer make about King Djoser?\",\n                                \"A: Initially he had to be persuaded to build in stone rather than clay.\",\n                                \"B: There is disagreement concerning the length of his reign.\",\n                                \"C: He failed to appreciate Imhotep's part in the design of the Step Pyramid.\",\n                                \"D: A few of his possessions were still in his tomb when archaeologists found it.\",\n                                \"E: He criticised the design and construction of other pyramids in Egypt.\"\n                            ],\n                            \"answers\": [\n                                \"B and D\"\n                            ]\n                        }\n                    ]\n                },\n                {\n                    \"id\": \"test_1_3\",\n                    \"passage_number\": 3,\n                    \"heading\": \"The future of work\",\n                    \"text\": [\n                        \"According to a leading business consultancy, 3-14% of the global workforce will need to switch to a different occupation within the next 10-15 years, and all workers will need to adapt as their occupations evolve alongside increasingly capable machines. Automation – or 'embodied artificial intelligence' (AI) – is one aspect of the disruptive effects of technology on the labour market. 'Disembodied AI', like the algorithms running in our smartphones, is another.\",\n                        \"Dr Stella Pachidi from Cambridge Judge Business School believes that some of the most fundamental changes are happening as a result of the 'algorithmication' of jobs that are dependent on data rather than on production – the so-called knowledge economy. Algorithms are capable of learning from data to undertake tasks that previously needed human judgement, such as reading legal contracts, analysing medical scans and gathering market intelligence.\",\n                        \"'In many cases, they can outperform humans,' says Pachidi. 'Organisations are attracted to using algorithms because they want to make choices based on what they consider is 'perfect information', as well as to reduce costs and enhance productivity.'\",\n                        \"'But these enhancements are not without consequences,' says Pachidi. 'If routine cognitive tasks are taken over by AI, how do professions develop their future experts?' she asks. 'One way of learning about a job is 'legitimate peripheral participation' – a novice stands next to experts and learns by observation. If this isn't happening, then you need to find new ways to learn.'\",\n                        \"Another issue is the extent to which the technology influences or even controls the workforce. For over two years, Pachidi monitored a telecommunications company. 'The way telecoms salespeople work is through personal and frequent contact with clients, using the benefit of experience to assess a situation and reach a decision. However, the company had started using a[n] ... algorithm that defined when account managers should contact certain customers about which kinds of campaigns and what to offer them.'\",\n                        \"The algorithm – usually built by external designers – often becomes the keeper of knowledge, she explains. In cases like this, Pachidi believes, a short-sighted view begins to creep into working practices whereby workers learn through the 'algorithm's eyes' and become dependent on its instructions. Alternative explorations – where experimentation and human instinct lead to progress and new ideas – are effectively discouraged.\",\n                        \"Pachidi and colleagues even observed people developing strategies to make the algorithm work to their own advantage. 'We are seeing cases where workers feed the algorithm with false data to reach their targets,' she reports.\",\n                        \"It's scenarios like these that many researchers are working to avoid. Their objective is to make AI technologies more trustworthy and transparent, so that organisations and individuals understand how AI decisions are made. In the meantime, says Pachidi, 'We need to make sure we fully understand the dilemmas that this new world raises regarding expertise, occupational boundaries and control.'\",\n                        \"Economist Professor Hamish Low believes that the future of work will involve major transitions across the whole life course for everyone: 'The traditional trajectory of full-time education followed by full-time work followed by a pensioned retirement is a thing of the past,' says Low. Instead, he envisages a multistage employment life: one where retraining happens across the life course, and where multiple jobs and no job happen by choice at different stages.\",\n                        \"On the subject of job losses, Low believes the predictions are founded on a fallacy: 'It assumes that the number of jobs is fixed. If in 30 years, half of 100 jobs are being carried out by robots, that doesn't mean we are left with just 50 jobs for humans. The number of jobs will increase: we would expect there to be 150 jobs.'\",\n                        \"Dr Ewan McGaughey, at Cambridge's Centre for Business Research and King's College London, agrees that 'apocalyptic' views about the future of work are misguided. 'It's the laws that restrict the supply of capital to the job market, not the advent of new technologies that causes unemployment.'\",\n                        \"His recently published research answers the question of whether automation, AI and robotics will mean a 'jobless future' by looking at the causes of unemployment. 'History is clear that change can mean redundancies. But social policies can tackle this through retraining and redeployment.'\",\n                        \"He adds: 'If there is going to be change to jobs as a result of AI and robotics then I'd like to see governments seizing the opportunity to improve policy to enforce good job security. We can 'reprogramme' the law to prepare for a fairer future of work and leisure.' McGaughey's findings are a call to arms to leaders of organisations, governments and banks to pre-empt the coming changes with bold new policies that guarantee full employment, fair incomes and a thriving economic democracy.\",\n                        \"'The promises of these new technologies are astounding. They deliver humankind the capacity to live in a way that nobody could have once imagined,' he adds. 'Just as the industrial revolution brought people past subsistence agriculture, and the corporate revolution enabled mass production, a third revolution has been pronounced. But it will not only be one of technology. The next revolution will be social.'\"\n                    ],\n                    \"questions\": [\n                        {\n                            \"id\": \"question_set_1\",\n                            \"type\": \"multiple_choice\",\n                            \"question\": [\n                                \"1: The first paragraph tells us about\",\n                                \"A: the kinds of jobs that will be most affected by the growth of AI.\",\n                                \"B: the extent to which AI will alter the nature of the work that people do.\",\n                                \"C: the proportion of the world's labour force who will have jobs in AI in the future.\",\n                                \"D: the difference between ways that embodied and disembodied AI will impact on workers.\",\n                                \"2: According to the second paragraph, what is Stella Pachidi's view of the 'knowledge economy'?\",\n                                \"A: It is having an influence on the number of jobs available.\",\n                                \"B: It is changing people's attitudes towards their occupations.\",\n                                \"C: It is the main reason why the production sector is declining.\",\n                                \"D: It is a key factor driving current developments in the workplace.\",\n                                \"3: What did Pachidi observe at the telecommunications company?\",\n                                \"A: staff disagreeing with the recommendations of AI\",\n                                \"B: staff feeling resentful about the intrusion of AI in their work\",\n                                \"C: staff making sure that AI produces the results that they want\",\n                                \"D: staff allowing AI to carry out tasks they ought to do themselves\",\n                                \"4: In his recently published research, Ewan McGaughey\",\n                                \"A: challenges the idea that redundancy is a negative thing.\",\n                                \"B: shows the profound effect of mass unemployment on society.\",\n                                \"C: highlights some differences between past and future job losses.\",\n                                \"D: illustrates how changes in the job market can be successfully handled.\"\n                            ],\n                            \"answers\": [\n                                \"1 is B\",\n                                \"2 is D\",\n                                \"3 is C\",\n                                \"4 is D\"\n                            ]\n                        },\n                        {\n                            \"id\": \"question_set_2\",\n                            \"type\": \"summary/note/table/flow_chart_completion\",\n                            \"question\": [\n                                \"1: Stella Pachidi of Cambridge Judge Business School has been focusing on the 'algorithmication' of jobs which rely not on production but on .......... .\",\n                                \"2: While monitoring a telecommunications company, Pachidi observed a growing ......... on the recommendations made by AI, as workers begin to learn through the 'algorithm's eyes'. Meanwhile, staff are deterred from experimenting and using their own .......... , and are therefore prevented from achieving innovation.\",\n                                \"3: To avoid the kind of situations which Pachidi observed, researchers are trying to make AI's decision-making process easier to comprehend, and to increase users' ......... with regard to the technology.\",\n                                \"A: pressure, B: satisfaction, C: intuition, D: promotion, E: reliance, F: confidence, G: information\"\n                            ],\n                            \"answers\": [\n                                \"1 is G\",\n                                \"2 is E and C\",\n                                \"3 is F\"\n                            ]\n                        },\n                        {\n                            \"id\": \"question_set_3\",\n                            \"type\": \"matching_features\",\n                            \"question\": [\n                                \"Look at the following statements and the list of people below\",\n                                \"Match each statement with the correct person, A, B or C\",\n                                \"NB You may use any letter more than once\",\n                                \"1: Greater levels of automation will not result in lower employment.\",\n                                \"2: There are several reasons why AI is appealing to businesses.\",\n                                \"3: AI's potential to transform people's lives has parallels with major cultural shifts which occurred in previous eras.\",\n                                \"4: It is important to be aware of the range of problems that AI causes.\",\n                                \"5: People are going to follow a less conventional career path than in the past.\",\n                                \"6: Authorities should take measures to ensure that there will be adequately paid work for everyone.\",\n                                \"List of people:\",\n                                \"A: Stella Pachidi\",\n                                \"B: Hamish Low\",\n                                \"C: Ewan McGaughey\"\n                            ],\n                            \"answers\": [\n                                \"1 is B\",\n                                \"2 is A\",\n                                \"3 is C\",\n                                \"4 is A\",\n                                \"5 is B\",\n                                \"6 is C\"\n                            ]\n                        }\n                    ]\n                },\n                {\n                    \"id\": \"test_2_1\",\n                    \"passage_number\": 1,\n                    \"heading\": \"The White Horse of Uffington\",\n                    \"text\": [\n                        \"The cutting of huge figures or 'geoglyphs' into the earth of English hillsides has taken place for more than 3,000 years. There are 56 hill figures scattered around England, with the vast majority on the chalk downlands of the country's southern counties. The figures include giants, horses, crosses and regimental badges. Although the majority of these geoglyphs date within the last 300 years or so, there are one or two that are much older.\",\n                        \"The most famous of these figures is perhaps also the most mysterious – the Uffington White Horse in Oxfordshire. The White Horse has recently been re-dated and shown to be even older than its previously assigned ancient pre-Roman Iron Age* date. More controversial is the date of the enigmatic Long Man of Wilmington in Sussex. While many historians are convinced the figure is prehistoric, others believe that it was the work of an artistic monk from a nearby priory and was created between the 11th and 15th centuries.\",\n                        \"The method of cutting these huge figures was simply to remove the overlying grass to reveal the gleaming white chalk below. However, the grass would soon grow over the geoglyph again unless it was regularly cleaned or scoured by a fairly large team of people. One reason that the vast majority of hill figures have disappeared is that when the traditions associated with the figures faded, people no longer bothered or remembered to clear away the grass to expose the chalk outline. Furthermore, over hundreds of years the outlines would sometimes change due to people not always cutting in exactly the same place, thus creating a different shape to the original geoglyph. The fact that any ancient hill figures survive at all in England today is testament to the strength and continuity of local customs and beliefs which, in one case at least, must stretch back over millennia.\",\n                        \"The Uffington White Horse is a unique, stylised representation of a horse consisting of a long, sleek back, thin disjointed legs, a streaming tail, and a bird-like beaked head. The elegant creature almost melts into the landscape. The horse is situated 2.5 km from Uffington village on a steep slope close to the Late Bronze Age* (c. 7th century BCE) hillfort of Uffington Castle and below the Ridgeway, a long-distance Neolithic** track.\",\n                        \"The Uffington Horse is also surrounded by Bronze Age burial mounds. It is not far from the Bronze Age cemetery of Lambourn Seven Barrows, which consists of more than 30 well-preserved burial mounds. The carving has been placed in such a way as to make it extremely difficult to see from close quarters, and like many geoglyphs is best appreciated from the air. Nevertheless, there are certain areas of the Vale of the White Horse, the valley containing and named after the enigmatic creature, from which an adequate impression may be gained. Indeed on a clear day the carving can be seen from up to 30 km away.\",\n                        \"The earliest evidence of a horse at Uffington is from the 1070s CE when 'White Horse Hill' is mentioned in documents from the nearby Abbey of Abingdon, and the first reference to the horse itself is soon after, in 1190 CE. However, the carving is believed to date back much further than that. Due to the similarity of the Uffington White Horse to the stylised depictions of horses on 1st century BCE coins, it had been thought that the creature must also date to that period.\",\n                        \"However, in 1995 Optically Stimulated Luminescence (OSL) testing was carried out by the Oxford Archaeological Unit on soil from two of the lower layers of the horse's body, and from another cut near the base. The result was a date for the horse's construction somewhere between 1400 and 600 BCE – in other words, it had a Late Bronze Age or Early Iron Age origin.\",\n                        \"The latter end of this date range would tie the carving of the horse in with occupation of the nearby Uffington hillfort, indicating that it may represent a tribal emblem marking the land of the inhabitants of the hillfort. Alternatively, the carving may have been carried out during a Bronze or Iron Age ritual. Some researchers see the horse as representing the Celtic*** horse goddess Epona, who was worshipped as a protector of horses, and for her associations with fertility. However, the cult of Epona was not imported from Gaul (France) until around the first century CE. This date is at least six centuries after the Uffington Horse was probably carved. Nevertheless, the horse had great ritual and economic significance during the Bronze and Iron Ages, as attested by its depictions on jewellery and other metal objects. It is possible that the carving represents a goddess in native mythology, such as Rhiannon, described in later Welsh mythology as a beautiful woman dressed in gold and riding a white horse.\",\n                        \"The fact that geoglyphs can disappear easily, along with their associated rituals and meaning, indicates that they were never intended to be anything more than temporary gestures. But this does not lessen their importance. These giant carvings are a fascinating glimpse into the minds of their creators and how they viewed the landscape in which they lived.\"\n                    ],\n                    \"questions\": [\n                        {\n                            \"id\": \"question_set_1\",\n                            \"type\": \"identifying_information\",\n                            \"question\": [\n                                \"Do the following statements agree with the information given in Reading Passage 1?\",\n                                \"TRUE if the statement agrees with the information\",\n                                \"FALSE if the statement contradicts the information\",\n                                \"NOT GIVEN if there is no information on this\",\n                                \"1: Most geoglyphs in England are located in a particular area of the country.\",\n                                \"2: There are more geoglyphs in the shape of a horse than any other creature.\",\n                                \"3: A recent dating of the Uffington White Horse indicates that people were mistaken about its age.\",\n                                \"4: Historians have come to an agreement about the origins of the Long Man of Wilmington.\",\n                                \"5: Geoglyphs were created by people placing white chalk on the hillside.\",\n                                \"6: Many geoglyphs in England are no longer visible.\",\n                                \"7: The shape of some geoglyphs has been altered over time.\",\n                                \"8: The fame of the Uffington White Horse is due to its size.\"\n                            ],\n                            \"answers\": [\n                                \"TRUE\",\n                                \"NOT GIVEN\",\n                                \"TRUE\",\n                                \"FALSE\",\n                                \"FALSE\",\n                                \"TRUE\",\n                                \"TRUE\",\n                                \"NOT GIVEN\"\n                            ]\n                        },\n                        {\n                            \"id\": \"question_set_2\",\n                            \"type\": \"sentence_completion\",\n                            \"question\": [\n                                \"The location of the Uffington White Horse:\",\n                                \"* a distance of 2.5 km from Uffington village\",\n                                \"* near an ancient road known as the ..........\",\n                                \"* below the Ridgeway, a long-distance Neolithic track\",\n                                \"Dating the Uffington White Horse:\",\n                                \"* first reference to White Horse Hill appears in .......... from the 1070s\",\n                                \"* horses shown on coins from the period 100 BCE – 1 BCE are similar in appearance\",\n                                \"* according to analysis of the surrounding .......... , the Horse is Late Bronze Age / Early Iron Age\",\n                                \"Possible reasons for creation of the Uffington White Horse:\",\n                                \"* an emblem to indicate land ownership\",\n                                \"* formed part of an ancient ritual\",\n                                \"* was a representation of goddess Epona – associated with protection of horses and ..........\",\n                                \"* was a representation of a Welsh goddess called ..........\"\n                            ],\n                            \"answers\": [\n                                \"Ridgeway\",\n                                \"documents\",\n                                \"soil\",\n                                \"fertility\",\n                                \"Rhiannon\"\n                            ]\n                        }\n                    ]\n                },\n                {\n                    \"id\": \"test_2_2\",\n                    \"passage_number\": 2,\n                    \"heading\": \"I contain multitudes\",\n                    \"text\": [\n                        \"Wendy Moore reviews Ed Yong's book about microbes\",\n                        \"Microbes, most of them bacteria, have populated this planet since long before animal life developed and they will outlive us. Invisible to the naked eye, they are ubiquitous. They inhabit the soil, air, rocks and water and are present within every form of life, from seaweed and coral to dogs and humans. And, as Yong explains in his utterly absorbing and hugely important book, we mess with them at our peril.\",\n                        \"Every species has its own colony of microbes, called a 'microbiome', and these microbes vary not only between species but also between individuals and within different parts of each individual. What is amazing is that while the number of human cells in the average person is about 30 trillion, the number of microbial ones is higher – about 39 trillion. At best, Yong informs us, we are only 50 per cent human. Indeed, some scientists even suggest we should think of each species and its microbes as a single unit, dubbed a 'holobiont'.\",\n                        \"In each human there are microbes that live only in the stomach, the mouth or the armpit and by and large they do so peacefully. So 'bad' microbes are just microbes out of context. Microbes that sit contentedly in the human gut (where there are more microbes than there are stars in the galaxy) can become deadly if they find their way into the bloodstream. These communities are constantly changing too. The right hand shares just one sixth of its microbes with the left hand. And, of course, we are surrounded by microbes. Every time we eat, we swallow a million microbes in each gram of food; we are continually swapping microbes with other humans, pets and the world at large.\",\n                        \"It's a fascinating topic and Yong, a young British science journalist, is an extraordinarily adept guide. Writing with lightness and panache, he has a knack of explaining complex science in terms that are both easy to understand and totally enthralling. Yong is on a mission. Leading us gently by the hand, he takes us into the world of microbes – a bizarre, alien planet – in a bid to persuade us to love them as much as he does. By the end, we do.\",\n                        \"For most of human history we had no idea that microbes existed. The first man to see these extraordinarily potent creatures was a Dutch lens-maker called Antony van Leeuwenhoek in the 1670s. Using microscopes of his own design that could magnify up to 270 times, he examined a drop of water from a nearby lake and found it teeming with tiny creatures he called 'animalcules'. It wasn't until nearly two hundred years later that the research of French biologist Louis Pasteur indicated that some microbes caused disease. It was Pasteur's 'germ theory' that gave bacteria the poor image that endures today.\",\n                        \"Yong's book is in many ways a plea for microbial tolerance, pointing out that while fewer than one hundred species of bacteria bring disease, many thousands more play a vital role in maintaining our health. The book also acknowledges that our attitude towards bacteria is not a simple one. We tend to see the dangers posed by bacteria, yet at the same time we are sold yoghurts and drinks that supposedly nurture 'friendly' bacteria. In reality, says Yong, bacteria should not be viewed as either friends or foes, villains or heroes. Instead we should realise we have a symbiotic relationship, that can be mutually beneficial or mutually destructive.\",\n                        \"What then do these millions of organisms do? The answer is pretty much everything. New research is now unravelling the ways in which bacteria aid digestion, regulate our immune systems, eliminate toxins, produce vitamins, affect our behaviour and even combat obesity. 'They actually help us become who we are,' says Yong. But we are facing a growing problem. Our obsession with hygiene, our overuse of antibiotics and our unhealthy, low-fibre diets are disrupting the bacterial balance and may be responsible for soaring rates of allergies and immune problems, such as inflammatory bowel disease (IBD).\",\n                        \"The most recent research actually turns accepted norms upside down. For example, there are studies indicating that the excessive use of household detergents and antibacterial products actually destroys the microbes that normally keep the more dangerous germs at bay. Other studies show that keeping a dog as a pet gives children early exposure to a diverse range of bacteria, which may help protect them against allergies later.\",\n                        \"The readers of Yong's book must be prepared for a decidedly unglamorous world. Among the less appealing case studies is one about a fungus that is wiping out entire populations of frogs and that can be halted by a rare microbial bacterium. Another is about squid that carry luminescent bacteria that protect them against predators. However, if you can overcome your distaste for some of the investigations, the reasons for Yong's enthusiasm become clear. The microbial world is a place of wonder. Already, in an attempt to stop mosquitoes spreading dengue fever – a disease that infects 400 million people a year – mosquitoes are being loaded with a bacterium to block the disease. In the future, our ability to manipulate microbes means we could construct buildings with useful microbes built into their walls to fight off infections. Just imagine a neonatal hospital ward coated in a specially mixed cocktail of microbes so that babies get the best start in life.\"\n                    ],\n                    \"questions\": [\n                        {\n                            \"id\": \"question_set_1\",\n                            \"type\": \"multiple_choice\",\n                            \"question\": [\n                                \"Choose the correct letter, A, B, C or D.\",\n                                \"1: What point does the writer make about microbes in the first paragraph?\",\n                                \"A: They adapt quickly to their environment.\",\n                                \"B: The risk they pose has been exaggerated.\",\n                                \"C: They are more plentiful in animal life than plant life.\",\n                                \"D: They will continue to exist for longer than the human race.\",\n                                \"2: In the second paragraph, the writer is impressed by the fact that\",\n                                \"A: each species tends to have vastly different microbes.\",\n                                \"B: some parts of the body contain relatively few microbes.\",\n                                \"C: the average individual has more microbial cells than human ones.\",\n                                \"D: scientists have limited understanding of how microbial cells behave.\",\n                                \"3: What is the writer doing in the fifth paragraph?\",\n                                \"A: explaining how a discovery was made\",\n                                \"B: comparing scientists' theories about microbes\",\n                                \"C: describing confusion among scientists\",\n                                \"D: giving details of how microbes cause disease\"\n                            ],\n                            \"answers\": [\n                                \"1 is D\",\n                                \"2 is C\",\n                                \"3 is A\"\n                            ]\n                        },\n                        {\n                            \"id\": \"question_set_2\",\n                            \"type\": \"summary/note/table/flow_chart_completion\",\n                            \"question\": [\n                                \"Complete the summary using the list of words, A-H, below.\",\n                                \"We should be more tolerant of microbes\",\n                                \"1: Yong's book argues that we should be more tolerant of microbes. Many have a beneficial effect, and only a relatively small number lead to .......... . And although it is misleading to think of microbes as 'friendly', we should also stop thinking of them as the enemy. In fact, we should accept that our relationship with microbes is one based on .......... .\",\n                                \"2: New research shows that microbes have numerous benefits for humans. Amongst other things, they aid digestion, remove poisons, produce vitamins and may even help reduce obesity. However, there is a growing problem. Our poor .......... , our overuse of antibiotics, and our excessive focus on .......... are upsetting the bacterial balance and may be contributing to the huge increase in allergies and immune system problems.\",\n                                \"A: solution, B: partnership, C: destruction, D: exaggeration, E: cleanliness, F: regulations, G: illness, H: nutrition\"\n                            ],\n                            \"answers\": [\n                                \"1 is G and B\",\n                                \"2 is H and E\"\n                            ]\n                        },\n                        {\n                            \"id\": \"question_set_3\",\n                            \"type\": \"identifying_writer_opinion\",\n                            \"question\": [\n                                \"Do the following statements agree with the claims of the writer in Reading Passage 2?\",\n                                \"YES if the statement agrees with the claims of the writer\",\n                                \"NO if the statement contradicts the claims of the writer\",\n                                \"NOT GIVEN if it is impossible to say what the writer thinks about this\",\n                                \"1: It is possible that using antibacterial products in the home fails to have the desired effect.\",\n                                \"2: It is a good idea to ensure that children come into contact with as few bacteria as possible.\",\n                                \"3: Yong's book contains more case studies than are necessary.\",\n                                \"4: The case study about bacteria that prevent squid from being attacked may have limited appeal.\",\n                                \"5: Efforts to control dengue fever have been surprisingly successful.\",\n                                \"6: Microbes that reduce the risk of infection have already been put inside the walls of some hospital wards.\"\n                            ],\n                            \"answers\": [\n                                \"YES\",\n                                \"NO\",\n                                \"NOT GIVEN\",\n                                \"YES\",\n                                \"NOT GIVEN\",\n                                \"NO\"\n                            ]\n                        }\n                    ]\n                },\n                {\n                    \"id\": \"test_2_3\",\n                    \"passage_number\": 3,\n                    \"heading\": \"How to make wise decisions\",\n                    \"text\": [\n                        \"Across cultures, wisdom has been considered one of the most revered human qualities. Although the truly wise may seem few and far between, empirical research examining wisdom suggests that it isn't an exceptional trait possessed by a small handful of bearded philosophers after all – in fact, the latest studies suggest that most of us have the ability to make wise decisions, given the right context.\",\n                        \"'It appears that experiential, situational, and cultural factors are even more powerful in shaping wisdom than previously imagined,' says Associate Professor Igor Grossmann of the University of Waterloo in Ontario, Canada. 'Recent empirical findings from cognitive, developmental, social, and personality psychology cumulatively suggest that people's ability to reason wisely varies dramatically across experiential and situational contexts. Understanding the role of such contextual factors offers unique insights into understanding wisdom in daily life, as well as how it can be enhanced and taught.'\",\n                        \"It seems that it's not so much that some people simply possess wisdom and others lack it, but that our ability to reason wisely depends on a variety of external factors. 'It is impossible to characterize thought processes attributed to wisdom without considering the role of contextual factors,' explains Grossmann. 'In other words, wisdom is not solely an 'inner quality' but rather unfolds as a function of situations people happen to be in. Some situations are more likely to promote wisdom than others.'\",\n                        \"Coming up with a definition of wisdom is challenging, but Grossmann and his colleagues have identified four key characteristics as part of a framework of wise reasoning. One is intellectual humility or recognition of the limits of our own knowledge, and another is appreciation of perspectives wider than the issue at hand. Sensitivity to the possibility of change in social relations is also key, along with compromise or integration of different attitudes and beliefs.\",\n                        \"Grossmann and his colleagues have also found that one of the most reliable ways to support wisdom in our own day-to-day decisions is to look at scenarios from a third-party perspective, as though giving advice to a friend. Research suggests that when adopting a first-person viewpoint we focus on 'the focal features of the environment' and when we adopt a third-person, 'observer' viewpoint we reason more broadly and focus more on interpersonal and moral ideals such as justice and impartiality. Looking at problems from this more expansive viewpoint appears to foster cognitive processes related to wise decisions.\",\n                        \"What are we to do, then, when confronted with situations like a disagreement with a spouse or negotiating a contract at work, that require us to take a personal stake? Grossmann argues that even when we aren't able to change the situation, we can still evaluate these experiences from different perspectives.\",\n                        \"For example, in one experiment that took place during the peak of a recent economic recession, graduating college seniors were asked to reflect on their job prospects. The students were instructed to imagine their career either 'as if you were a distant observer' or 'before your own eyes as if you were right there'. Participants in the group assigned to the 'distant observer' role displayed more wisdom-related reasoning (intellectual humility and recognition of change) than did participants in the control group.\",\n                        \"In another study, couples in long-term romantic relationships were instructed to visualize an unresolved relationship conflict either through the eyes of an outsider or from their own perspective. Participants then discussed the incident with their partner for 10 minutes, after which they wrote down their thoughts about it. Couples in the 'other's eyes' condition were significantly more likely to rely on wise reasoning – recognizing others' perspectives and searching for a compromise – compared to the couples in the egocentric condition.\",\n                        \"'Ego-decentering promotes greater focus on others and enables a bigger picture, conceptual view of the experience, affording recognition of intellectual humility and change,' says Grossmann.\",\n                        \"We might associate wisdom with intelligence or particular personality traits, but research shows only a small positive relationship between wise thinking and crystallized intelligence and the personality traits of openness and agreeableness. 'It is remarkable how much people can vary in their wisdom from one situation to the next, and how much stronger such contextual effects are for understanding the relationship between wise judgment and its social and affective outcomes as compared to the generalized 'traits',' Grossmann explains. 'That is, knowing how wisely a person behaves in a given situation is more informative for understanding their emotions or likelihood to forgive [or] retaliate as compared to knowing whether the person may be wise 'in general'.\"\n                    ],\n                    \"questions\": [\n                        {\n                            \"id\": \"question_set_1\",\n                            \"type\": \"multiple_choice\",\n                            \"question\": [\n                                \"Choose the correct letter, A, B, C or D.\",\n                                \"1: What point does the writer make in the first paragraph?\",\n                                \"A: Wisdom appears to be unique to the human race.\",\n                                \"B: A basic assumption about wisdom may be wrong.\",\n                                \"C: Concepts of wisdom may depend on the society we belong to.\",\n                                \"D: There is still much to be discovered about the nature of wisdom.\",\n                                \"2: What does Igor Grossmann suggest about the ability to make wise decisions?\",\n                                \"A: It can vary greatly from one person to another.\",\n                                \"B: Earlier research into it was based on unreliable data.\",\n                                \"C: The importance of certain influences on it was underestimated.\",\n                                \"D: Various branches of psychology define it according to their own criteria.\",\n                                \"3: According to the third paragraph, Grossmann claims that the level of wisdom an individual shows\",\n                                \"A: can be greater than they think it is.\",\n                                \"B: will be different in different circumstances.\",\n                                \"C: may be determined by particular aspects of their personality.\",\n                                \"D: should develop over time as a result of their life experiences.\",\n                                \"4: What is described in the fifth paragraph?\",\n                                \"A: a difficulty encountered when attempting to reason wisely\",\n                                \"B: an example of the type of person who is likely to reason wisely\",\n                                \"C: a controversial view about the benefits of reasoning wisely\",\n                                \"D: a recommended strategy that can help people to reason wisely\"\n                            ],\n                            \"answers\": [\n                                \"1 is B\",\n                                \"2 is C\",\n                                \"3 is B\",\n                                \"4 is D\"\n                            ]\n                        },\n                        {\n                            \"id\": \"question_set_2\",\n                            \"type\": \"summary/note/table/flow_chart_completion\",\n                            \"question\": [\n                                \"Complete the summary using the list of words, A-J, below.\",\n                                \"The characteristics of wise reasoning\",\n                                \"1: Igor Grossmann and colleagues have established four characteristics which enable us to make wise decisions. It is important to have a certain degree of .......... regarding the extent of our knowledge, and to take into account .......... which may not be the same as our own. We should also be able to take a broad .......... of any situation. Another key characteristic is being aware of the likelihood of alterations in the way that people relate to each other.\",\n                                \"2: Grossmann also believes that it is better to regard scenarios with .......... . By avoiding the first-person perspective, we focus more on .......... and on other moral ideals, which in turn leads to wiser decision-making.\",\n                                \"A: opinions, B: confidence, C: view, D: modesty, E: problems, F: objectivity, G: fairness, H: experiences, I: range, J: reasons\"\n                            ],\n                            \"answers\": [\n                                \"1 is D and A and C\", \n                                \"2 is F and G\"\n                            ]\n                        },\n                        {\n                            \"id\": \"question_set_3\",\n                            \"type\": \"identifying_information\",\n                            \"question\": [\n                                \"Do the following statements agree with the information given in Reading Passage 1?\",\n                                \"TRUE if the statement agrees with the information\",\n                                \"FALSE if the statement contradicts the information\",\n                                \"NOT GIVEN if there is no information on this\",\n                                \"1: Students participating in the job prospects experiment could choose one of two perspectives to take.\",\n                                \"2: Participants in the couples experiment were aware that they were taking part in a study about wise reasoning.\",\n                                \"3: In the couples experiments, the length of the couples' relationships had an impact on the results.\",\n                                \"4: In both experiments, the participants who looked at the situation from a more detached viewpoint tended to make wiser decisions.\",\n                                \"5: Grossmann believes that a person's wisdom is determined by their intelligence to only a very limited extent.\"\n                            ],\n                            \"answers\": [\n                                \"FALSE\",\n                                \"NOT GIVEN\",\n                                \"NOT GIVEN\",\n                                \"TRUE\",\n                                \"TRUE\"\n                            ]\n                        }\n                    ]\n                }\n            ]\n        }\n    ]\n}\n\n\nClaude acknowledges if this system prompt is understood.\\n Following queries will no longer be system prompts, they will be human input",
-    messages=[{
-        "role": "user", 
-        "content": "generate me a new full reading ielts exam"
-    }]
-)
-print(message)
\ No newline at end of file
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Validate API key
+ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
+if not ANTHROPIC_API_KEY:
+    raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
+
+MODEL = "claude-3-5-sonnet-20241022"
+
+class ReadingExamAgent:
+    # Class constants
+    MAXIMUM_TOKENS = 8192  # A full exam is 2,150-2,750 words of passages plus 40 questions
+    TEMPERATURE = 0.7
+    NUMBER_OF_PASSAGES = 3
+    NUMBER_OF_QUESTIONS = 40
+
+    CEFR_LEVELS = ["B1", "B2", "C1", "C2"]
+
+    # Per-passage plan for section-parallel generation: difficulty rises through the exam
+    PASSAGE_PLAN = [
+        {"passage_number": 1, "cefr_level": "B1", "question_count": 13, "question_type_count": 2, "words": "700-850"},
+        {"passage_number": 2, "cefr_level": "B2", "question_count": 13, "question_type_count": 2, "words": "700-900"},
+        {"passage_number": 3, "cefr_level": "C1", "question_count": 14, "question_type_count": 3, "words": "750-1000"}
+    ]
+
+    def __init__(self, client=None, scheduler=None, corpus=None):
+        """
+        Initialize the IELTS Reading exam agent.
+        client overrides the shared, connection-pooled Anthropic client from clients.py.
+        scheduler overrides the shared RequestScheduler that rate-limits and retries every call.
+        corpus overrides the shared Corpus that samples, templates and standards are read from.
+        """
+        self._client = client
+        self.scheduler = scheduler or get_scheduler()
+        self.corpus = corpus or get_corpus()
+
+        # Add token tracking
+        self.total_input_tokens = 0
+        self.total_output_tokens = 0
+        self.total_cache_creation_tokens = 0
+        self.total_cache_read_tokens = 0
+        self._usage_lock = threading.Lock()
+
+        # Templates and standards are shared with every other agent through the corpus
+        try:
+            self.templates = self.corpus.reading_templates
+            self.standards = self.corpus.reading_standards
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Required data files not found: {e}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Error parsing JSON data: {e}")
+
+        self._system_blocks = None
+        self.current_exam = None
+        self.time_to_first_token = {}
+
+    @property
+    def samples(self):
+        """Whole reading_samples.json, decoded on first access, when the system blocks are built"""
+        return self.corpus.reading_samples
+
+    @property
+    def anthropic(self):
+        """Anthropic client; the shared one is looked up on every call, so clients.configure() applies"""
+        return self._client or get_client()
+
+    @property
+    def system_blocks(self):
+        """Cacheable system prompt blocks, built on first use"""
+        if self._system_blocks is None:
+            self._system_blocks = self._create_system_blocks()
+        return self._system_blocks
+
+    def _create_system_blocks(self):
+        """
+        Build the static system prompt as two blocks with cache breakpoints:
+        instructions with templates and CEFR standards, then the sample exam.
+        Editing the samples therefore keeps the first block cached.
+        """
+        instructions = f"""This is a system prompt. The assistant is Claude created by anthropic.
+Claude's purpose is to generate IELTS exams for human practice.
+When Human asks for an IELTS reading example Claude generates a novel reading IELTS exam that will be used by human to practice. The reading exam generated by Claude follows the international IELTS standards and formats like the question types, templates and length.
+Claude follows the IELTS question generation template as given:
+
+{json.dumps(self.templates, indent=4)}
+
+Claude also follows a consistent level of proficiency in the generated exams for the human so all generated IELTS exams are of similar difficulty.
+Claude generates the questions on the basis of measurability by at least these metrics:
+
+{json.dumps(self.standards, indent=4)}"""
+
+        sample_exam = f"""Here is an example IELTS reading exam for Claude given in json format:
+
+{json.dumps(self.samples, indent=4)}"""
+
+        return [
+            {"type": "text", "text": instructions, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": sample_exam, "cache_control": {"type": "ephemeral"}}
+        ]
+
+    def track_token_usage(self, message):
+        """Track token usage, including prompt cache reads and writes, from API response"""
+        if hasattr(message, 'usage'):
+            usage = message.usage
+            cache_creation = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+            cache_read = getattr(usage, 'cache_read_input_tokens', 0) or 0
+            # Passages generated in parallel report usage from different threads
+            with self._usage_lock:
+                self.total_input_tokens += usage.input_tokens
+                self.total_output_tokens += usage.output_tokens
+                self.total_cache_creation_tokens += cache_creation
+                self.total_cache_read_tokens += cache_read
+            logger.info(f"Message tokens - Input: {usage.input_tokens}, Output: {usage.output_tokens}, "
+                        f"Cache creation: {cache_creation}, Cache read: {cache_read}")
+
+    def generate_exam(self, cefr_level=None, on_text=None):
+        """
+        Generate a full IELTS Reading exam (three passages, 40 questions).
+        The response is streamed; on_text, if given, is called with each text chunk as it arrives.
+        Returns the parsed exam dict, or None if generation failed.
+        """
+        prompt = self._create_exam_prompt(cefr_level)
+
+        try:
+            content = self._stream_message(prompt, on_text)
+            self.current_exam = self._parse_and_validate_exam(content)
+            return self.current_exam
+
+        except Exception as e:
+            logger.error(f"Error generating exam: {e}")
+            traceback.print_exc()
+            return None
+
+    def generate_exam_parallel(self, on_passage=None):
+        """
+        Generate a full exam as three concurrent passage requests, each with its own difficulty band
+        and question-type mix, then assemble them and renumber the questions 1-40.
+        on_passage, if given, is called with each passage as soon as it is ready.
+        Returns the assembled exam dict, or None if any passage failed.
+        """
+        start_time = time.perf_counter()
+        plans = self._plan_passages()
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(plans)) as executor:
+                futures = [executor.submit(self._generate_passage, plan) for plan in plans]
+                passages = []
+                for future in as_completed(futures):
+                    passage = future.result()
+                    passages.append(passage)
+                    if on_passage:
+                        on_passage(passage)
+
+            self.current_exam = self._assemble_exam(passages)
+            logger.info(f"Parallel exam generation completed in {time.perf_counter() - start_time:.2f}s")
+            return self.current_exam
+
+        except Exception as e:
+            logger.error(f"Error generating exam: {e}")
+            traceback.print_exc()
+            return None
+
+    def _plan_passages(self):
+        """Give each passage of PASSAGE_PLAN its own, non-overlapping mix of template question types"""
+        question_types = list(self.templates['reading']['types_of_questions'].keys())
+        random.shuffle(question_types)
+
+        plans = []
+        for plan in self.PASSAGE_PLAN:
+            count = plan['question_type_count']
+            # Reuse types once the template list runs out
+            if len(question_types) < count:
+                question_types += random.sample(list(self.templates['reading']['types_of_questions'].keys()), count)
+            plans.append({**plan, 'question_types': question_types[:count]})
+            question_types = question_types[count:]
+        return plans
+
+    def _generate_passage(self, plan):
+        """Generate and validate a single passage with its question groups"""
+        content = self._stream_message(self._create_passage_prompt(plan), label=f"passage_{plan['passage_number']}")
+        passage = self._validate_passage(self._extract_json(content))
+        passage['passage_number'] = plan['passage_number']
+        return passage
+
+    def _assemble_exam(self, passages):
+        """Order passages and renumber their questions 1..N across the whole exam"""
+        passages = sorted(passages, key=lambda passage: passage['passage_number'])
+
+        number = 1
+        for passage in passages:
+            for group in passage['question_groups']:
+                for question in group['questions']:
+                    question['number'] = number
+                    number += 1
+
+        if number - 1 != self.NUMBER_OF_QUESTIONS:
+            logger.warning(f"Expected {self.NUMBER_OF_QUESTIONS} questions, got {number - 1}")
+
+        return {
+            "title": "IELTS Academic Reading Practice Test",
+            "passages": passages
+        }
+
+    def _stream_message(self, prompt, on_text=None, label='exam'):
+        """
+        Stream a response for the prompt on the cached system blocks and return its text.
+        Time-to-first-token is stored in self.time_to_first_token[label].
+        """
+        start_time = time.perf_counter()
+        first_token = True
+        request = {
+            'model': MODEL,
+            'max_tokens': self.MAXIMUM_TOKENS,
+            'temperature': self.TEMPERATURE,
+            'system': self.system_blocks,
+            'messages': [{"role": "user", "content": prompt}]
+        }
+        with self.scheduler.stream(self.anthropic.beta.prompt_caching.messages.stream, request) as stream:
+            for text in stream.text_stream:
+                if first_token:
+                    first_token = False
+                    self.time_to_first_token[label] = time.perf_counter() - start_time
+                    logger.info(f"Time to first token ({label}): {self.time_to_first_token[label]:.2f}s")
+                if on_text:
+                    on_text(text)
+            message = stream.get_final_message()
+
+        # Track token usage
+        self.track_token_usage(message)
+
+        if message.stop_reason == 'max_tokens':
+            logger.warning("Generation hit the output token limit; the output may be incomplete")
+
+        return ''.join(block.text for block in message.content if hasattr(block, 'text'))
+
+    def _create_exam_prompt(self, cefr_level=None):
+        """Create the user prompt asking for a full exam in a parseable JSON format"""
+        if cefr_level and cefr_level not in self.CEFR_LEVELS:
+            raise ValueError(f"Invalid CEFR level. Must be one of: {', '.join(self.CEFR_LEVELS)}")
+
+        level_instruction = (
+            f"Target CEFR level {cefr_level} ({self.standards[cefr_level]['ielts_equivalent']} IELTS) for all passages."
+            if cefr_level else
+            "Increase difficulty from passage 1 to passage 3, as in a real IELTS Academic Reading test."
+        )
+
+        return f"""Generate a new full IELTS Academic Reading exam.
+
+        Requirements:
+        1. Exactly {self.NUMBER_OF_PASSAGES} passages on different topics, 2,150-2,750 words in total
+        2. Exactly {self.NUMBER_OF_QUESTIONS} questions, numbered 1-{self.NUMBER_OF_QUESTIONS} across the exam
+        3. Use at least two different question types per passage, taken from the templates
+        4. {level_instruction}
+
+        IMPORTANT: Return ONLY the JSON object with no additional text or explanation.
+        Use this exact format:
+        {{
+            "title": "Exam title",
+            "passages": [
+                {{
+                    "passage_number": 1,
+                    "heading": "Passage heading",
+                    "text": ["Paragraph 1", "Paragraph 2"],
+                    "question_groups": [
+                        {{
+                            "type": "one of the question types in the templates",
+                            "instructions": "Instructions for this group of questions",
+                            "options": ["Shared options or headings, if the type uses them"],
+                            "questions": [
+                                {{
+                                    "number": 1,
+                                    "text": "Question or statement",
+                                    "answer": "Correct answer"
+                                }}
+                            ]
+                        }}
+                    ]
+                }}
+            ]
+        }}"""
+
+    def _create_passage_prompt(self, plan):
+        """Create the user prompt for a single passage of the section-parallel exam"""
+        level = plan['cefr_level']
+        return f"""Generate Reading Passage {plan['passage_number']} of a new IELTS Academic Reading exam.
+        This is a single passage with its own questions; the other passages are generated separately.
+
+        Requirements:
+        1. One passage of {plan['words']} words on a topic of general academic interest
+        2. Target CEFR level {level} ({self.standards[level]['ielts_equivalent']} IELTS)
+        3. Exactly {plan['question_count']} questions in total, split across these question types: {', '.join(plan['question_types'])}
+        4. Number the questions from 1; they are renumbered when the exam is assembled
+
+        IMPORTANT: Return ONLY the JSON object with no additional text or explanation.
+        Use this exact format:
+        {{
+            "passage_number": {plan['passage_number']},
+            "heading": "Passage heading",
+            "text": ["Paragraph 1", "Paragraph 2"],
+            "question_groups": [
+                {{
+                    "type": "one of: {', '.join(plan['question_types'])}",
+                    "instructions": "Instructions for this group of questions",
+                    "options": ["Shared options or headings, if the type uses them"],
+                    "questions": [
+                        {{
+                            "number": 1,
+                            "text": "Question or statement",
+                            "answer": "Correct answer"
+                        }}
+                    ]
+                }}
+            ]
+        }}"""
+
+    def _extract_json(self, content):
+        """Extract and parse the JSON object from a response"""
+        # Try to find JSON object between curly braces
+        json_start = content.find('{')
+        json_end = content.rfind('}') + 1
+        if json_start < 0 or json_end <= json_start:
+            raise ValueError("No valid JSON found in response")
+
+        try:
+            return json.loads(content[json_start:json_end])
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON format: {e}")
+
+    def _validate_passage(self, passage):
+        """Validate the structure of a single passage and its question groups"""
+        for field, field_type in {'heading': str, 'text': list, 'question_groups': list}.items():
+            if not isinstance(passage.get(field), field_type):
+                raise ValueError(f"Invalid or missing field in passage: {field}")
+
+        for group in passage['question_groups']:
+            if 'type' not in group or not isinstance(group.get('questions'), list):
+                raise ValueError("Each question group needs a 'type' and a 'questions' list")
+            for question in group['questions']:
+                if 'text' not in question or 'answer' not in question:
+                    raise ValueError("Each question needs 'text' and 'answer'")
+
+        return passage
+
+    def _parse_and_validate_exam(self, content):
+        """Parse the exam JSON from the response and validate its structure"""
+        exam = self._extract_json(content)
+
+        if not isinstance(exam.get('passages'), list) or not exam['passages']:
+            raise ValueError("'passages' must be a non-empty list")
+
+        question_count = 0
+        for passage in exam['passages']:
+            self._validate_passage(passage)
+            question_count += sum(len(group['questions']) for group in passage['question_groups'])
+
+        if len(exam['passages']) != self.NUMBER_OF_PASSAGES:
+            logger.warning(f"Expected {self.NUMBER_OF_PASSAGES} passages, got {len(exam['passages'])}")
+        if question_count != self.NUMBER_OF_QUESTIONS:
+            logger.warning(f"Expected {self.NUMBER_OF_QUESTIONS} questions, got {question_count}")
+
+        return exam
+
+    def _format_exam_display(self, exam=None):
+        """Format the exam passages and questions for display (answers are not shown)"""
+        exam = exam or self.current_exam
+        if not exam:
+            return "No exam currently loaded"
+
+        lines = [
+            "╔════════════════════════════════════════════════════════════════════════════╗",
+            f"║ IELTS Academic Reading: {exam.get('title', 'Practice Exam')}",
+            "╠════════════════════════════════════════════════════════════════════════════╣"
+        ]
+        for passage in exam['passages']:
+            lines.append(f"║ READING PASSAGE {passage.get('passage_number', '')}: {passage['heading']}")
+            lines.append("║")
+            for paragraph in passage['text']:
+                lines.append(f"║ {paragraph}")
+                lines.append("║")
+            for group in passage['question_groups']:
+                lines.append(f"║ [{group['type']}] {group.get('instructions', '')}")
+                for option in group.get('options') or []:
+                    lines.append(f"║   {option}")
+                for question in group['questions']:
+                    lines.append(f"║ {question.get('number', '•')}. {question['text']}")
+                lines.append("║")
+            lines.append("╠════════════════════════════════════════════════════════════════════════════╣")
+        lines[-1] = "╚════════════════════════════════════════════════════════════════════════════╝"
+        return '\n'.join(lines)
+
+    def get_token_usage_report(self):
+        """Get a formatted report of token usage, including prompt cache reads and writes"""
+        return f"""
+╔════════════════ Token Usage Report ════════════════╗
+║ Total Input Tokens:          {self.total_input_tokens:,}
+║ Total Cache Creation Tokens: {self.total_cache_creation_tokens:,}
+║ Total Cache Read Tokens:     {self.total_cache_read_tokens:,}
+║ Total Output Tokens:         {self.total_output_tokens:,}
+╚═════════════════════════════════════════════════════╝
+"""
+
+def main():
+    # Initialize the agent
+    agent = ReadingExamAgent()
+
+    print("\nGenerating a full IELTS Reading exam...")
+    exam = agent.generate_exam_parallel(
+        on_passage=lambda passage: print(f"Passage {passage['passage_number']} ready: {passage['heading']}")
+    )
+
+    if not exam:
+        print("Error generating exam. Please try again.")
+        return
+
+    print(agent._format_exam_display())
+
+    # Display token usage report at the end
+    print("\nToken Usage Summary:")
+    print(agent.get_token_usage_report())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import anthropic
+import hashlib
+import json
+import os
+import tempfile
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'responses')
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache for deterministic messages.create calls.
+
+    Entries are keyed by a hash of (model, system, messages, temperature, max_tokens, tools),
+    expire after `ttl` seconds and are evicted least-recently-used beyond `max_entries`.
+    Only temperature-0 calls, or calls explicitly marked cacheable, are cached.
+    """
+
+    KEY_FIELDS = ['model', 'system', 'messages', 'temperature', 'max_tokens', 'tools', 'tool_choice']
+
+    def __init__(self, cache_dir=None, ttl=7 * 24 * 3600, max_entries=10000):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # key -> last access time, least recently used first
+        self._index = OrderedDict()
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                entries.append((os.path.getmtime(os.path.join(self.cache_dir, name)), name[:-5]))
+        for accessed, key in sorted(entries):
+            self._index[key] = accessed
+
+    def is_cacheable(self, request, cacheable=False):
+        """Only deterministic (temperature 0) or explicitly cacheable requests are cached"""
+        return cacheable or request.get('temperature') == 0
+
+    def make_key(self, request):
+        """Hash the fields of a request that determine its response"""
+        key_data = {field: request.get(field) for field in self.KEY_FIELDS}
+        encoded = json.dumps(key_data, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached response for key, or None on a miss or expired entry"""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self._record(hit=False)
+            return None
+
+        if time.time() - entry['created_at'] > self.ttl:
+            self._remove(key)
+            self._record(hit=False)
+            return None
+
+        # Touch the entry so LRU order survives restarts
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            self._index[key] = now
+            self._index.move_to_end(key)
+        self._record(hit=True)
+
+        data = entry['response']
+        # A cached response costs no tokens
+        data['usage'] = {'input_tokens': 0, 'output_tokens': 0}
+        return anthropic.types.Message.model_validate(data)
+
+    def put(self, key, response):
+        """Store a response under key and evict the least recently used entries beyond max_entries"""
+        entry = {
+            'created_at': time.time(),
+            'response': response.model_dump(mode='json')
+        }
+        tmp_path = None
+        try:
+            # A temporary file of its own, so concurrent writers of one key never interleave; the replace is atomic
+            with tempfile.NamedTemporaryFile('w', dir=self.cache_dir, prefix=f"{key}.", suffix='.tmp', delete=False) as f:
+                tmp_path = f.name
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.error(f"Error writing response cache entry: {e}")
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return
+
+        with self._lock:
+            self._index[key] = time.time()
+            self._index.move_to_end(key)
+            evicted = []
+            while len(self._index) > self.max_entries:
+                evicted.append(self._index.popitem(last=False)[0])
+        for old_key in evicted:
+            self._remove(old_key)
+
+    def create(self, create, request, cacheable=False):
+        """Call create(**request) through the cache"""
+        if not self.is_cacheable(request, cacheable):
+            return create(**request)
+
+        key = self.make_key(request)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        response = create(**request)
+        self.put(key, response)
+        return response
+
+    async def create_async(self, create, request, cacheable=False):
+        """Async counterpart of create, for AsyncAnthropic clients"""
+        if not self.is_cacheable(request, cacheable):
+            return await create(**request)
+
+        key = self.make_key(request)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        response = await create(**request)
+        self.put(key, response)
+        return response
+
+    def get_report(self):
+        """Get a formatted report of cache hits and misses"""
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0
+        return f"""
+╔════════════════ Response Cache Report ════════════════╗
+║ Cache Hits:    {self.hits:,}
+║ Cache Misses:  {self.misses:,}
+║ Hit Rate:      {hit_rate:.1%}
+║ Entries:       {len(self._index):,}
+╚═══════════════════════════════════════════════════════╝
+"""
+
+    def _record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remove(self, key):
+        with self._lock:
+            self._index.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
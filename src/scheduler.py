@@ -0,0 +1,281 @@
+import anthropic
+import asyncio
+import os
+import random
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from token_budget import get_token_counter
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes: lower runs first
+INTERACTIVE = 0
+BACKGROUND = 1
+
+class TokenBucket:
+    """Token bucket that refills continuously up to `capacity` per minute"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, reserve=0.0):
+        """Seconds until `amount` can be taken while leaving `reserve` of the capacity untouched"""
+        # A single request larger than the whole bucket only has to wait for a full bucket
+        needed = min(amount, self.capacity) + reserve * self.capacity
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+class RequestScheduler:
+    """
+    Central scheduler for LLM calls.
+
+    Every call first takes capacity from two token buckets (requests per minute and tokens per
+    minute), with interactive calls always served ahead of background work such as question pool
+    refills. Rate-limit (429), overload (529), server and connection errors are retried with
+    jittered exponential backoff, honouring the retry-after header when the API sends one.
+    """
+
+    RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+    def __init__(self, requests_per_minute=50, tokens_per_minute=80000, max_retries=5,
+                 base_delay=1.0, max_delay=60.0, background_reserve=0.2, token_counter=None):
+        """
+        background_reserve is the fraction of each bucket that background calls leave free,
+        so interactive calls arriving during a refill burst never wait for a full bucket.
+        token_counter sizes each request's prompt (offline, before the call); defaults to the shared one.
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.background_reserve = background_reserve
+        self.token_counter = token_counter or get_token_counter()
+
+        self._lock = threading.Lock()
+        self._waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._paused_until = 0.0
+
+        self.total_retries = 0
+        self.total_wait = 0.0
+
+    def run(self, create, request, priority=INTERACTIVE):
+        """Call create(**request) once capacity is available, retrying transient errors"""
+        for attempt in range(self.max_retries + 1):
+            estimate = self.acquire(request, priority)
+            try:
+                response = create(**request)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                logger.warning(f"Retrying after {type(e).__name__} in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+                continue
+            self._settle(estimate, response)
+            return response
+
+    async def run_async(self, create, request, priority=INTERACTIVE):
+        """Async counterpart of run, for AsyncAnthropic clients"""
+        for attempt in range(self.max_retries + 1):
+            estimate = await self.acquire_async(request, priority)
+            try:
+                response = await create(**request)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                logger.warning(f"Retrying after {type(e).__name__} in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(delay)
+                continue
+            self._settle(estimate, response)
+            return response
+
+    @contextmanager
+    def stream(self, open_stream, request, priority=INTERACTIVE):
+        """
+        Open open_stream(**request) once capacity is available and yield the stream.
+        Only opening the stream is retried: once text has been delivered a retry would repeat it.
+        The token bucket is settled with the stream's real usage when it closes, whether it
+        finished, failed or was abandoned by the caller.
+        """
+        for attempt in range(self.max_retries + 1):
+            estimate = self.acquire(request, priority)
+            manager = open_stream(**request)
+            try:
+                stream = manager.__enter__()
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                logger.warning(f"Retrying stream after {type(e).__name__} in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+                continue
+            break
+
+        try:
+            yield stream
+        except BaseException as e:
+            if not manager.__exit__(type(e), e, e.__traceback__):
+                raise
+        else:
+            manager.__exit__(None, None, None)
+        finally:
+            self._settle(estimate, self._stream_snapshot(stream))
+
+    def acquire(self, request, priority=INTERACTIVE):
+        """Block until the request fits in both buckets; returns the number of tokens taken"""
+        estimate = self.estimate_tokens(request)
+        with self._lock:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                wait = self._try_acquire(estimate, priority)
+                if wait == 0:
+                    return estimate
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                self._waiting[priority] -= 1
+
+    async def acquire_async(self, request, priority=INTERACTIVE):
+        """Async counterpart of acquire"""
+        estimate = self.estimate_tokens(request)
+        with self._lock:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                wait = self._try_acquire(estimate, priority)
+                if wait == 0:
+                    return estimate
+                await asyncio.sleep(wait)
+        finally:
+            with self._lock:
+                self._waiting[priority] -= 1
+
+    def estimate_tokens(self, request):
+        """Token cost of a request: its prompt size plus the output allowance. The prompt size is logged"""
+        prompt_tokens = self.token_counter.count_request(request)
+        logger.info(f"Prompt size: ~{prompt_tokens:,} input tokens, max_tokens {request.get('max_tokens', 0):,}")
+        return prompt_tokens + request.get('max_tokens', 0)
+
+    def get_report(self):
+        """Get a formatted report of the scheduler state"""
+        with self._lock:
+            self.requests.refill()
+            self.tokens.refill()
+            return f"""
+╔═══════════════ Request Scheduler Report ══════════════╗
+║ Requests available: {self.requests.level:,.0f} / {self.requests.capacity:,.0f} per minute
+║ Tokens available:   {self.tokens.level:,.0f} / {self.tokens.capacity:,.0f} per minute
+║ Retries:            {self.total_retries:,}
+║ Time waiting:       {self.total_wait:.1f}s
+╚═══════════════════════════════════════════════════════╝
+"""
+
+    def _try_acquire(self, estimate, priority):
+        """Take capacity if this lane may run now; otherwise return how long to wait before trying again"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                wait = self._paused_until - now
+            elif any(count for lane, count in self._waiting.items() if lane < priority):
+                # Higher-priority callers are queued; let them go first
+                wait = 0.05
+            else:
+                reserve = self.background_reserve if priority > INTERACTIVE else 0.0
+                self.requests.refill()
+                self.tokens.refill()
+                wait = max(self.requests.wait_time(1, reserve), self.tokens.wait_time(estimate, reserve))
+                if wait == 0:
+                    self.requests.level -= 1
+                    self.tokens.level -= estimate
+                    return 0
+            wait = min(max(wait, 0.01), 1.0)
+            self.total_wait += wait
+            return wait
+
+    def _settle(self, estimate, response):
+        """Correct the token bucket with the real usage once the response is known"""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        used = usage.input_tokens + usage.output_tokens
+        with self._lock:
+            self.tokens.level = min(self.tokens.capacity, self.tokens.level + estimate - used)
+
+    def _stream_snapshot(self, stream):
+        """The message accumulated by a stream so far (usage included), or None before any event"""
+        try:
+            return stream.current_message_snapshot
+        except (AssertionError, AttributeError):
+            return None
+
+    def _retry_delay(self, error, attempt):
+        """Seconds to wait before retrying error, or None if it should not be retried"""
+        if attempt >= self.max_retries:
+            return None
+
+        if isinstance(error, anthropic.APIStatusError):
+            if error.status_code not in self.RETRY_STATUS_CODES:
+                return None
+        elif not isinstance(error, anthropic.APIConnectionError):
+            return None
+
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay = random.uniform(delay / 2, delay)
+
+        retry_after = self._retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        if getattr(error, 'status_code', None) in (429, 529):
+            # The limit applies to every caller, so hold back all lanes rather than just this one
+            with self._lock:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+        with self._lock:
+            self.total_retries += 1
+        return delay
+
+    def _retry_after(self, error):
+        """Seconds from the retry-after(-ms) response headers, if present"""
+        response = getattr(error, 'response', None)
+        if response is None:
+            return None
+        headers = response.headers
+        try:
+            if headers.get('retry-after-ms'):
+                return float(headers['retry-after-ms']) / 1000
+            if headers.get('retry-after'):
+                return float(headers['retry-after'])
+        except ValueError:
+            return None
+        return None
+
+# Process-wide scheduler, shared by every agent so the limits cover all of them
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """Return the shared RequestScheduler, configured from ANTHROPIC_RPM / ANTHROPIC_TPM"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RequestScheduler(
+                    requests_per_minute=int(os.getenv('ANTHROPIC_RPM', 50)),
+                    tokens_per_minute=int(os.getenv('ANTHROPIC_TPM', 80000))
+                )
+    return _scheduler
@@ -0,0 +1,276 @@
+import re
+
+from corpus import get_corpus
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+class Task1DataGenerator:
+    """
+    Seeded, NumPy-based generator for the chart data of Task 1 questions.
+
+    Time spans, measurement units, category counts and trend directions are drawn from the
+    data_characteristics of the writing_1_samples.json questions of the same visual type (falling
+    back to DEFAULT_CHARACTERISTICS where no sample has them); topics and labels come from TOPICS,
+    and a time axis never leaves its topic's years. Mixed charts pair two related measures of one
+    topic over the same time axis, each with its own unit and axis label. NumPy is imported on
+    first use, so importing the agent stays light. The result has the same `data`/`details`
+    structure the LLM used to return, so it renders and validates as before, and the same seed
+    always gives the same data.
+    """
+
+    # Sample 'type' spellings mapped to the agent's VISUAL_TYPES
+    SAMPLE_TYPES = {
+        'bar graph': 'bar graph', 'bar chart': 'bar graph',
+        'line graph': 'line graph',
+        'pie chart': 'pie chart', 'pie charts': 'pie chart',
+        'mixed charts': 'mixed charts', 'combined charts': 'mixed charts'
+    }
+
+    DEFAULT_CHARACTERISTICS = {'time_period': '20 years', 'measurement': 'Number of people'}
+
+    TRENDS = ['increase', 'decrease', 'stable', 'fluctuating', 'peak', 'late start']
+    TREND_WEIGHTS = [0.3, 0.2, 0.15, 0.15, 0.1, 0.1]
+
+    TOPICS = {
+        'time_series': [
+            # years bounds the time axis to when the series can plausibly have data
+            {'topic': 'visitors to museums in a city', 'y_label': 'Visitors', 'years': (1960, 2024), 'series': ['Art museum', 'Science museum', 'History museum', 'Maritime museum', 'Children\'s museum']},
+            {'topic': 'energy production by source in one country', 'y_label': 'Energy production', 'years': (1985, 2024), 'series': ['Coal', 'Natural gas', 'Nuclear', 'Wind', 'Solar']},
+            {'topic': 'households with different internet connections', 'y_label': 'Households', 'years': (1998, 2024), 'series': ['Dial-up', 'Broadband', 'Fibre', 'Mobile only']},
+            {'topic': 'commuters using different modes of transport', 'y_label': 'Commuters', 'years': (1960, 2024), 'series': ['Car', 'Bus', 'Train', 'Bicycle', 'Walking']},
+            {'topic': 'exports of agricultural products from one country', 'y_label': 'Exports', 'years': (1960, 2024), 'series': ['Wheat', 'Dairy', 'Meat', 'Fruit', 'Wine']}
+        ],
+        'categorical': [
+            {'topic': 'weekly spending of a typical family', 'x_label': 'Category', 'y_label': 'Spending', 'categories': ['Housing', 'Food', 'Transport', 'Leisure', 'Clothing', 'Utilities', 'Education']},
+            {'topic': 'students enrolled in university faculties', 'x_label': 'Faculty', 'y_label': 'Students', 'categories': ['Engineering', 'Medicine', 'Law', 'Arts', 'Science', 'Business', 'Education']},
+            {'topic': 'tourists visiting a country by region of origin', 'x_label': 'Region', 'y_label': 'Tourists', 'categories': ['Europe', 'North America', 'Asia', 'Africa', 'Oceania', 'South America']},
+            {'topic': 'water consumption by sector', 'x_label': 'Sector', 'y_label': 'Water consumption', 'categories': ['Agriculture', 'Industry', 'Households', 'Energy', 'Services', 'Mining']}
+        ],
+        'shares': [
+            {'topic': 'household waste by type', 'categories': ['Food', 'Paper', 'Plastic', 'Glass', 'Metal', 'Other']},
+            {'topic': 'reasons for travel among adults', 'categories': ['Holiday', 'Business', 'Visiting family', 'Study', 'Other']},
+            {'topic': 'electricity use in an average home', 'categories': ['Heating', 'Cooling', 'Lighting', 'Appliances', 'Cooking', 'Other']},
+            {'topic': 'time spent by teenagers on leisure activities', 'categories': ['Social media', 'Sport', 'Gaming', 'Reading', 'Television', 'Music']}
+        ],
+        # Two related measures of one topic, drawn as bars and a line over the same time axis;
+        # base is the range a measure's typical value is drawn from, years None means monthly
+        'mixed': [
+            {'topic': 'rainfall and average temperature in a city', 'years': None, 'measures': [
+                {'name': 'Rainfall', 'label': 'Rainfall (mm)', 'unit': 'mm', 'base': (20, 150), 'trends': ['fluctuating', 'peak', 'decrease']},
+                {'name': 'Average temperature', 'label': 'Temperature (°C)', 'unit': '°C', 'base': (6, 15), 'trends': ['peak']}
+            ]},
+            {'topic': 'cars on the road and road deaths in one country', 'years': (1970, 2024), 'measures': [
+                {'name': 'Registered cars', 'label': 'Registered cars (millions)', 'unit': 'millions', 'base': (5, 30), 'trends': ['increase']},
+                {'name': 'Road deaths', 'label': 'Road deaths', 'unit': 'count', 'base': (1500, 8000), 'trends': ['decrease', 'peak', 'fluctuating']}
+            ]},
+            {'topic': 'visitors to a national museum and its ticket revenue', 'years': (1990, 2024), 'measures': [
+                {'name': 'Visitors', 'label': 'Visitors (millions)', 'unit': 'millions', 'base': (1, 5), 'trends': ['increase', 'fluctuating', 'peak']},
+                {'name': 'Ticket revenue', 'label': 'Ticket revenue ($ millions)', 'unit': '$ millions', 'base': (10, 60), 'trends': ['increase', 'fluctuating', 'peak']}
+            ]},
+            {'topic': 'university graduates and graduate unemployment in one country', 'years': (1990, 2024), 'measures': [
+                {'name': 'Graduates', 'label': 'Graduates (thousands)', 'unit': 'thousands', 'base': (100, 400), 'trends': ['increase', 'stable']},
+                {'name': 'Graduate unemployment', 'label': 'Graduate unemployment (%)', 'unit': 'percent', 'base': (3, 12), 'trends': ['fluctuating', 'peak', 'decrease', 'increase']}
+            ]},
+            {'topic': 'households with broadband and average download speeds', 'years': (2002, 2024), 'measures': [
+                {'name': 'Households with broadband', 'label': 'Households with broadband (%)', 'unit': 'percent', 'base': (20, 50), 'trends': ['increase']},
+                {'name': 'Average download speed', 'label': 'Average download speed (Mbit/s)', 'unit': 'Mbit/s', 'base': (2, 20), 'trends': ['increase']}
+            ]}
+        ]
+    }
+
+    def __init__(self, corpus=None):
+        self.corpus = corpus or get_corpus()
+        self._characteristics = None
+
+    def generate(self, visual_type, seed=None):
+        """
+        Chart data for a new question of visual_type. Returns a dict with 'topic', 'details'
+        and 'data' (title left empty for the LLM to write) plus the 'seed' used.
+        """
+        import numpy as np
+
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % 2 ** 32)
+        rng = np.random.default_rng(seed)
+        characteristics = self._pick_characteristics(visual_type, rng)
+        unit = self._unit(characteristics)
+
+        if visual_type == "line graph":
+            generated = self._time_series(rng, characteristics, unit)
+        elif visual_type == "bar graph":
+            generated = self._categorical(rng, characteristics, unit)
+        elif visual_type == "pie chart":
+            generated = self._shares(rng)
+        elif visual_type == "mixed charts":
+            generated = self._mixed(rng, characteristics)
+        else:
+            raise ValueError(f"No data generator for visual type: {visual_type}")
+
+        generated['seed'] = seed
+        return generated
+
+    @property
+    def characteristics(self):
+        """data_characteristics of the sample questions, by visual type"""
+        if self._characteristics is None:
+            characteristics = {}
+            for sample in self.corpus.writing_1_samples['ielts_writing_task_1']['question_examples']:
+                visual_type = self.SAMPLE_TYPES.get(sample.get('type'))
+                if visual_type and sample.get('data_characteristics'):
+                    characteristics.setdefault(visual_type, []).append(sample['data_characteristics'])
+            self._characteristics = characteristics
+        return self._characteristics
+
+    def _pick_characteristics(self, visual_type, rng):
+        options = self.characteristics.get(visual_type) or [self.DEFAULT_CHARACTERISTICS]
+        return options[rng.integers(len(options))]
+
+    def _unit(self, characteristics):
+        """Measurement unit implied by a sample's characteristics: 'percent', 'millions' or 'count'"""
+        measurement = characteristics.get('measurement', '')
+        measurement = ' '.join(str(value) for value in (measurement if isinstance(measurement, list) else [measurement])).lower()
+        if 'percent' in measurement:
+            return 'percent'
+        if 'million' in measurement:
+            return 'millions'
+        return 'count'
+
+    def _time_categories(self, rng, characteristics, years):
+        """
+        Category labels for a time axis: months for a one-year period (or when years is None),
+        otherwise evenly spaced years within years, the topic's (earliest, latest) bounds
+        """
+        period = str(characteristics.get('time_period', ''))
+        if years is None or re.search(r'\b(one|1) year\b', period, re.IGNORECASE):
+            return MONTHS, None
+        earliest, latest = years
+        match = re.search(r'(\d+)\s*years?', period)
+        span = min(int(match.group(1)) if match else 20, latest - earliest)
+        points = int(rng.integers(5, 9))
+        step = max(1, round(span / (points - 1)))
+        points = min(points, (latest - earliest) // step + 1)
+        latest_start = latest - step * (points - 1)
+        start = int(rng.integers(earliest, latest_start + 1))
+        years = [str(start + step * i) for i in range(points)]
+        return years, {'start_year': years[0], 'end_year': years[-1]}
+
+    def _trend(self, rng, trend, points):
+        """Multiplicative shape of a trend over points steps, before noise"""
+        import numpy as np
+
+        t = np.linspace(0, 1, points)
+        if trend == 'increase':
+            return 1 + rng.uniform(0.3, 1.5) * t
+        if trend == 'decrease':
+            return 1 - rng.uniform(0.2, 0.7) * t
+        if trend == 'fluctuating':
+            return 1 + rng.uniform(0.1, 0.25) * np.sin(2 * np.pi * rng.uniform(1, 2.5) * t + rng.uniform(0, np.pi))
+        if trend == 'peak':
+            return 1 + rng.uniform(0.4, 1.0) * np.sin(np.pi * t)
+        if trend == 'late start':
+            start = rng.uniform(0.2, 0.5)
+            return np.where(t < start, 0, (t - start) / (1 - start) * rng.uniform(0.8, 1.5))
+        return np.ones(points)
+
+    def _values(self, rng, shape, unit, base=None):
+        """Scale a trend shape to the unit (or a base drawn from the given range), add noise and round to one decimal"""
+        import numpy as np
+
+        if base is not None:
+            base = rng.uniform(*base)
+        elif unit == 'percent':
+            base = rng.uniform(10, 60)
+        elif unit == 'millions':
+            base = rng.uniform(1, 50)
+        else:
+            base = rng.uniform(20, 800)
+        values = base * shape * (1 + rng.normal(0, 0.04, len(shape)))
+        values = np.clip(values, 0, 100 if unit == 'percent' else None)
+        return [round(float(value), 1) for value in values]
+
+    def _unit_label(self, label, unit):
+        return {'percent': f"{label} (%)", 'millions': f"{label} (millions)"}.get(unit, label)
+
+    def _time_series(self, rng, characteristics, unit):
+        topic = self.TOPICS['time_series'][rng.integers(len(self.TOPICS['time_series']))]
+        categories, time_span = self._time_categories(rng, characteristics, topic['years'])
+        names = list(rng.choice(topic['series'], size=int(rng.integers(3, len(topic['series']) + 1)), replace=False))
+        trends = list(rng.choice(self.TRENDS, size=len(names), p=self.TREND_WEIGHTS))
+
+        series = [
+            {'name': str(name), 'categories': categories, 'values': self._values(rng, self._trend(rng, trend, len(categories)), unit)}
+            for name, trend in zip(names, trends)
+        ]
+        y_label = self._unit_label(topic['y_label'], unit)
+        return self._question(topic['topic'], 'Year' if time_span else 'Month', y_label, unit, series, {
+            'time_span': time_span or {'period': 'one year', 'intervals': 'monthly'},
+            'trends': {str(name): str(trend) for name, trend in zip(names, trends)}
+        })
+
+    def _categorical(self, rng, characteristics, unit):
+        import numpy as np
+
+        topic = self.TOPICS['categorical'][rng.integers(len(self.TOPICS['categorical']))]
+        count = characteristics.get('categories')
+        count = count if isinstance(count, int) else int(rng.integers(4, len(topic['categories']) + 1))
+        categories = [str(category) for category in rng.choice(topic['categories'], size=min(count, len(topic['categories'])), replace=False)]
+
+        # Skewed magnitudes, so there is a clear largest and smallest category to describe
+        weights = rng.dirichlet(np.full(len(categories), 1.5))
+        shape = weights / weights.mean()
+        year = str(characteristics.get('measurement_year', rng.integers(2000, 2024)))
+        series = [{'name': year, 'categories': categories, 'values': self._values(rng, shape, unit)}]
+        y_label = self._unit_label(topic['y_label'], unit)
+        return self._question(topic['topic'], topic['x_label'], y_label, unit, series, {'year': year})
+
+    def _shares(self, rng):
+        import numpy as np
+
+        topic = self.TOPICS['shares'][rng.integers(len(self.TOPICS['shares']))]
+        categories = [str(category) for category in topic['categories']]
+        shares = rng.dirichlet(np.full(len(categories), 2.0)) * 100
+        values = [round(float(share), 1) for share in shares]
+        # Keep the rounded shares summing to exactly 100
+        values[int(np.argmax(values))] = round(100 - sum(values) + max(values), 1)
+        year = str(rng.integers(2000, 2024))
+        series = [{'name': year, 'categories': categories, 'values': values}]
+        return self._question(topic['topic'], 'Category', 'Share (%)', 'percent', series, {'year': year})
+
+    def _mixed(self, rng, characteristics):
+        # Two measures of one topic over the same time axis: the first drawn as bars, the second as a line
+        topic = self.TOPICS['mixed'][rng.integers(len(self.TOPICS['mixed']))]
+        categories, time_span = self._time_categories(rng, characteristics, topic['years'])
+        trends = [str(rng.choice(measure.get('trends', self.TRENDS))) for measure in topic['measures']]
+
+        series = [
+            {
+                'name': measure['name'], 'label': measure['label'], 'unit': measure['unit'], 'categories': categories,
+                'values': self._values(rng, self._trend(rng, trend, len(categories)), measure['unit'], measure['base'])
+            }
+            for measure, trend in zip(topic['measures'], trends)
+        ]
+        generated = self._question(topic['topic'], 'Year' if time_span else 'Month', series[0]['label'], series[0]['unit'], series, {
+            'time_span': time_span or {'period': 'one year', 'intervals': 'monthly'},
+            'trends': {item['name']: trend for item, trend in zip(series, trends)},
+            'measurements': {item['name']: {'unit': item['unit'], 'range': [min(item['values']), max(item['values'])]} for item in series}
+        })
+        # The y axis describes the bars; the line has its own axis, label and unit
+        generated['data']['y_axis'] = {'label': series[0]['label'], 'range': [0, max(series[0]['values'])], 'unit': series[0]['unit']}
+        return generated
+
+    def _question(self, topic, x_label, y_label, unit, series, details):
+        values = [value for item in series for value in item['values']]
+        return {
+            'topic': topic,
+            'details': {
+                'categories': series[0]['categories'],
+                'measurements': {'unit': unit, 'range': [min(values), max(values)]},
+                **details
+            },
+            'data': {
+                'title': '',
+                'x_axis': {'label': x_label, 'categories': series[0]['categories']},
+                'y_axis': {'label': y_label, 'range': [0, max(values)], 'unit': unit},
+                'series': series
+            }
+        }
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+MODEL = "claude-3-5-sonnet-20241022"
+
+class TokenCounter:
+    """
+    Token counts for prompt text.
+
+    Exact counts come from the API's token counting endpoint and are memoized by a hash of the
+    text, so each corpus sample is counted once per process. Estimates, and exact counts while
+    the endpoint is unavailable, come from an offline tokenizer: a `tokenizers` JSON file named
+    by ANTHROPIC_TOKENIZER_PATH if there is one, otherwise a characters-per-token heuristic.
+    """
+
+    CHARS_PER_TOKEN = 3.5
+    API_RETRY_INTERVAL = 300  # seconds to wait before trying the endpoint again after a failure
+
+    def __init__(self, client=None, model=MODEL, use_api=True, max_entries=4096, tokenizer_path=None):
+        self._client = client
+        self.model = model
+        self.use_api = use_api
+        self.max_entries = max_entries
+
+        self._counts = OrderedDict()
+        self._lock = threading.Lock()
+        self._api_disabled_until = 0.0
+        self._tokenizer = self._load_tokenizer(tokenizer_path or os.getenv('ANTHROPIC_TOKENIZER_PATH'))
+
+        self.api_calls = 0
+        self.memo_hits = 0
+
+    @property
+    def client(self):
+        # The shared client is looked up on every call, so clients.configure() applies
+        from clients import get_client
+        return self._client or get_client()
+
+    def count(self, text, exact=True):
+        """
+        Number of tokens in text. With exact=False only the offline tokenizer is used,
+        which is free and fast enough to call before every request.
+        """
+        if not exact or not self.use_api:
+            return self.estimate(text)
+
+        key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        with self._lock:
+            if key in self._counts:
+                self._counts.move_to_end(key)
+                self.memo_hits += 1
+                return self._counts[key]
+
+        tokens = self._count_with_api(text)
+        if tokens is None:
+            # Not memoized, so the exact count is fetched once the endpoint is back
+            return self.estimate(text)
+
+        with self._lock:
+            self._counts[key] = tokens
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+        return tokens
+
+    def count_request(self, request, exact=False):
+        """Input tokens of a messages request (system, messages and tools)"""
+        parts = [request.get('system'), request.get('messages'), request.get('tools')]
+        return self.count(json.dumps([part for part in parts if part], ensure_ascii=False, default=str), exact=exact)
+
+    def estimate(self, text):
+        """Offline token count"""
+        if self._tokenizer:
+            return len(self._tokenizer.encode(text).ids)
+        return int(len(text) / self.CHARS_PER_TOKEN) + 1
+
+    def _count_with_api(self, text):
+        if time.monotonic() < self._api_disabled_until:
+            return None
+        try:
+            result = self.client.beta.messages.count_tokens(
+                model=self.model,
+                messages=[{"role": "user", "content": text}]
+            )
+        except Exception as e:
+            logger.warning(f"Token counting endpoint unavailable, using offline counts: {e}")
+            self._api_disabled_until = time.monotonic() + self.API_RETRY_INTERVAL
+            return None
+        with self._lock:
+            self.api_calls += 1
+        return result.input_tokens
+
+    def _load_tokenizer(self, path):
+        if not path:
+            return None
+        try:
+            from tokenizers import Tokenizer
+            return Tokenizer.from_file(path)
+        except Exception as e:
+            logger.warning(f"Could not load tokenizer {path}, using the character estimate: {e}")
+            return None
+
+def pack_to_budget(items, budget, count, limit=None):
+    """
+    Greedily take items, in order of preference, whose token counts fit in budget.
+    An item that does not fit is skipped so smaller ones after it can still be used.
+    Returns (packed_items, tokens_used).
+    """
+    packed = []
+    used = 0
+    for item in items:
+        if limit is not None and len(packed) >= limit:
+            break
+        tokens = count(item)
+        if used + tokens > budget:
+            continue
+        packed.append(item)
+        used += tokens
+    return packed, used
+
+# Process-wide counter, shared by every agent so memoized counts are reused
+_token_counter = None
+_token_counter_lock = threading.Lock()
+
+def get_token_counter():
+    """Return the shared TokenCounter, creating it on first use"""
+    global _token_counter
+    if _token_counter is None:
+        with _token_counter_lock:
+            if _token_counter is None:
+                _token_counter = TokenCounter(use_api=os.getenv('ANTHROPIC_COUNT_TOKENS', '1') != '0')
+    return _token_counter
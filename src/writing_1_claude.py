@@ -1,12 +1,20 @@
 import anthropic
+import asyncio
 import json
 import random
 import os
-import matplotlib.pyplot as plt
-import numpy as np
 import traceback
 from dotenv import load_dotenv
 import logging
+import time
+from question_pool import QuestionPool
+from clients import get_client, get_async_client
+from scheduler import get_scheduler, INTERACTIVE, BACKGROUND
+from corpus import get_corpus
+from token_budget import get_token_counter, pack_to_budget
+from chart_renderer import ChartRenderer, get_chart_renderer
+from chart_spec import chart_spec
+from task_1_data import Task1DataGenerator
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -26,7 +34,9 @@ class IELTSWritingAgent:
     # Class constants
     MINIMUM_WORDS = 150
     MAXIMUM_TOKENS = 1500
+    QUESTION_MAXIMUM_TOKENS = 600  # The LLM only writes the text around generated data
     TEMPERATURE = 0.7
+    SAMPLE_TOKEN_BUDGET = 2500  # Tokens of sample material per prompt, leaving room for the rest
     
     VISUAL_TYPES = [
         "bar graph",
@@ -34,101 +44,237 @@ class IELTSWritingAgent:
         "pie chart",
         "mixed charts"
     ]
+
+    # 'spec' serves only the Vega-Lite spec, for clients that draw the chart themselves
+    VISUAL_FORMATS = ['png', 'svg', 'spec']
     
-    def __init__(self):
-        """Initialize the IELTS Writing Task 1 agent"""
-        self.anthropic = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    def __init__(self, client=None, async_client=None, question_pool=None, response_cache=None, scheduler=None, corpus=None, token_counter=None, chart_renderer=None, display=True, visual_format='png', data_generator=None):
+        """
+        Initialize the IELTS Writing Task 1 agent.
+        client and async_client override the shared, connection-pooled clients from clients.py.
+        question_pool, if given, is a QuestionPool that get_new_question serves from first.
+        response_cache, if given, is a ResponseCache used for deterministic and evaluation calls.
+        scheduler overrides the shared RequestScheduler that rate-limits and retries every call.
+        corpus overrides the shared Corpus that samples, templates and standards are read from.
+        token_counter overrides the shared TokenCounter used to fit samples into SAMPLE_TOKEN_BUDGET.
+        chart_renderer overrides the shared headless ChartRenderer that draws and caches the visuals.
+        display prints each new question and shows its visual (the CLI); services pass False.
+        Questions only ever hold the rendered image bytes, never a live matplotlib figure.
+        visual_format is the image rendered when a question is served: 'png', 'svg', or 'spec'
+        to render nothing and rely on the Vega-Lite chart spec every question carries.
+        data_generator overrides the Task1DataGenerator that creates each question's chart data.
+        """
+        if visual_format not in self.VISUAL_FORMATS:
+            raise ValueError(f"Unsupported visual format: {visual_format}")
+
+        self._client = client
+        self._async_client = async_client
+        self.question_pool = question_pool
+        self.response_cache = response_cache
+        self.scheduler = scheduler or get_scheduler()
+        self.corpus = corpus or get_corpus()
+        self.token_counter = token_counter or get_token_counter()
+        self.chart_renderer = chart_renderer or get_chart_renderer()
+        self.display = display
+        self.visual_format = visual_format
+        self.data_generator = data_generator or Task1DataGenerator(self.corpus)
         
         # Get paths using os.path for better cross-platform compatibility
         current_dir = os.path.dirname(os.path.abspath(__file__))
         parent_dir = os.path.dirname(current_dir)
+        self.parent_dir = parent_dir
         
-        # Load templates and samples
-        templates_path = os.path.join(parent_dir, 'writing', 'ielts_templates_writing.json')
-        samples_path = os.path.join(parent_dir, 'writing', 'writing_1_samples.json')
-
+        # Templates are shared with every other agent through the corpus
         try:
-            with open(templates_path, 'r') as f:
-                self.templates = json.load(f)
-            with open(samples_path, 'r') as f:
-                self.samples = json.load(f)
+            self.templates = self.corpus.writing_templates
         except FileNotFoundError as e:
             raise FileNotFoundError(f"Required data files not found: {e}")
         except json.JSONDecodeError as e:
             raise ValueError(f"Error parsing JSON data: {e}")
             
         self.current_question = None
+        self.time_to_first_token = {}
+
+    @property
+    def samples(self):
+        """Whole writing_1_samples.json, decoded on first access; prompts use corpus.task_1_examples"""
+        return self.corpus.writing_1_samples
+
+    @property
+    def anthropic(self):
+        """Anthropic client; the shared one is looked up on every call, so clients.configure() applies"""
+        return self._client or get_client()
+
+    @property
+    def async_anthropic(self):
+        """AsyncAnthropic client used by the *_async methods"""
+        return self._async_client or get_async_client()
 
     def get_new_question(self, visual_type=None):
         """
-        Get a new IELTS Writing Task 1 question, utilizing existing samples for better structure
+        Get a new IELTS Writing Task 1 question, utilizing existing samples for better structure.
+        Served from the question pool if one is enabled and has a question of the requested type.
+        """
+        pooled = self._pop_pooled_question(visual_type)
+        if pooled:
+            return self._serve_question(*pooled)
+
+        visual_type, generated, prompt = self._create_question_prompt(visual_type)
+
+        try:
+            response = self._create_message(self._question_request(prompt))
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            return "Error generating question. Please try again."
+
+        return self._handle_question_response(visual_type, generated, response)
+
+    async def get_new_question_async(self, visual_type=None):
+        """Async counterpart of get_new_question"""
+        # Rendering the visual is CPU-bound matplotlib work, so it runs off the event loop too
+        pooled = self._pop_pooled_question(visual_type)
+        if pooled:
+            return await asyncio.to_thread(self._serve_question, *pooled)
+
+        # Sample packing may call the token counting endpoint, so keep it off the event loop
+        visual_type, generated, prompt = await asyncio.to_thread(self._create_question_prompt, visual_type)
+
+        try:
+            response = await self._create_message_async(self._question_request(prompt))
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            return "Error generating question. Please try again."
+
+        return await asyncio.to_thread(self._handle_question_response, visual_type, generated, response)
+
+    def enable_question_pool(self, depth=3, path=None, start=True):
+        """
+        Serve questions from a persistent pool of pre-generated questions, one bucket per
+        VISUAL_TYPES entry, kept topped up to `depth` by a background worker.
+        """
+        if path is None:
+            path = os.path.join(self.parent_dir, 'writing', 'question_pool_task_1.json')
+        self.question_pool = QuestionPool(self._generate_pool_question, self.VISUAL_TYPES, path, depth=depth)
+        if start:
+            self.question_pool.start()
+        return self.question_pool
+
+    def _generate_pool_question(self, visual_type, pooled_topics):
+        """Generate and validate question data for the pool (rendering happens when it is served)"""
+        visual_type, generated, prompt = self._create_question_prompt(visual_type)
+        response = self._create_message(self._question_request(prompt), priority=BACKGROUND)
+        response_text = response.content[0].text if isinstance(response.content, list) else response.content.text
+        return self._parse_and_validate_question(self._merge_question(generated, self._extract_json(response_text)))
+
+    def _pop_pooled_question(self, visual_type=None):
+        """Take (visual_type, question_data) from the pool; None if there is no pool or it is empty"""
+        if visual_type and visual_type not in self.VISUAL_TYPES:
+            raise ValueError(f"Invalid visual type. Must be one of: {', '.join(self.VISUAL_TYPES)}")
+        if not self.question_pool:
+            return None
+        pooled = self.question_pool.pop(visual_type)
+        if not pooled:
+            logger.info("Question pool empty, generating question on demand")
+        return pooled
+
+    def _message_request(self, prompt, temperature=None):
+        """Build the keyword arguments for a single-prompt messages.create call"""
+        request = {
+            'model': MODEL,
+            'max_tokens': self.MAXIMUM_TOKENS,
+            'messages': [{"role": "user", "content": prompt}]
+        }
+        if temperature is not None:
+            request['temperature'] = temperature
+        return request
+
+    def _question_request(self, prompt):
+        """Request for the question text; the chart data is generated locally, so the output is short"""
+        request = self._message_request(prompt, self.TEMPERATURE)
+        request['max_tokens'] = self.QUESTION_MAXIMUM_TOKENS
+        return request
+
+    def _create_message(self, request, cacheable=False, priority=INTERACTIVE):
+        """
+        Send a messages.create request through the scheduler, and through the response cache if one
+        is configured. Temperature-0 requests are always cacheable; evaluation requests are marked
+        cacheable so identical resubmissions are not re-graded.
+        """
+        create = lambda **kwargs: self.scheduler.run(self.anthropic.messages.create, kwargs, priority)
+        if self.response_cache:
+            return self.response_cache.create(create, request, cacheable)
+        return create(**request)
+
+    async def _create_message_async(self, request, cacheable=False, priority=INTERACTIVE):
+        """Async counterpart of _create_message"""
+        create = lambda **kwargs: self.scheduler.run_async(self.async_anthropic.messages.create, kwargs, priority)
+        if self.response_cache:
+            return await self.response_cache.create_async(create, request, cacheable)
+        return await create(**request)
+
+    def get_cache_report(self):
+        """Get a formatted report of response cache hits and misses"""
+        if not self.response_cache:
+            return "Response cache not enabled"
+        return self.response_cache.get_report()
+
+    def _create_question_prompt(self, visual_type=None):
+        """
+        Pick a visual type (if not given), generate its chart data and build the prompt asking
+        for the question text around that data. Returns (visual_type, generated, prompt).
         """
         if visual_type and visual_type not in self.VISUAL_TYPES:
             raise ValueError(f"Invalid visual type. Must be one of: {', '.join(self.VISUAL_TYPES)}")
         
         if not visual_type:
             visual_type = random.choice(self.VISUAL_TYPES)
+
+        generated = self.data_generator.generate(visual_type)
         
         # Get sample questions of the same type for reference
+        relevant_samples = list(self.corpus.task_1_examples(visual_type))
+        random.shuffle(relevant_samples)
+        
+        # Only the sample's wording is useful now, so only that is sent (from a sample that fits the token budget)
         relevant_samples = [
-            q for q in self.samples['ielts_writing_task_1']['question_examples'] 
-            if q['type'] == visual_type
+            {'description': sample.get('description'), 'key_features': sample.get('key_features'), 'id': sample.get('id')}
+            for sample in relevant_samples
         ]
+        packed, sample_tokens = pack_to_budget(
+            relevant_samples, self.SAMPLE_TOKEN_BUDGET,
+            lambda sample: self.token_counter.count(json.dumps(sample, indent=2)),
+            limit=1
+        )
+        sample_question = packed[0] if packed else None
+        if sample_question:
+            logger.info(f"Using sample {sample_question['id']} ({sample_tokens}/{self.SAMPLE_TOKEN_BUDGET} tokens)")
         
-        # Create a more detailed prompt using sample structure
-        sample_question = random.choice(relevant_samples) if relevant_samples else None
-        
-        prompt = f"""You are an IELTS Writing Task 1 question generator. Create a new unique question for visual type: {visual_type}.
+        prompt = f"""You are an IELTS Writing Task 1 question generator. Write a new question for a {visual_type}
+        about {generated['topic']}. The chart data has already been created; do not change it.
 
         {
-        'For mixed charts, create two related charts (bar and line) about the same topic.' if visual_type == 'mixed charts' else ''
+        'The first series is drawn as a bar chart and the second as a line chart beside it.' if visual_type == 'mixed charts' else ''
         }
 
-        Here's a sample question structure to follow:
+        Chart data:
+        {json.dumps(generated['data'], separators=(',', ':'))}
+
+        Data details:
+        {json.dumps(generated['details'], separators=(',', ':'))}
+
+        Here's a sample question to match in style:
         {json.dumps(sample_question, indent=2) if sample_question else 'No sample available'}
 
-        Create a new question following these requirements:
-        1. Use similar level of detail as the sample
-        2. Include realistic numerical data
-        3. Provide 6-8 key features
-        4. Ensure data consistency
-        5. Use appropriate time periods/categories
-        6. Maintain academic style
+        Requirements:
+        1. The description says what the {visual_type} shows, including the unit and period, in academic style
+        2. Provide 6-8 key features that are true of the data above
+        3. Provide 2-4 points of expected analysis
 
         IMPORTANT: Return ONLY the JSON object with no additional text or explanation.
         Use this exact format:
         {{
+            "title": "Title for the {visual_type}",
             "description": "Write a detailed description of what the {visual_type} shows",
-            "details": {{
-                "time_span": {{
-                    "start_year": "YYYY",
-                    "end_year": "YYYY"
-                }},
-                "categories": ["category1", "category2"],
-                "measurements": {{
-                    "unit": "specify unit",
-                    "range": "specify range"
-                }}
-            }},
-            "data": {{
-                "title": "Title for the {visual_type}",
-                "x_axis": {{
-                    "label": "X-axis label",
-                    "categories": ["category1", "category2"]
-                }},
-                "y_axis": {{
-                    "label": "Y-axis label",
-                    "range": [min, max],
-                    "unit": "unit"
-                }},
-                "series": [
-                    {{
-                        "name": "series name",
-                        "values": [value1, value2],
-                        "categories": ["category1", "category2"]
-                    }}
-                ]
-            }},
             "key_features": [
                 "Key feature 1",
                 "Key feature 2"
@@ -139,52 +285,45 @@ class IELTSWritingAgent:
             ]
         }}"""
 
+        return visual_type, generated, prompt
+
+    def _merge_question(self, generated, written):
+        """
+        Combine the generated chart data with the question text the LLM wrote around it.
+        Raises ValueError if the written part does not have the structure the prompt asked for.
+        """
+        if not isinstance(written, dict):
+            raise ValueError(f"expected a JSON object, got {type(written).__name__}")
+        for field in ('key_features', 'expected_analysis'):
+            if not isinstance(written.get(field, []), list):
+                raise ValueError(f"{field} must be a list, got {type(written[field]).__name__}")
+
+        data = dict(generated['data'], title=written.get('title') or generated['topic'].capitalize())
+        return {
+            'description': written.get('description', ''),
+            'details': dict(generated['details'], seed=generated['seed']),
+            'data': data,
+            'key_features': written.get('key_features', []),
+            'expected_analysis': written.get('expected_analysis', [])
+        }
+
+    def _handle_question_response(self, visual_type, generated, response):
+        """Parse a question response, render its visual and store it as the current question"""
+        response_text = None
         try:
-            response = self.anthropic.messages.create(
-                model=MODEL,
-                max_tokens=self.MAXIMUM_TOKENS,
-                temperature=self.TEMPERATURE,
-                messages=[{
-                    "role": "user", 
-                    "content": prompt
-                }]
-            )
-            
             # Extract text content from Claude's response
             response_text = response.content[0].text if isinstance(response.content, list) else response.content.text
             
             # Find and extract just the JSON portion
             try:
-                # Try to find JSON object between curly braces
-                json_start = response_text.find('{')
-                json_end = response_text.rfind('}') + 1
-                if json_start >= 0 and json_end > json_start:
-                    json_str = response_text[json_start:json_end]
-                    question_data = json.loads(json_str)
-                else:
-                    # If no curly braces found, try to parse the whole response
-                    question_data = json.loads(response_text)
+                question_data = self._merge_question(generated, self._extract_json(response_text))
             except json.JSONDecodeError:
                 # If both attempts fail, print the response for debugging
                 print("Failed to parse JSON. Raw response:")
                 print(response_text)
                 raise
             
-            # Generate visualization and store it with the question
-            fig = self._generate_visualization(visual_type, question_data)
-            
-            # Store current question with visualization
-            self.current_question = {
-                "type": visual_type,
-                "data": question_data,
-                "figure": fig,  # Store the matplotlib figure
-                "expected_band_descriptors": self._get_band_descriptors_for_type(visual_type)
-            }
-            
-            # Display question and visual together
-            self._display_question()
-            
-            return self._format_question_display()
+            return self._serve_question(visual_type, question_data)
 
         except json.JSONDecodeError as e:
             print(f"Error parsing JSON response: {e}")
@@ -199,6 +338,39 @@ class IELTSWritingAgent:
             print("Raw response:", response_text)
             return "Error generating question. Please try again."
 
+    def _extract_json(self, response_text):
+        """Extract and parse the JSON object from Claude's response text"""
+        # Try to find JSON object between curly braces
+        json_start = response_text.find('{')
+        json_end = response_text.rfind('}') + 1
+        if json_start >= 0 and json_end > json_start:
+            return json.loads(response_text[json_start:json_end])
+        # If no curly braces found, try to parse the whole response
+        return json.loads(response_text)
+
+    def _serve_question(self, visual_type, question_data):
+        """Render the visual for the question, store it as the current question and display it"""
+        # Render the visualization (once per distinct chart) and store the image with the question
+        image = None
+        if self.visual_format != 'spec':
+            image = self._generate_visualization(visual_type, question_data, self.visual_format)
+        
+        # Store current question with visualization
+        self.current_question = {
+            "type": visual_type,
+            "data": question_data,
+            "image": image,  # PNG or SVG bytes, shared with the renderer's cache
+            "image_format": self.visual_format if image else None,
+            "chart_spec": chart_spec(visual_type, question_data),  # Vega-Lite, for client-side rendering
+            "expected_band_descriptors": self._get_band_descriptors_for_type(visual_type)
+        }
+        
+        # Display question and visual together
+        if self.display:
+            self._display_question()
+        
+        return self._format_question_display()
+
     def _parse_and_validate_question(self, response_content):
         """
         Parse and validate the question data from Claude's response
@@ -253,7 +425,7 @@ class IELTSWritingAgent:
         Get relevant band descriptors for the specific visual type
         """
         # Get band descriptors from templates
-        descriptors = self.templates['writing']['types_of_questions']['academic_writing_task_1']['band_descriptors']
+        descriptors = self.corpus.band_descriptors('academic_writing_task_1')
         
         # Filter/customize descriptors based on visual type if needed
         return descriptors
@@ -294,6 +466,55 @@ class IELTSWritingAgent:
         """
         Evaluate a submitted answer for the current question
         """
+        error = self._check_answer(answer_text)
+        if error:
+            return error
+
+        response = self._create_message(self._message_request(self._create_evaluation_prompt(answer_text)), cacheable=True)
+
+        return self._format_feedback(response.content)
+
+    async def evaluate_answer_async(self, answer_text):
+        """Async counterpart of evaluate_answer"""
+        error = self._check_answer(answer_text)
+        if error:
+            return error
+
+        response = await self._create_message_async(self._message_request(self._create_evaluation_prompt(answer_text)), cacheable=True)
+
+        return self._format_feedback(response.content)
+
+    def stream_evaluation(self, answer_text):
+        """
+        Streaming variant of evaluate_answer.
+        Each yield is the formatted feedback so far; the last yield is the complete feedback.
+        """
+        error = self._check_answer(answer_text)
+        if error:
+            yield error
+            return
+
+        try:
+            request = self._message_request(self._create_evaluation_prompt(answer_text))
+            content = ''
+            start_time = time.perf_counter()
+            with self.scheduler.stream(self.anthropic.messages.stream, request) as stream:
+                for text in stream.text_stream:
+                    if not content:
+                        self.time_to_first_token['evaluation'] = time.perf_counter() - start_time
+                        logger.info(f"Time to first token (evaluation): {self.time_to_first_token['evaluation']:.2f}s")
+                    content += text
+                    yield self._format_feedback(content, partial=True)
+
+            yield self._format_feedback(content)
+
+        except Exception as e:
+            logger.error(f"Error evaluating answer: {e}")
+            traceback.print_exc()
+            yield f"Error evaluating answer: {str(e)}"
+
+    def _check_answer(self, answer_text):
+        """Return an error message if the answer cannot be evaluated, otherwise None"""
         if not self.current_question:
             return "Error: No current question found. Please get a new question first."
 
@@ -301,8 +522,11 @@ class IELTSWritingAgent:
         word_count = len(answer_text.split())
         if word_count < self.MINIMUM_WORDS:
             return f"Your answer is too short. Minimum {self.MINIMUM_WORDS} words required. Current word count: {word_count}"
+        return None
 
-        prompt = f"""Evaluate this IELTS Writing Task 1 answer. 
+    def _create_evaluation_prompt(self, answer_text):
+        """Create the evaluation prompt for the current question"""
+        return f"""Evaluate this IELTS Writing Task 1 answer. 
         
         Question type: {self.current_question['type']}
         Question description: {self.current_question['data']['description']}
@@ -322,279 +546,59 @@ class IELTSWritingAgent:
         
         Make the feedback constructive and specific."""
 
-        response = self.anthropic.messages.create(
-            model=MODEL,
-            max_tokens=self.MAXIMUM_TOKENS,
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        return self._format_feedback(response.content)
-
-    def _generate_visualization(self, visual_type, question_data):
-        """Generate visualization based on type and data"""
-        plt.style.use('classic')
-        plt.close('all')  # Close any existing plots
-        
+    def _generate_visualization(self, visual_type, question_data, format='png'):
+        """Render the question's visual to image bytes (cached by its data), or None if it cannot be drawn"""
         try:
-            # Validate data before visualization
-            if not question_data.get('data') or not question_data['data'].get('series'):
-                logger.error("Invalid data structure for visualization")
-                return None
-                
-            # Generate appropriate visualization
-            if visual_type == "bar graph":
-                fig = self._generate_bar_graph(question_data)
-            elif visual_type == "line graph":
-                fig = self._generate_line_graph(question_data)
-            elif visual_type == "pie chart":
-                fig = self._generate_pie_chart(question_data)
-            elif visual_type == "mixed charts":
-                fig = self._generate_mixed_charts(question_data)
-            else:
-                logger.error(f"Unsupported visual type: {visual_type}")
-                return None
-            
-            if fig:
-                # Set figure size and adjust layout
-                fig.set_size_inches(12, 6)
-                fig.tight_layout()
-                return fig
-            return None
-            
+            return self.chart_renderer.render(visual_type, question_data, format)
         except Exception as e:
             logger.error(f"Error in visualization generation: {str(e)}")
             traceback.print_exc()
             return None
 
-    def _generate_line_graph(self, question_data):
-        """Generate a line graph"""
-        try:
-            data = question_data['data']
-            fig, ax = plt.subplots(figsize=(10, 6))
-            
-            # Plot each series
-            for series in data['series']:
-                ax.plot(series['categories'], series['values'], 
-                       marker='o', label=series['name'])
-            
-            # Customize the graph
-            ax.set_title(data['title'], pad=20)
-            ax.set_xlabel(data['x_axis']['label'])
-            ax.set_ylabel(data['y_axis']['label'])
-            ax.grid(True, linestyle='--', alpha=0.7)
-            
-            # Rotate x-axis labels if needed
-            plt.xticks(rotation=45)
-            
-            # Add legend
-            ax.legend()
-            
-            plt.tight_layout()
-            return fig
-            
-        except Exception as e:
-            print(f"Error generating line graph: {e}")
-            return None
-
-    def _generate_bar_graph(self, question_data):
-        """Generate a bar graph"""
-        try:
-            data = question_data['data']
-            # Create figure with white background
-            fig, ax = plt.subplots(figsize=(12, 6), facecolor='white')
-            ax.set_facecolor('white')
-            
-            # Get series data
-            series = data['series']
-            
-            # Print debug information
-            logger.debug("Series data: %s", series)
-            logger.debug("Question data: %s", json.dumps(question_data, indent=2))
-            
-            # Convert data to proper format
-            categories = series[0]['categories']
-            values = series[0]['values']
-            
-            # Create x positions for bars
-            x = np.arange(len(categories))
-            
-            # Create bars
-            bars = ax.bar(x, values, width=0.6)
-                
-            # Add value labels on top of bars
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{height:,.1f}',
-                       ha='center', va='bottom')
-            
-            # Customize the graph
-            ax.set_title(data.get('title', ''), pad=20, fontsize=12, fontweight='bold')
-            ax.set_xlabel(data.get('x_axis', {}).get('label', ''), fontsize=10)
-            ax.set_ylabel(data.get('y_axis', {}).get('label', ''), fontsize=10)
-            
-            # Set x-axis labels
-            ax.set_xticks(x)
-            ax.set_xticklabels(categories, rotation=45, ha='right')
-            
-            # Add grid for better readability
-            ax.yaxis.grid(True, linestyle='--', alpha=0.3)
-            
-            # Remove top and right spines
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            
-            # Adjust layout to prevent label cutoff
-            plt.tight_layout()
-            
-            return fig
-            
-        except Exception as e:
-            print(f"Error generating bar graph: {e}")
-            print("Debug - Question data:", json.dumps(question_data, indent=2))
-            traceback.print_exc()
-            return None
-
-    def _generate_pie_chart(self, question_data):
-        """Generate a pie chart"""
-        try:
-            data = question_data['data']
-            fig, ax = plt.subplots(figsize=(10, 6))
-            
-            # Get data from first series
-            series = data['series'][0]
-            
-            # Create pie chart
-            wedges, texts, autotexts = ax.pie(series['values'], 
-                                             labels=series['categories'],
-                                             autopct='%1.1f%%',
-                                             startangle=90)
-            
-            # Customize the chart
-            ax.set_title(data['title'], pad=20)
-            
-            # Make text more readable
-            plt.setp(autotexts, size=8, weight="bold")
-            plt.setp(texts, size=8)
-            
-            # Equal aspect ratio ensures that pie is drawn as a circle
-            ax.axis('equal')
-            
-            plt.tight_layout()
-            return fig
-            
-        except Exception as e:
-            print(f"Error generating pie chart: {e}")
+    def get_visual(self, format='png'):
+        """
+        The current question's visual as 'png' or 'svg' bytes, or its Vega-Lite spec for 'spec'.
+        Images are rendered on first request and then come from the renderer's cache.
+        """
+        if not self.current_question:
             return None
+        if format == 'spec':
+            return self.current_question['chart_spec']
+        if self.current_question.get('image_format') == format:
+            return self.current_question['image']
+        return self._generate_visualization(self.current_question['type'], self.current_question['data'], format)
 
-    def _generate_mixed_charts(self, question_data):
-        """Generate multiple charts (e.g., combination of bar and line)"""
-        try:
-            # Debug prints
-            print("\n=== Debug Information for Mixed Charts ===")
-            print("Full question_data structure:")
-            print(json.dumps(question_data, indent=2))
-            
-            data = question_data['data']
-            
-            # Create figure and axes with white background
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6), facecolor='white')
-            ax1.set_facecolor('white')
-            ax2.set_facecolor('white')
-            
-            # Debug print series data
-            print("\nSeries data:")
-            print(json.dumps(data.get('series', []), indent=2))
-            
-            series = data.get('series', [])
-            if not series:
-                print("Warning: No series data found")
-                return None
-
-            # First chart (left side)
-            if len(series) > 0:
-                print("\nProcessing first chart...")
-                first_series = series[0]
-                print(f"First series data: {first_series}")
-                
-                categories = first_series['categories']
-                values = first_series['values']
-                x = np.arange(len(categories))
-                
-                # Create bars
-                bars = ax1.bar(x, values, width=0.6, color='skyblue')
-                ax1.set_title(f"{first_series['name']}", pad=20)
-                ax1.set_xticks(x)
-                ax1.set_xticklabels(categories, rotation=45, ha='right')
-                
-                # Add value labels on bars
-                for bar in bars:
-                    height = bar.get_height()
-                    ax1.text(bar.get_x() + bar.get_width()/2., height,
-                            f'{height:,.1f}',
-                            ha='center', va='bottom')
-
-            # Second chart (right side)
-            if len(series) > 1:
-                print("\nProcessing second chart...")
-                second_series = series[1]
-                print(f"Second series data: {second_series}")
-                
-                categories = second_series['categories']
-                values = second_series['values']
-                
-                # Create line plot
-                x_points = np.arange(len(categories))
-                ax2.plot(x_points, values, marker='o', linestyle='-', linewidth=2, color='forestgreen')
-                ax2.set_title(f"{second_series['name']}", pad=20)
-                ax2.set_xticks(x_points)
-                ax2.set_xticklabels(categories, rotation=45, ha='right')
-                
-                # Add value labels on points
-                for i, value in enumerate(values):
-                    ax2.text(i, value, f'{value:,.1f}', 
-                            ha='center', va='bottom')
-
-            # Customize both charts
-            for ax in [ax1, ax2]:
-                ax.grid(True, linestyle='--', alpha=0.7)
-                ax.set_xlabel(data.get('x_axis', {}).get('label', ''))
-                ax.set_ylabel(data.get('y_axis', {}).get('label', ''))
-                
-                # Remove top and right spines
-                ax.spines['top'].set_visible(False)
-                ax.spines['right'].set_visible(False)
-
-            # Add overall title
-            fig.suptitle(data.get('title', ''), fontsize=12, fontweight='bold', y=1.05)
-            
-            # Adjust layout
-            plt.tight_layout()
-            
-            print("\nVisualization generation completed")
-            return fig
-            
-        except Exception as e:
-            print(f"\nError generating mixed charts: {e}")
-            traceback.print_exc()
-            return None
+    def render_visualizations(self, questions, format='png'):
+        """
+        Render many questions' visuals across the renderer's worker processes, e.g. after
+        pre-generating a batch of questions. questions holds (visual_type, question_data) pairs;
+        returns the image bytes (or None) for each. The images stay in the renderer's cache, so
+        serving these questions later does not render again.
+        """
+        return self.chart_renderer.render_many(questions, format)
 
     def _display_question(self):
         """Display the current question and visualization together"""
         # First show the formatted question
         print(self._format_question_display())
         
-        # Then display the visualization if available
-        if self.current_question.get('figure'):
+        # Then display the rendered visualization if available (interactive use only)
+        if self.current_question.get('image_format') == 'png':
             try:
-                plt.figure(self.current_question['figure'].number)
+                import io
+                import matplotlib.pyplot as plt
+                fig, ax = plt.subplots(figsize=ChartRenderer.FIGURE_SIZE)
+                ax.imshow(plt.imread(io.BytesIO(self.current_question['image']), format='png'))
+                ax.axis('off')
                 plt.show()
+                plt.close(fig)
             except Exception as e:
                 logger.error(f"Error displaying visualization: {e}")
 
-    def _format_feedback(self, feedback):
+    def _format_feedback(self, feedback, partial=False):
         """
-        Format the feedback with nice borders
+        Format the feedback with nice borders.
+        With partial=True the feedback is still streaming and a continuation marker is added.
         """
         # Handle TextBlock from Claude-3 response
         if hasattr(feedback, 'text'):
@@ -606,6 +610,8 @@ class IELTSWritingAgent:
             content = feedback if isinstance(feedback, str) else '\n'.join(str(f) for f in feedback)
         
         # Format with borders
+        if partial:
+            content += " …"
         content = content.replace('\n', '\n║ ')
         formatted = (
             "╔════════════════════════ IELTS Writing Evaluation ════════════════════════╗\n"
@@ -622,8 +628,21 @@ class IELTSWritingAgent:
         logger.error(error_message)
         return f"Error: {error_type}"
 
-# Initialize the agent
-agent = IELTSWritingAgent()
+# The agent is built on first use so that importing this module has no side effects
+_agent = None
+
+def get_agent():
+    """Return the module-level agent, creating it on first use"""
+    global _agent
+    if _agent is None:
+        _agent = IELTSWritingAgent()
+    return _agent
+
+def __getattr__(name):
+    # Keep `writing_1_claude.agent` working without building the agent at import time
+    if name == 'agent':
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_user_answer():
     """
@@ -648,6 +667,8 @@ def get_user_answer():
     return '\n'.join(lines)
 
 def main():
+    agent = get_agent()
+
     # Get a new question
     agent.get_new_question()
     
@@ -6,6 +6,16 @@ from dotenv import load_dotenv
 import logging
 import traceback
 import re
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from question_pool import QuestionPool
+from clients import get_client, get_async_client
+from scheduler import get_scheduler, INTERACTIVE, BACKGROUND
+from corpus import get_corpus, determine_question_type
+from token_budget import get_token_counter, pack_to_budget
+from marker_scanner import MarkerScanner
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -26,6 +36,7 @@ class IELTSWritingTask2Agent:
     MINIMUM_WORDS = 250
     MAXIMUM_TOKENS = 2000
     TEMPERATURE = 0.7
+    SAMPLE_TOKEN_BUDGET = 2500  # Tokens of sample material per prompt, leaving room for the rest
     
     QUESTION_TYPES = [
         "agree_disagree",
@@ -34,111 +45,629 @@ class IELTSWritingTask2Agent:
         "problem_solution",
         "positive_negative"
     ]
+
+    SCORE_FIELDS = ['band_score', 'tr_score', 'cc_score', 'lr_score', 'gra_score']
+
+    INTRO_MARKERS = [
+        'nowadays', 'recently', 'in recent years', 'it is often said',
+        'many people believe', 'there is a growing concern',
+        'there is considerable discussion', 'it is widely believed'
+    ]
+
+    CONCLUSION_MARKERS = [
+        'in conclusion', 'to conclude', 'to sum up', 'in summary',
+        'overall', 'to summarize', 'in my opinion', 'finally'
+    ]
+
+    COHESIVE_DEVICES = {
+        'sequence': ['firstly', 'secondly', 'finally', 'next', 'then'],
+        'addition': ['furthermore', 'moreover', 'in addition', 'also', 'besides'],
+        'contrast': ['however', 'nevertheless', 'although', 'despite', 'while'],
+        'example': ['for example', 'for instance', 'such as', 'particularly'],
+        'result': ['therefore', 'thus', 'consequently', 'as a result'],
+        'summary': ['in conclusion', 'to sum up', 'overall', 'in summary']
+    }
+
+    # One precompiled regex over every marker above, so an essay is scanned in a single pass
+    MARKER_SCANNER = MarkerScanner({
+        'introduction': INTRO_MARKERS,
+        'conclusion': CONCLUSION_MARKERS,
+        **COHESIVE_DEVICES
+    })
+
+    # Tool used by the structured evaluation mode to return the whole evaluation as JSON
+    EVALUATION_TOOL = {
+        "name": "record_evaluation",
+        "description": "Record the complete IELTS Writing Task 2 evaluation of the student's answer.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "band_score": {"type": "number", "minimum": 0, "maximum": 9, "description": "Overall band score"},
+                "tr_score": {"type": "number", "minimum": 0, "maximum": 9, "description": "Task Response band"},
+                "cc_score": {"type": "number", "minimum": 0, "maximum": 9, "description": "Coherence and Cohesion band"},
+                "lr_score": {"type": "number", "minimum": 0, "maximum": 9, "description": "Lexical Resource band"},
+                "gra_score": {"type": "number", "minimum": 0, "maximum": 9, "description": "Grammatical Range and Accuracy band"},
+                "strengths": {"type": "array", "items": {"type": "string"}, "description": "Specific key strengths"},
+                "improvements": {"type": "array", "items": {"type": "string"}, "description": "Specific areas for improvement"},
+                "detailed_feedback": {"type": "string", "description": "Paragraph-by-paragraph analysis of the essay"}
+            },
+            "required": [
+                "band_score", "tr_score", "cc_score", "lr_score", "gra_score",
+                "strengths", "improvements", "detailed_feedback"
+            ]
+        }
+    }
     
-    def __init__(self):
-        """Initialize the IELTS Writing Task 2 agent"""
-        self.anthropic = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    def __init__(self, client=None, async_client=None, question_pool=None, response_cache=None, scheduler=None, corpus=None, token_counter=None, pre_grader=None):
+        """
+        Initialize the IELTS Writing Task 2 agent.
+        client and async_client override the shared, connection-pooled clients from clients.py.
+        question_pool, if given, is a QuestionPool that generate_question serves from first.
+        response_cache, if given, is a ResponseCache used for deterministic and evaluation calls.
+        scheduler overrides the shared RequestScheduler that rate-limits and retries every call.
+        corpus overrides the shared Corpus that samples, templates and standards are read from.
+        token_counter overrides the shared TokenCounter used to fit samples into SAMPLE_TOKEN_BUDGET.
+        pre_grader, if given, is a PreGrader; essays it can grade offline skip the LLM evaluation.
+        """
+        self._client = client
+        self._async_client = async_client
+        self.question_pool = question_pool
+        self.response_cache = response_cache
+        self.scheduler = scheduler or get_scheduler()
+        self.corpus = corpus or get_corpus()
+        self.token_counter = token_counter or get_token_counter()
+        self.pre_grader = pre_grader
         
         # Add token tracking
         self.total_input_tokens = 0
         self.total_output_tokens = 0
+        self._usage_lock = threading.Lock()
         
         # Get paths using os.path for better cross-platform compatibility
         self.current_dir = os.path.dirname(os.path.abspath(__file__))
         self.parent_dir = os.path.dirname(self.current_dir)
         
         try:
-            # Load templates and samples
-            templates_path = os.path.join(self.parent_dir, 'standards', 'ielts_templates.json')
-            samples_path = os.path.join(self.parent_dir, 'writing', 'writing_2_samples.json')
-            standards_path = os.path.join(self.parent_dir, 'standards', 'cefr_standards.json')
-            
-            with open(templates_path, 'r') as f:
-                self.templates = json.load(f)
-            with open(samples_path, 'r') as f:
-                self.samples = json.load(f)
-            with open(standards_path, 'r') as f:
-                self.standards = json.load(f)
+            # Templates and standards are shared with every other agent through the corpus
+            self.templates = self.corpus.templates
+            self.standards = self.corpus.cefr_standards
         except FileNotFoundError as e:
             logger.error(f"Required data file not found: {e}")
             self.templates = {}
-            self.samples = {}
             self.standards = {}
         except json.JSONDecodeError as e:
             logger.error(f"Error parsing JSON data: {e}")
             self.templates = {}
-            self.samples = {}
             self.standards = {}
         
         self.current_question = None
+        self.last_evaluation_latency = {}
+        self.last_evaluation_usage = {}
+        self.last_pre_grade = None
+        self.time_to_first_token = {}
 
     def track_token_usage(self, message):
         """Track token usage from API response"""
         if hasattr(message, 'usage'):
-            self.total_input_tokens += message.usage.input_tokens
-            self.total_output_tokens += message.usage.output_tokens
+            # Several review sections may report usage from different threads
+            with self._usage_lock:
+                self.total_input_tokens += message.usage.input_tokens
+                self.total_output_tokens += message.usage.output_tokens
             logger.info(f"Message tokens - Input: {message.usage.input_tokens}, Output: {message.usage.output_tokens}")
             logger.info(f"Total tokens - Input: {self.total_input_tokens}, Output: {self.total_output_tokens}")
 
+    @property
+    def samples(self):
+        """Whole writing_2_samples.json, decoded on first access; prompts use corpus.task_2_examples"""
+        return self.corpus.writing_2_samples
+
+    @property
+    def anthropic(self):
+        """Anthropic client; the shared one is looked up on every call, so clients.configure() applies"""
+        return self._client or get_client()
+
+    @property
+    def async_anthropic(self):
+        """AsyncAnthropic client used by the *_async methods"""
+        return self._async_client or get_async_client()
+
     def generate_question(self, question_type=None):
-        """Generate a new IELTS Writing Task 2 question"""
+        """Generate a new IELTS Writing Task 2 question, serving it from the question pool if one is enabled"""
+        pooled = self._pop_pooled_question(question_type)
+        if pooled:
+            return self._serve_question(pooled)
+
+        prompt = self._prepare_question_prompt(question_type)
+        
+        try:
+            # Generate the question using the LLM
+            response = self._create_message(self._message_request(prompt, self.TEMPERATURE))
+            return self._handle_question_response(response)
+
+        except Exception as e:
+            logger.error(f"Error generating question: {e}")
+            traceback.print_exc()
+            return "Error generating question"
+
+    async def generate_question_async(self, question_type=None):
+        """Async counterpart of generate_question"""
+        pooled = self._pop_pooled_question(question_type)
+        if pooled:
+            return self._serve_question(pooled)
+
+        # Sample packing may call the token counting endpoint (and reads the topic tracker), so keep it off the event loop
+        prompt = await asyncio.to_thread(self._prepare_question_prompt, question_type)
+        
+        try:
+            response = await self._create_message_async(self._message_request(prompt, self.TEMPERATURE))
+            return self._handle_question_response(response)
+
+        except Exception as e:
+            logger.error(f"Error generating question: {e}")
+            traceback.print_exc()
+            return "Error generating question"
+
+    def enable_question_pool(self, depth=3, path=None, start=True):
+        """
+        Serve questions from a persistent pool of pre-generated questions, one bucket per
+        QUESTION_TYPES entry, kept topped up to `depth` by a background worker.
+        """
+        if path is None:
+            path = os.path.join(self.parent_dir, 'writing', 'question_pool_task_2.json')
+        self.question_pool = QuestionPool(
+            self._generate_pool_question,
+            self.QUESTION_TYPES,
+            path,
+            depth=depth,
+            topic_of=lambda question: question.get('topic_category')
+        )
+        if start:
+            self.question_pool.start()
+        return self.question_pool
+
+    def _generate_pool_question(self, question_type, pooled_topics):
+        """Generate a question for the pool, steering away from topics already queued"""
+        sample_questions = self.prepare_samples_for_prompt(question_type, fields=['question'])
+        prompt = self._create_question_prompt(question_type, sample_questions, avoid_topics=pooled_topics)
+        response = self._create_message(self._message_request(prompt, self.TEMPERATURE), priority=BACKGROUND)
+        self.track_token_usage(response)
+        return self._parse_question_response(response)
+
+    def _pop_pooled_question(self, question_type=None):
+        """Take a question from the pool, avoiding recently used topics; None if there is no pool or it is empty"""
+        if not self.question_pool:
+            return None
+        pooled = self.question_pool.pop(question_type, avoid_topics=self._load_recent_topics())
+        if not pooled:
+            logger.info("Question pool empty, generating question on demand")
+            return None
+        return pooled[1]
+
+    def _prepare_question_prompt(self, question_type=None):
+        """Pick a question type (if not given) and build the question prompt"""
         if not question_type:
             question_type = random.choice(self.QUESTION_TYPES)
         
-        # Prepare sample questions for the prompt
-        sample_questions = self.prepare_samples_for_prompt(question_type)
+        # Prepare sample questions for the prompt; only the question text is used
+        sample_questions = self.prepare_samples_for_prompt(question_type, fields=['question'])
         
         # Create the question prompt
-        prompt = self._create_question_prompt(question_type, sample_questions)
+        return self._create_question_prompt(question_type, sample_questions)
+
+    def _serve_question(self, question_data):
+        """Record the question's topic, store it as the current question and format it"""
+        # Update topic tracker
+        if question_data and 'topic_category' in question_data:
+            self._update_topic_tracker(question_data['topic_category'])
+        
+        # Store the current question
+        self.current_question = question_data
+        
+        return self._format_question_display()
+
+    def _handle_question_response(self, response):
+        """Parse a question response, store it as the current question and format it"""
+        # Track token usage
+        self.track_token_usage(response)
         
+        # Add debug logging
+        logger.debug(f"Raw response from Claude: {response.content}")
+        
+        # Parse the response to get the question data
+        question_data = self._parse_question_response(response)
+        
+        # Add debug logging
+        logger.debug(f"Parsed question data: {question_data}")
+        
+        return self._serve_question(question_data)
+
+    def _message_request(self, prompt, temperature=None):
+        """Build the keyword arguments for a single-prompt messages.create call"""
+        request = {
+            'model': MODEL,
+            'max_tokens': self.MAXIMUM_TOKENS,
+            'messages': [{"role": "user", "content": prompt}]
+        }
+        if temperature is not None:
+            request['temperature'] = temperature
+        return request
+
+    def _create_message(self, request, cacheable=False, priority=INTERACTIVE):
+        """
+        Send a messages.create request through the scheduler, and through the response cache if one
+        is configured. Temperature-0 requests are always cacheable; evaluation requests are marked
+        cacheable so identical resubmissions are not re-graded.
+        """
+        create = lambda **kwargs: self.scheduler.run(self.anthropic.messages.create, kwargs, priority)
+        if self.response_cache:
+            return self.response_cache.create(create, request, cacheable)
+        return create(**request)
+
+    async def _create_message_async(self, request, cacheable=False, priority=INTERACTIVE):
+        """Async counterpart of _create_message"""
+        create = lambda **kwargs: self.scheduler.run_async(self.async_anthropic.messages.create, kwargs, priority)
+        if self.response_cache:
+            return await self.response_cache.create_async(create, request, cacheable)
+        return await create(**request)
+
+    def evaluate_answer(self, answer_text, concurrent=True, structured=False):
+        """
+        Evaluate a submitted answer for the current question.
+        When concurrent is True the score and feedback prompts are sent in parallel.
+        When structured is True a single tool-use call returns the whole evaluation as validated JSON.
+        With a pre_grader, clearly low-band or off-task essays are graded offline without any call.
+        Per-call and total latency are stored in self.last_evaluation_latency and
+        token usage in self.last_evaluation_usage.
+        """
+        error = self._check_answer(answer_text)
+        if error:
+            return error
+
+        pre_graded = self._pre_grade(answer_text)
+        if pre_graded:
+            return pre_graded
+
+        word_count = len(answer_text.split())
+        if structured:
+            try:
+                start_time = time.perf_counter()
+                prompt = self._create_structured_evaluation_prompt(answer_text, word_count)
+                result = self._timed_create(prompt, structured=True)
+                return self._complete_structured_evaluation(result, time.perf_counter() - start_time)
+
+            except Exception as e:
+                logger.error(f"Error evaluating answer: {e}")
+                traceback.print_exc()
+                return f"Error evaluating answer: {str(e)}"
+
+        score_prompt = self._create_score_prompt(answer_text, word_count)
+        feedback_prompt = self._create_feedback_prompt(answer_text, word_count)
+
         try:
-            # Generate the question using the LLM
-            response = self.anthropic.messages.create(
-                model=MODEL,
-                max_tokens=self.MAXIMUM_TOKENS,
-                temperature=self.TEMPERATURE,
-                messages=[{"role": "user", "content": prompt}]
+            start_time = time.perf_counter()
+
+            if concurrent:
+                # The two prompts are independent, so send them at the same time
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    score_future = executor.submit(self._timed_create, score_prompt)
+                    feedback_future = executor.submit(self._timed_create, feedback_prompt)
+                    score_result = score_future.result()
+                    feedback_result = feedback_future.result()
+            else:
+                score_result = self._timed_create(score_prompt)
+                feedback_result = self._timed_create(feedback_prompt)
+
+            return self._complete_evaluation(score_result, feedback_result, time.perf_counter() - start_time)
+
+        except Exception as e:
+            logger.error(f"Error evaluating answer: {e}")
+            traceback.print_exc()
+            return f"Error evaluating answer: {str(e)}"
+
+    async def evaluate_answer_async(self, answer_text, structured=False):
+        """Async counterpart of evaluate_answer; the score and feedback prompts always run concurrently"""
+        error = self._check_answer(answer_text)
+        if error:
+            return error
+
+        pre_graded = self._pre_grade(answer_text)
+        if pre_graded:
+            return pre_graded
+
+        word_count = len(answer_text.split())
+        if structured:
+            try:
+                start_time = time.perf_counter()
+                prompt = self._create_structured_evaluation_prompt(answer_text, word_count)
+                result = await self._timed_create_async(prompt, structured=True)
+                return self._complete_structured_evaluation(result, time.perf_counter() - start_time)
+
+            except Exception as e:
+                logger.error(f"Error evaluating answer: {e}")
+                traceback.print_exc()
+                return f"Error evaluating answer: {str(e)}"
+
+        score_prompt = self._create_score_prompt(answer_text, word_count)
+        feedback_prompt = self._create_feedback_prompt(answer_text, word_count)
+
+        try:
+            start_time = time.perf_counter()
+            score_result, feedback_result = await asyncio.gather(
+                self._timed_create_async(score_prompt),
+                self._timed_create_async(feedback_prompt)
             )
-            
-            # Track token usage
-            self.track_token_usage(response)
-            
-            # Add debug logging
-            logger.debug(f"Raw response from Claude: {response.content}")
-            
-            # Parse the response to get the question data
-            question_data = self._parse_question_response(response)
-            
-            # Add debug logging
-            logger.debug(f"Parsed question data: {question_data}")
-            
-            # Update topic tracker
-            if question_data and 'topic_category' in question_data:
-                self._update_topic_tracker(question_data['topic_category'])
-            
-            # Store the current question
-            self.current_question = question_data
-            
-            return self._format_question_display()
+            return self._complete_evaluation(score_result, feedback_result, time.perf_counter() - start_time)
 
         except Exception as e:
-            logger.error(f"Error generating question: {e}")
+            logger.error(f"Error evaluating answer: {e}")
             traceback.print_exc()
-            return "Error generating question"
+            return f"Error evaluating answer: {str(e)}"
+
+    def review_essay(self, answer_text):
+        """
+        Run the full post-essay review and yield (section, formatted_text) pairs as each section finishes.
+
+        Sections are 'evaluation' (score and feedback prompts, run concurrently), 'improvements'
+        and 'vocabulary'. Only the improvement prompt depends on the local structure analysis,
+        which is computed up front, so all four LLM requests run in parallel and the total
+        wall-clock time is close to the slowest single call.
+        An answer that cannot be evaluated (e.g. too short) still gets its improvement and
+        vocabulary suggestions; only the 'evaluation' section is the error message.
+        """
+        start_time = time.perf_counter()
+        analysis_results = self._analyze_essay_structure(answer_text)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {
+                executor.submit(self.evaluate_answer, answer_text): 'evaluation',
+                executor.submit(self.generate_improvement_suggestions, answer_text, analysis_results): 'improvements',
+                executor.submit(self.generate_vocabulary_suggestions, answer_text): 'vocabulary'
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+        logger.info(f"Essay review completed in {time.perf_counter() - start_time:.2f}s")
+
+    async def review_essay_async(self, answer_text):
+        """Async counterpart of review_essay; yields (section, formatted_text) pairs as they finish"""
+        start_time = time.perf_counter()
+        analysis_results = self._analyze_essay_structure(answer_text)
+
+        tasks = {
+            asyncio.create_task(self.evaluate_answer_async(answer_text)): 'evaluation',
+            asyncio.create_task(self.generate_improvement_suggestions_async(answer_text, analysis_results)): 'improvements',
+            asyncio.create_task(self.generate_vocabulary_suggestions_async(answer_text)): 'vocabulary'
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield tasks[task], task.result()
+        finally:
+            # Don't leave requests running if the consumer stops early
+            for task in pending:
+                task.cancel()
+
+        logger.info(f"Essay review completed in {time.perf_counter() - start_time:.2f}s")
+
+    def stream_evaluation(self, answer_text):
+        """
+        Streaming variant of evaluate_answer.
+        The short score prompt runs in the background while the feedback streams; each yield is the
+        formatted evaluation so far, and the last yield is the complete evaluation.
+        """
+        error = self._check_answer(answer_text)
+        if error:
+            yield error
+            return
+
+        word_count = len(answer_text.split())
+        score_prompt = self._create_score_prompt(answer_text, word_count)
+        feedback_prompt = self._create_feedback_prompt(answer_text, word_count)
+
+        try:
+            start_time = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                score_future = executor.submit(self._timed_create, score_prompt)
 
-    def evaluate_answer(self, answer_text):
-        """Evaluate a submitted answer for the current question"""
+                scores = {}
+                feedback_content = ''
+                for text in self._stream_text(self._message_request(feedback_prompt), 'feedback'):
+                    feedback_content += text
+                    if not scores and score_future.done():
+                        scores = self._parse_scores(self._extract_text(score_future.result()[0]))
+                    yield self._format_evaluation({**scores, **self._parse_feedback(feedback_content)}, partial=True)
+
+                score_response, score_latency = score_future.result()
+
+            self.track_token_usage(score_response)
+            self.last_evaluation_latency = {
+                'score': score_latency,
+                'feedback_first_token': self.time_to_first_token.get('feedback'),
+                'total': time.perf_counter() - start_time
+            }
+
+            scores = self._parse_scores(self._extract_text(score_response))
+            yield self._format_evaluation({**scores, **self._parse_feedback(feedback_content)})
+
+        except Exception as e:
+            logger.error(f"Error evaluating answer: {e}")
+            traceback.print_exc()
+            yield f"Error evaluating answer: {str(e)}"
+
+    def _stream_text(self, request, label):
+        """
+        Stream a messages request, yielding text deltas as they arrive.
+        Time-to-first-token is stored in self.time_to_first_token[label] and usage is tracked at the end.
+        """
+        start_time = time.perf_counter()
+        first_token = True
+        with self.scheduler.stream(self.anthropic.messages.stream, request) as stream:
+            for text in stream.text_stream:
+                if first_token:
+                    first_token = False
+                    self.time_to_first_token[label] = time.perf_counter() - start_time
+                    logger.info(f"Time to first token ({label}): {self.time_to_first_token[label]:.2f}s")
+                yield text
+            message = stream.get_final_message()
+
+        # Track token usage
+        self.track_token_usage(message)
+
+    def _check_answer(self, answer_text):
+        """Return an error message if the answer cannot be evaluated, otherwise None"""
         if not self.current_question:
             return "Error: No current question found. Please generate a question first."
         
         word_count = len(answer_text.split())
         if word_count < self.MINIMUM_WORDS:
             return f"Your answer is too short. Minimum {self.MINIMUM_WORDS} words required. Current word count: {word_count}"
+        return None
+
+    def _pre_grade(self, answer_text):
+        """Return the offline evaluation if the pre-grader settles the essay without the LLM, otherwise None"""
+        if not self.pre_grader:
+            return None
+
+        start_time = time.perf_counter()
+        result = self.pre_grader.grade(answer_text, self.current_question['question']['description'])
+        self.last_pre_grade = result
+        if result['route'] != 'local':
+            return None
+
+        latency = time.perf_counter() - start_time
+        self.last_evaluation_latency = {'pre_grade': latency, 'total': latency}
+        self.last_evaluation_usage = {'input_tokens': 0, 'output_tokens': 0}
+        logger.info(f"Pre-graded offline at band {result['band']} ({result['low']}-{result['high']}), skipping the LLM evaluation")
+        return self._format_evaluation(self.pre_grader.evaluation(result))
+
+    def _complete_evaluation(self, score_result, feedback_result, total_latency):
+        """Track usage and latency, then parse, merge and format the score and feedback responses"""
+        score_response, score_latency = score_result
+        feedback_response, feedback_latency = feedback_result
+
+        # Track token usage (done here so the counters are only updated from one thread)
+        self.track_token_usage(score_response)
+        self.track_token_usage(feedback_response)
+
+        self.last_evaluation_latency = {
+            'score': score_latency,
+            'feedback': feedback_latency,
+            'total': total_latency
+        }
+        self.last_evaluation_usage = self._sum_usage(score_response, feedback_response)
+        logger.info(
+            f"Evaluation latency - Score: {score_latency:.2f}s, "
+            f"Feedback: {feedback_latency:.2f}s, Total: {total_latency:.2f}s"
+        )
+
+        # Extract content
+        score_content = self._extract_text(score_response)
+        feedback_content = self._extract_text(feedback_response)
+
+        # Parse scores
+        scores = self._parse_scores(score_content)
+        
+        # Parse feedback
+        feedback = self._parse_feedback(feedback_content)
+
+        # Combine results
+        evaluation = {**scores, **feedback}
+
+        # Format the evaluation
+        return self._format_evaluation(evaluation)
+
+    def _complete_structured_evaluation(self, result, total_latency):
+        """Track usage and latency, then validate and format a structured evaluation response"""
+        response, latency = result
+        self.track_token_usage(response)
+
+        self.last_evaluation_latency = {
+            'structured': latency,
+            'total': total_latency
+        }
+        self.last_evaluation_usage = self._sum_usage(response)
+        logger.info(f"Evaluation latency - Structured: {latency:.2f}s, Total: {total_latency:.2f}s")
 
-        # First prompt: Get numerical scores only
-        score_prompt = f"""You are an IELTS examiner. Evaluate this Writing Task 2 answer and provide ONLY numerical scores.
+        evaluation = self._parse_structured_evaluation(response)
+        return self._format_evaluation(evaluation)
 
-        Question: {self.current_question.get('description', '')}
+    def _sum_usage(self, *responses):
+        """Sum input and output tokens over one or more responses"""
+        usage = {'input_tokens': 0, 'output_tokens': 0}
+        for response in responses:
+            if hasattr(response, 'usage'):
+                usage['input_tokens'] += response.usage.input_tokens
+                usage['output_tokens'] += response.usage.output_tokens
+        return usage
+
+    def _create_structured_evaluation_prompt(self, answer_text, word_count, question=None):
+        """Create the single prompt used by the structured evaluation mode (for the current question unless `question` is given)"""
+        question = question if question is not None else self.current_question
+        return f"""You are an IELTS examiner. Evaluate this Writing Task 2 answer and record the result
+        with the {self.EVALUATION_TOOL['name']} tool.
+
+        Question: {self._question_text(question)}
+
+        Student's answer ({word_count} words):
+        {answer_text}
+
+        Provide:
+        - Band scores (0.0-9.0, in steps of 0.5) for the overall band, Task Response, Coherence and Cohesion,
+          Lexical Resource and Grammatical Range and Accuracy
+        - Three specific key strengths
+        - Three specific areas for improvement
+        - A paragraph-by-paragraph analysis of the essay"""
+
+    def _parse_structured_evaluation(self, response):
+        """Extract and validate the evaluation recorded through the evaluation tool"""
+        for block in response.content:
+            if getattr(block, 'type', None) == 'tool_use' and block.name == self.EVALUATION_TOOL['name']:
+                return self._validate_evaluation(block.input)
+        raise ValueError(f"No {self.EVALUATION_TOOL['name']} tool call found in response")
+
+    def _validate_evaluation(self, data):
+        """Validate structured evaluation data against EVALUATION_TOOL's schema"""
+        if not isinstance(data, dict):
+            raise ValueError("Evaluation must be a JSON object")
+
+        for field in self.EVALUATION_TOOL['input_schema']['required']:
+            if field not in data:
+                raise ValueError(f"Missing required field: {field}")
+
+        evaluation = {}
+        for field in self.SCORE_FIELDS:
+            try:
+                score = float(data[field])
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid score for field {field}: {data[field]!r}")
+            if not 0 <= score <= 9:
+                raise ValueError(f"Score out of range for field {field}: {score}")
+            evaluation[field] = score
+
+        for field in ['strengths', 'improvements']:
+            if not isinstance(data[field], list) or not all(isinstance(item, str) for item in data[field]):
+                raise ValueError(f"Invalid type for field {field}: expected list of strings")
+            evaluation[field] = [item.strip() for item in data[field] if item.strip()]
+
+        if not isinstance(data['detailed_feedback'], str):
+            raise ValueError("Invalid type for field detailed_feedback: expected str")
+        evaluation['detailed_feedback'] = data['detailed_feedback'].strip()
+
+        return evaluation
+
+    def _question_text(self, question):
+        """A question's task text, from question['question']['description'] (a string or a list of lines)"""
+        description = question.get('question', {}).get('description', '')
+        return '\n'.join(description) if isinstance(description, list) else description
+
+    def _create_score_prompt(self, answer_text, word_count, question=None):
+        """Create the prompt that asks for numerical scores only (for the current question unless `question` is given)"""
+        question = question if question is not None else self.current_question
+        return f"""You are an IELTS examiner. Evaluate this Writing Task 2 answer and provide ONLY numerical scores.
+
+        Question: {self._question_text(question)}
 
         Student's answer ({word_count} words):
         {answer_text}
@@ -150,10 +679,12 @@ class IELTSWritingTask2Agent:
         Lexical Resource: [0.0-9.0]
         Grammatical Range and Accuracy: [0.0-9.0]"""
 
-        # Second prompt: Get detailed feedback
-        feedback_prompt = f"""Now provide detailed feedback for this IELTS Writing Task 2 answer.
+    def _create_feedback_prompt(self, answer_text, word_count, question=None):
+        """Create the prompt that asks for detailed feedback (for the current question unless `question` is given)"""
+        question = question if question is not None else self.current_question
+        return f"""Now provide detailed feedback for this IELTS Writing Task 2 answer.
 
-        Question: {self.current_question.get('description', '')}
+        Question: {self._question_text(question)}
 
         Student's answer ({word_count} words):
         {answer_text}
@@ -173,71 +704,39 @@ class IELTSWritingTask2Agent:
         Detailed Analysis:
         [Provide a paragraph-by-paragraph analysis of the essay]"""
 
-        try:
-            # Get scores
-            score_response = self.anthropic.messages.create(
-                model=MODEL,
-                max_tokens=self.MAXIMUM_TOKENS,
-                messages=[{"role": "user", "content": score_prompt}]
-            )
-            # Track token usage
-            self.track_token_usage(score_response)
-            
-            # Get feedback
-            feedback_response = self.anthropic.messages.create(
-                model=MODEL,
-                max_tokens=self.MAXIMUM_TOKENS,
-                messages=[{"role": "user", "content": feedback_prompt}]
-            )
-            # Track token usage
-            self.track_token_usage(feedback_response)
-
-            # Extract content
-            score_content = score_response.content[0].text if isinstance(score_response.content, list) else score_response.content
-            feedback_content = feedback_response.content[0].text if isinstance(feedback_response.content, list) else feedback_response.content
-
-            # Parse scores
-            scores = self._parse_scores(score_content)
-            
-            # Parse feedback
-            feedback = self._parse_feedback(feedback_content)
-
-            # Combine results
-            evaluation = {**scores, **feedback}
-
-            # Format the evaluation
-            return self._format_evaluation(evaluation)
-
-        except Exception as e:
-            logger.error(f"Error evaluating answer: {e}")
-            traceback.print_exc()
-            return f"Error evaluating answer: {str(e)}"
+    def _timed_create(self, prompt, structured=False):
+        """Send a single evaluation prompt and return (response, latency in seconds)"""
+        start_time = time.perf_counter()
+        response = self._create_message(self._evaluation_request(prompt, structured), cacheable=True)
+        return response, time.perf_counter() - start_time
+
+    async def _timed_create_async(self, prompt, structured=False):
+        """Async counterpart of _timed_create"""
+        start_time = time.perf_counter()
+        response = await self._create_message_async(self._evaluation_request(prompt, structured), cacheable=True)
+        return response, time.perf_counter() - start_time
+
+    def _evaluation_request(self, prompt, structured=False):
+        """Build the request for an evaluation prompt, forcing the evaluation tool in structured mode"""
+        request = self._message_request(prompt)
+        if structured:
+            request['tools'] = [self.EVALUATION_TOOL]
+            request['tool_choice'] = {"type": "tool", "name": self.EVALUATION_TOOL['name']}
+        return request
+
+    def _extract_text(self, response):
+        """Extract the text content from a Claude response"""
+        return response.content[0].text if isinstance(response.content, list) else response.content
 
     def _determine_question_type(self, description):
         """Determine the type of question based on its description"""
-        text = ' '.join(description).lower()
-        
-        if "agree or disagree" in text:
-            return "agree_disagree"
-        elif "discuss both" in text:
-            return "discuss_both_views"
-        elif "advantages and disadvantages" in text:
-            return "advantages_disadvantages"
-        elif "positive or negative" in text:
-            return "positive_negative"
-        elif "problem" in text and "solution" in text:
-            return "problem_solution"
-        else:
-            return "discuss_both_views"  # default type
+        return determine_question_type(description)
 
     def get_sample_questions(self, question_type):
         """Get a curated set of sample questions for the given type"""
         
-        # Filter questions by type
-        relevant_questions = [
-            q for q in self.samples['ielts_writing_task_2']['question_examples'] 
-            if self._determine_question_type(q['description']) == question_type
-        ]
+        # Questions are indexed by type once, in the shared corpus
+        relevant_questions = list(self.corpus.task_2_examples(question_type))
         
         # If we have too many samples, randomly select a subset
         MAX_SAMPLES = 3  # We can adjust this based on token limits
@@ -246,51 +745,58 @@ class IELTSWritingTask2Agent:
         
         return relevant_questions
 
-    def format_sample_for_prompt(self, sample):
-        """Format a single sample question with its answer and comments"""
+    def format_sample_for_prompt(self, sample, fields=None):
+        """Format a single sample question with its answer and comments, keeping only `fields` if given"""
         formatted = {
             'question': sample['description'],
             'example_answer': sample['answers']['example_answer']['text'],
             'examiner_comments': sample['answers']['examiner_comments'],
             'score': sample['answers']['example_answer']['score']
         }
+        if fields:
+            formatted = {field: formatted[field] for field in fields}
         return formatted
 
-    def prepare_samples_for_prompt(self, question_type):
-        """Prepare formatted samples for the prompt"""
-        samples = self.get_sample_questions(question_type)
-        
-        formatted_samples = []
-        total_tokens = 0  # We'll need to implement token counting
-        
-        for sample in samples:
-            formatted = self.format_sample_for_prompt(sample)
-            
-            # Estimate tokens (we can implement a proper token counter)
-            sample_tokens = len(str(formatted).split()) * 1.3  # rough estimate
-            
-            if total_tokens + sample_tokens > 2500:  # Leave room for other prompt parts
-                break
-            
-            formatted_samples.append(formatted)
-            total_tokens += sample_tokens
-        
-        return formatted_samples
-
-    def _create_question_prompt(self, question_type, sample_questions):
-        """Create an enhanced prompt with focus on creativity and topic diversity"""
-        
-        # Load topic history
+    def prepare_samples_for_prompt(self, question_type, budget=None, fields=None):
+        """
+        Prepare formatted samples for the prompt: the highest-scored samples that fit in
+        `budget` tokens (SAMPLE_TOKEN_BUDGET by default), counted exactly and memoized per sample.
+        """
+        budget = budget if budget is not None else self.SAMPLE_TOKEN_BUDGET
+        samples = sorted(
+            self.get_sample_questions(question_type),
+            key=lambda sample: float(sample['answers']['example_answer'].get('score') or 0),
+            reverse=True
+        )
+        formatted_samples = [self.format_sample_for_prompt(sample, fields) for sample in samples]
+
+        packed, total_tokens = pack_to_budget(
+            formatted_samples, budget,
+            lambda formatted: self.token_counter.count(json.dumps(formatted, indent=2))
+        )
+        logger.info(f"Packed {len(packed)}/{len(formatted_samples)} samples into {total_tokens}/{budget} tokens")
+        return packed
+
+    def _load_recent_topics(self):
+        """Load the last 5 used topics from the topic tracker"""
         try:
-            # Get paths using os.path for better cross-platform compatibility
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            parent_dir = os.path.dirname(current_dir)
-            
-            with open(os.path.join(parent_dir, 'writing', 'topic_tracker.json'), 'r') as f:
+            with open(os.path.join(self.parent_dir, 'writing', 'topic_tracker.json'), 'r') as f:
                 topic_data = json.load(f)
-                recent_topics = topic_data['used_topics'][-5:]  # Last 5 topics
+                return topic_data['used_topics'][-5:]  # Last 5 topics
         except (FileNotFoundError, json.JSONDecodeError):
-            recent_topics = []
+            return []
+
+    def _create_question_prompt(self, question_type, sample_questions, avoid_topics=None):
+        """
+        Create an enhanced prompt with focus on creativity and topic diversity.
+        avoid_topics are excluded in addition to the recent topics (e.g. topics already queued in the question pool).
+        """
+        
+        # Load topic history
+        recent_topics = self._load_recent_topics()
+        for topic in avoid_topics or []:
+            if topic and topic not in recent_topics:
+                recent_topics.append(topic)
 
         prompt = f"""You are an IELTS Writing Task 2 question generator. Create a unique, thought-provoking question that:
         1. Follows the {question_type} format exactly
@@ -306,7 +812,7 @@ class IELTSWritingTask2Agent:
         - Maintain neutral stance on sensitive issues
         
         Here are a few example questions for structure reference ONLY:
-        {json.dumps([sample['question'] for sample in sample_questions[:2]], indent=2)}
+        {json.dumps([sample['question'] for sample in sample_questions], indent=2)}
 
         === OUTPUT FORMAT ===
         Respond with ONLY a JSON object in this format:
@@ -331,29 +837,43 @@ class IELTSWritingTask2Agent:
 
         return prompt
 
-    def _format_evaluation(self, evaluation):
-        """Format the evaluation response with detailed feedback"""
+    def _format_evaluation(self, evaluation, partial=False):
+        """
+        Format the evaluation response with detailed feedback.
+        With partial=True, missing scores and sections are shown as pending instead of absent.
+        """
+        missing_score = 'pending…' if partial else 'N/A'
+        scores = {key: missing_score if evaluation.get(key) is None else evaluation[key] for key in self.SCORE_FIELDS}
+
+        def section(key, default):
+            value = evaluation.get(key)
+            if value:
+                return value
+            if partial:
+                return ['pending…'] if isinstance(default, list) else 'pending…'
+            return default
+
         try:
             formatted_report = f"""
 ╔════════════════════════ IELTS Writing Task 2 Evaluation ════════════════════════╗
 ║ Overall Assessment
 ╠══════════════════════════════════════════════════════════════════════════════╣
-║ Overall Band Score: {evaluation.get('band_score', 'N/A')}
+║ Overall Band Score: {scores['band_score']}
 ║
 ║ Detailed Criteria Scores:
-║ ▢ Task Response: {evaluation.get('tr_score', 'N/A')}
-║ ▢ Coherence and Cohesion: {evaluation.get('cc_score', 'N/A')}
-║ ▢ Lexical Resource: {evaluation.get('lr_score', 'N/A')}
-║ ▢ Grammatical Range and Accuracy: {evaluation.get('gra_score', 'N/A')}
+║ ▢ Task Response: {scores['tr_score']}
+║ ▢ Coherence and Cohesion: {scores['cc_score']}
+║ ▢ Lexical Resource: {scores['lr_score']}
+║ ▢ Grammatical Range and Accuracy: {scores['gra_score']}
 ╠════════════════════════════════════════════════════════════════════════════════╣
 ║ Key Strengths
-║ {self._format_bullet_points(evaluation.get('strengths', ['No specific strengths identified']))}
+║ {self._format_bullet_points(section('strengths', ['No specific strengths identified']))}
 ╠═══════════════════════════════════════════��════════════════════════════════════╣
 ║ Areas for Improvement
-║ {self._format_bullet_points(evaluation.get('improvements', ['No specific improvements identified']))}
+║ {self._format_bullet_points(section('improvements', ['No specific improvements identified']))}
 ╠══════════════════════════════════════════════════════════════════════════════╣
 ║ Detailed Analysis
-║ {self._format_paragraph(evaluation.get('detailed_feedback', 'No detailed feedback provided'))}
+║ {self._format_paragraph(section('detailed_feedback', 'No detailed feedback provided'))}
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
             return formatted_report
@@ -453,8 +973,9 @@ class IELTSWritingTask2Agent:
         
         return '\n'.join(lines)
 
-    def _analyze_essay_structure(self, answer_text):
-        """Analyze the structure of the essay"""
+    @classmethod
+    def _analyze_essay_structure(cls, answer_text):
+        """Analyze the structure of the essay; uses only class-level markers, so it needs no instance"""
         paragraphs = [p.strip() for p in answer_text.split('\n\n') if p.strip()]
         
         analysis = {
@@ -463,72 +984,57 @@ class IELTSWritingTask2Agent:
             'has_conclusion': False,
             'body_paragraphs': [],
             'cohesive_devices': [],
+            'cohesive_device_counts': {},
             'structure_score': 0
         }
         
         if len(paragraphs) >= 3:
-            analysis['has_introduction'] = self._is_introduction(paragraphs[0])
-            analysis['has_conclusion'] = self._is_conclusion(paragraphs[-1])
+            # One scanner pass per paragraph finds every marker; no marker spans a paragraph break
+            marker_counts = [cls.MARKER_SCANNER.count(paragraph) for paragraph in paragraphs]
+            analysis['has_introduction'] = cls._is_introduction(paragraphs[0], marker_counts[0])
+            analysis['has_conclusion'] = cls._is_conclusion(paragraphs[-1], marker_counts[-1])
             analysis['body_paragraphs'] = paragraphs[1:-1]
             
             # Find cohesive devices
-            analysis['cohesive_devices'] = self._find_cohesive_devices(answer_text)
+            device_counts = {category: {} for category in cls.COHESIVE_DEVICES}
+            for counts in marker_counts:
+                for category in cls.COHESIVE_DEVICES:
+                    for device, occurrences in counts[category].items():
+                        device_counts[category][device] = device_counts[category].get(device, 0) + occurrences
+            analysis['cohesive_device_counts'] = device_counts
+            analysis['cohesive_devices'] = {category: list(devices) for category, devices in device_counts.items()}
             
             # Calculate structure score
-            analysis['structure_score'] = self._calculate_structure_score(analysis)
+            analysis['structure_score'] = cls._calculate_structure_score(analysis)
         
         return analysis
 
-    def _is_introduction(self, paragraph):
-        """Check if paragraph is an introduction"""
-        intro_markers = [
-            'nowadays', 'recently', 'in recent years', 'it is often said',
-            'many people believe', 'there is a growing concern',
-            'there is considerable discussion', 'it is widely believed'
-        ]
-        
-        para_lower = paragraph.lower()
+    @classmethod
+    def _is_introduction(cls, paragraph, marker_counts=None):
+        """Check if paragraph is an introduction; marker_counts is MARKER_SCANNER.count(paragraph) if already known"""
+        marker_counts = marker_counts or cls.MARKER_SCANNER.count(paragraph)
         
         # Check for introduction markers
-        has_marker = any(marker in para_lower for marker in intro_markers)
+        has_marker = bool(marker_counts['introduction'])
         
         # Check if it's presenting the topic
         presents_topic = len(paragraph.split()) >= 25 and '?' in paragraph
         
         return has_marker or presents_topic
 
-    def _is_conclusion(self, paragraph):
-        """Check if paragraph is a conclusion"""
-        conclusion_markers = [
-            'in conclusion', 'to conclude', 'to sum up', 'in summary',
-            'overall', 'to summarize', 'in my opinion', 'finally'
-        ]
-        
-        para_lower = paragraph.lower()
-        return any(marker in para_lower for marker in conclusion_markers)
+    @classmethod
+    def _is_conclusion(cls, paragraph, marker_counts=None):
+        """Check if paragraph is a conclusion; marker_counts is MARKER_SCANNER.count(paragraph) if already known"""
+        marker_counts = marker_counts or cls.MARKER_SCANNER.count(paragraph)
+        return bool(marker_counts['conclusion'])
 
     def _find_cohesive_devices(self, text):
         """Find and categorize cohesive devices used in the text"""
-        cohesive_devices = {
-            'sequence': ['firstly', 'secondly', 'finally', 'next', 'then'],
-            'addition': ['furthermore', 'moreover', 'in addition', 'also', 'besides'],
-            'contrast': ['however', 'nevertheless', 'although', 'despite', 'while'],
-            'example': ['for example', 'for instance', 'such as', 'particularly'],
-            'result': ['therefore', 'thus', 'consequently', 'as a result'],
-            'summary': ['in conclusion', 'to sum up', 'overall', 'in summary']
-        }
-        
-        found_devices = {category: [] for category in cohesive_devices}
-        text_lower = text.lower()
-        
-        for category, devices in cohesive_devices.items():
-            for device in devices:
-                if device in text_lower:
-                    found_devices[category].append(device)
-        
-        return found_devices
+        counts = self.MARKER_SCANNER.count(text)
+        return {category: list(counts[category]) for category in self.COHESIVE_DEVICES}
 
-    def _calculate_structure_score(self, analysis):
+    @classmethod
+    def _calculate_structure_score(cls, analysis):
         """Calculate a score for essay structure (0-10)"""
         score = 0
         
@@ -552,8 +1058,55 @@ class IELTSWritingTask2Agent:
 
     def generate_improvement_suggestions(self, answer_text, analysis_results):
         """Generate specific improvement suggestions using LLM"""
-        
-        prompt = f"""As an IELTS Writing Task 2 expert tutor, provide specific, actionable improvement suggestions for this essay.
+        prompt = self._create_improvement_prompt(answer_text, analysis_results)
+
+        try:
+            response = self._create_message(self._message_request(prompt, 0.7))
+            # Track token usage
+            self.track_token_usage(response)
+            
+            return self._format_improvement_suggestions(response)
+            
+        except Exception as e:
+            logger.error(f"Error generating improvement suggestions: {e}")
+            return None
+
+    async def generate_improvement_suggestions_async(self, answer_text, analysis_results):
+        """Async counterpart of generate_improvement_suggestions"""
+        prompt = self._create_improvement_prompt(answer_text, analysis_results)
+
+        try:
+            response = await self._create_message_async(self._message_request(prompt, 0.7))
+            # Track token usage
+            self.track_token_usage(response)
+            
+            return self._format_improvement_suggestions(response)
+            
+        except Exception as e:
+            logger.error(f"Error generating improvement suggestions: {e}")
+            return None
+
+    def stream_improvement_suggestions(self, answer_text, analysis_results):
+        """Streaming variant of generate_improvement_suggestions; yields the formatted guide so far"""
+        prompt = self._create_improvement_prompt(answer_text, analysis_results)
+        yield from self._stream_suggestions(prompt, 'improvements', "IELTS Writing Task 2 Improvement Guide")
+
+    def _stream_suggestions(self, prompt, label, title):
+        """Stream a suggestions prompt, yielding partial formatted output and then the complete output"""
+        content = ''
+        try:
+            for text in self._stream_text(self._message_request(prompt, 0.7), label):
+                content += text
+                yield self._format_suggestions(content, title, partial=True)
+            yield self._format_suggestions(content, title)
+
+        except Exception as e:
+            logger.error(f"Error generating {label} suggestions: {e}")
+            yield f"Error generating {label} suggestions"
+
+    def _create_improvement_prompt(self, answer_text, analysis_results):
+        """Create the improvement suggestions prompt"""
+        return f"""As an IELTS Writing Task 2 expert tutor, provide specific, actionable improvement suggestions for this essay.
 
         Original Question:
         {json.dumps(self.current_question['question']['description'], indent=2)}
@@ -584,22 +1137,6 @@ class IELTSWritingTask2Agent:
         Format your response as specific, actionable advice that the student can immediately apply.
         Focus on the most impactful improvements first."""
 
-        try:
-            response = self.anthropic.messages.create(
-                model=MODEL,
-                max_tokens=self.MAXIMUM_TOKENS,
-                temperature=0.7,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            # Track token usage
-            self.track_token_usage(response)
-            
-            return self._format_improvement_suggestions(response)
-            
-        except Exception as e:
-            logger.error(f"Error generating improvement suggestions: {e}")
-            return None
-
     def _format_improvement_suggestions(self, response):
         """Format improvement suggestions using the unified formatter"""
         try:
@@ -634,12 +1171,7 @@ class IELTSWritingTask2Agent:
         Format as clear before/after comparisons with explanations."""
 
         try:
-            response = self.anthropic.messages.create(
-                model=MODEL,
-                max_tokens=self.MAXIMUM_TOKENS,
-                temperature=0.7,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            response = self._create_message(self._message_request(prompt, 0.7))
             # Track token usage
             self.track_token_usage(response)
             
@@ -651,8 +1183,42 @@ class IELTSWritingTask2Agent:
 
     def generate_vocabulary_suggestions(self, answer_text):
         """Generate vocabulary improvement suggestions"""
-        
-        prompt = f"""As an IELTS vocabulary expert, analyze this essay and provide specific vocabulary improvements.
+        prompt = self._create_vocabulary_prompt(answer_text)
+
+        try:
+            response = self._create_message(self._message_request(prompt, 0.7))
+            # Track token usage
+            self.track_token_usage(response)
+            
+            return self._format_vocabulary_suggestions(response)
+            
+        except Exception as e:
+            logger.error(f"Error generating vocabulary suggestions: {e}")
+            return None
+
+    async def generate_vocabulary_suggestions_async(self, answer_text):
+        """Async counterpart of generate_vocabulary_suggestions"""
+        prompt = self._create_vocabulary_prompt(answer_text)
+
+        try:
+            response = await self._create_message_async(self._message_request(prompt, 0.7))
+            # Track token usage
+            self.track_token_usage(response)
+            
+            return self._format_vocabulary_suggestions(response)
+            
+        except Exception as e:
+            logger.error(f"Error generating vocabulary suggestions: {e}")
+            return None
+
+    def stream_vocabulary_suggestions(self, answer_text):
+        """Streaming variant of generate_vocabulary_suggestions; yields the formatted suggestions so far"""
+        prompt = self._create_vocabulary_prompt(answer_text)
+        yield from self._stream_suggestions(prompt, 'vocabulary', "Vocabulary Improvement Suggestions")
+
+    def _create_vocabulary_prompt(self, answer_text):
+        """Create the vocabulary suggestions prompt"""
+        return f"""As an IELTS vocabulary expert, analyze this essay and provide specific vocabulary improvements.
 
         Essay text:
         {answer_text}
@@ -679,22 +1245,6 @@ class IELTSWritingTask2Agent:
 
         Your suggestions must be specific and directly related to the essay content."""
 
-        try:
-            response = self.anthropic.messages.create(
-                model=MODEL,
-                max_tokens=self.MAXIMUM_TOKENS,
-                temperature=0.7,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            # Track token usage
-            self.track_token_usage(response)
-            
-            return self._format_vocabulary_suggestions(response)
-            
-        except Exception as e:
-            logger.error(f"Error generating vocabulary suggestions: {e}")
-            return None
-
     def _format_vocabulary_suggestions(self, response):
         """Format vocabulary suggestions using the unified formatter"""
         try:
@@ -704,8 +1254,11 @@ class IELTSWritingTask2Agent:
             logger.error(f"Error formatting vocabulary suggestions: {e}")
             return "Error formatting vocabulary suggestions"
 
-    def _format_suggestions(self, content, title="Suggestions"):
-        """Format suggestions in a clear, structured way with customizable title"""
+    def _format_suggestions(self, content, title="Suggestions", partial=False):
+        """
+        Format suggestions in a clear, structured way with customizable title.
+        With partial=True the content is still streaming and a continuation marker is added.
+        """
         try:
             sections = {
                 'Structure and Organization': [],
@@ -752,6 +1305,9 @@ class IELTSWritingTask2Agent:
                     for suggestion in suggestions:
                         formatted_output += self._wrap_suggestion_text(suggestion)
                     formatted_output += "║\n"
+
+            if partial:
+                formatted_output += "║  …\n"
                 
             formatted_output += "╚════════════════════════════════════════════════════════════════════════╝"
             
@@ -919,7 +1475,7 @@ class IELTSWritingTask2Agent:
 ║ Total Output Tokens: {self.total_output_tokens:,}
 ║ Total Tokens:        {self.total_input_tokens + self.total_output_tokens:,}
 ╚═════════════════════════════════════════════════════╝
-"""
+""" + (self.response_cache.get_report() if self.response_cache else "")
 
     def _update_topic_tracker(self, new_topic):
         """Update the topic tracking file"""
@@ -997,21 +1553,16 @@ def main():
             print("Evaluation cancelled. Please try again with a longer answer.")
             return
 
-    # Evaluate the answer
-    print("\nEvaluating your answer...")
-    evaluation = agent.evaluate_answer(answer)
-    print(evaluation)
-    
-    # Generate improvement suggestions
-    print("\nGenerating improvement suggestions...")
-    analysis_results = agent._analyze_essay_structure(answer)
-    suggestions = agent.generate_improvement_suggestions(answer, analysis_results)
-    print(suggestions)
-    
-    # Generate vocabulary suggestions
-    print("\nGenerating vocabulary suggestions...")
-    vocab_suggestions = agent.generate_vocabulary_suggestions(answer)
-    print(vocab_suggestions)
+    # Evaluate the answer and generate suggestions, printing each section as soon as it is ready
+    print("\nEvaluating your answer and generating suggestions...")
+    section_titles = {
+        'evaluation': "Evaluation",
+        'improvements': "Improvement suggestions",
+        'vocabulary': "Vocabulary suggestions"
+    }
+    for section, content in agent.review_essay(answer):
+        print(f"\n{section_titles.get(section, section.title())}:")
+        print(content)
 
     # Display token usage report at the end
     print("\nToken Usage Summary:")
@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip('anthropic')
+
+from compiled_corpus import compile_corpus
+from corpus import Corpus
+from reading_claude import ReadingExamAgent
+from writing_1_claude import IELTSWritingAgent
+from writing_2_claude import IELTSWritingTask2Agent
+
+SAMPLE_FILES = [Corpus.WRITING_1_SAMPLES, Corpus.WRITING_2_SAMPLES, Corpus.READING_SAMPLES]
+
+
+@pytest.fixture(scope='module')
+def compiled_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('corpus') / 'corpus.bin')
+    compile_corpus(output_path=path)
+    return path
+
+
+def test_constructing_agents_decodes_no_sample_records(compiled_path):
+    corpus = Corpus(compiled_path=compiled_path)
+    assert corpus.compiled
+
+    agents = [
+        IELTSWritingAgent(client=object(), corpus=corpus, display=False),
+        IELTSWritingTask2Agent(client=object(), corpus=corpus),
+        ReadingExamAgent(client=object(), corpus=corpus)
+    ]
+
+    assert corpus.compiled._records == {}
+    assert not set(SAMPLE_FILES) & set(corpus._files)
+
+    # The whole file is still there for callers that ask for it
+    assert agents[1].samples is corpus.writing_2_samples
@@ -0,0 +1,187 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('anthropic')
+
+from batch_grading import BatchGrader
+from token_budget import TokenCounter
+from writing_2_claude import IELTSWritingTask2Agent
+
+SCORES = (
+    "Overall Band Score: 6.5\nTask Response: 6.0\nCoherence and Cohesion: 7.0\n"
+    "Lexical Resource: 6.5\nGrammatical Range and Accuracy: 6.5"
+)
+FEEDBACK = "Key Strengths:\n- Clear position\nAreas for Improvement:\n- Develop examples\nDetailed Analysis:\nA clear answer."
+
+
+class Crash(Exception):
+    pass
+
+
+def message(text):
+    return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=SimpleNamespace(input_tokens=10, output_tokens=5))
+
+
+class FakeBatches:
+    """beta.messages.batches: batches end on their second retrieve and every request succeeds"""
+
+    def __init__(self):
+        self.created = {}
+        self.retrieved = {}
+
+    def create(self, requests):
+        batch_id = f"batch_{len(self.created) + 1}"
+        self.created[batch_id] = requests
+        return SimpleNamespace(id=batch_id)
+
+    def retrieve(self, batch_id):
+        self.retrieved[batch_id] = self.retrieved.get(batch_id, 0) + 1
+        status = 'ended' if self.retrieved[batch_id] > 1 else 'in_progress'
+        counts = SimpleNamespace(processing=len(self.created[batch_id]), succeeded=0, errored=0)
+        return SimpleNamespace(id=batch_id, processing_status=status, request_counts=counts)
+
+    def results(self, batch_id):
+        for request in self.created[batch_id]:
+            text = FEEDBACK if request['custom_id'].endswith('_feedback') else SCORES
+            yield SimpleNamespace(custom_id=request['custom_id'], result=SimpleNamespace(type='succeeded', message=message(text)))
+
+
+class FakeClient:
+    def __init__(self):
+        self.batches = FakeBatches()
+        self.beta = SimpleNamespace(messages=SimpleNamespace(batches=self.batches))
+
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+
+@pytest.fixture
+def grader(client):
+    agent = IELTSWritingTask2Agent(client=client, token_counter=TokenCounter(use_api=False))
+    return BatchGrader(agent=agent, poll_interval=0)
+
+
+@pytest.fixture
+def paths(tmp_path):
+    input_path = tmp_path / 'essays.jsonl'
+    with open(input_path, 'w') as f:
+        for number in range(5):
+            f.write(json.dumps({'question': "Should university be free?", 'answer': f"Essay number {number}. " * 60}) + '\n')
+    return str(input_path), str(tmp_path / 'graded.jsonl'), str(tmp_path / 'graded.jsonl.state.json')
+
+
+def output_ids(output_path):
+    with open(output_path) as f:
+        return [json.loads(line)['essay_id'] for line in f]
+
+
+def crash_on_save(grader, monkeypatch, when):
+    """Make _save_state raise Crash the first time when(state) is true, before writing the state"""
+    save_state = grader._save_state
+
+    def save(state_path, state):
+        if when(state):
+            monkeypatch.setattr(grader, '_save_state', save_state)
+            raise Crash()
+        save_state(state_path, state)
+
+    monkeypatch.setattr(grader, '_save_state', save)
+
+
+def test_grade_file_writes_every_essay(grader, client, paths):
+    input_path, output_path, state_path = paths
+
+    assert grader.grade_file(input_path, output_path) == 5
+
+    assert output_ids(output_path) == [f"essay_{number}" for number in range(1, 6)]
+    with open(output_path) as f:
+        record = json.loads(f.readline())
+    assert record['band_score'] == 6.5
+    assert record['improvements'] == ["Develop examples"]
+    assert record['errors'] == []
+    assert len(client.batches.created) == 1
+    assert len(client.batches.created['batch_1']) == 10
+    assert not grader._load_state(state_path)['chunks']
+
+
+@pytest.mark.parametrize('structured, batches', [(False, [4, 4, 2]), (True, [4, 1])])
+def test_chunks_fit_the_batch_limit(grader, client, paths, structured, batches):
+    input_path, output_path, state_path = paths
+    grader.structured = structured
+    grader.MAX_BATCH_REQUESTS = 4
+
+    assert grader.grade_file(input_path, output_path) == 5
+
+    assert [len(requests) for requests in client.batches.created.values()] == batches
+    assert output_ids(output_path) == [f"essay_{number}" for number in range(1, 6)]
+
+
+def test_chunks_go_through_submitting_submitted_written(grader, paths, monkeypatch):
+    input_path, output_path, state_path = paths
+    grader.MAX_BATCH_REQUESTS = 6
+    saved = []
+    save_state = grader._save_state
+
+    def save(path, state):
+        saved.append([chunk['status'] for chunk in state['chunks']])
+        save_state(path, state)
+
+    monkeypatch.setattr(grader, '_save_state', save)
+    grader.grade_file(input_path, output_path)
+
+    assert saved == [
+        ['pending', 'pending'],
+        ['submitting', 'pending'],
+        ['submitted', 'pending'],
+        ['submitted', 'submitting'],
+        ['submitted', 'submitted'],
+        ['written', 'submitted'],
+        ['written', 'written']
+    ]
+
+
+def test_resume_after_writing_does_not_duplicate_output(grader, client, paths, monkeypatch):
+    input_path, output_path, state_path = paths
+    grader.MAX_BATCH_REQUESTS = 6
+    # Crash after the first chunk's records are written, before its state says so
+    crash_on_save(grader, monkeypatch, lambda state: state['chunks'][0]['status'] == 'written')
+
+    with pytest.raises(Crash):
+        grader.grade_file(input_path, output_path)
+    assert output_ids(output_path) == ["essay_1", "essay_2", "essay_3"]
+
+    assert grader.grade_file(input_path, output_path) == 2
+
+    assert output_ids(output_path) == [f"essay_{number}" for number in range(1, 6)]
+    assert len(client.batches.created) == 2
+
+
+def test_crash_between_submit_and_state_save_resubmits_once(grader, client, paths, monkeypatch):
+    input_path, output_path, state_path = paths
+    # The batch is created, but the state still says the chunk is being submitted
+    crash_on_save(grader, monkeypatch, lambda state: state['chunks'][0]['status'] == 'submitted')
+
+    with pytest.raises(Crash):
+        grader.grade_file(input_path, output_path)
+    assert len(client.batches.created) == 1
+    assert grader._load_state(state_path)['chunks'][0]['status'] == 'submitting'
+
+    assert grader.grade_file(input_path, output_path) == 5
+
+    assert len(client.batches.created) == 2
+    assert output_ids(output_path) == [f"essay_{number}" for number in range(1, 6)]
+
+
+def test_state_is_saved_through_a_unique_temporary_file(grader, tmp_path):
+    state_path = str(tmp_path / 'graded.jsonl.state.json')
+    # A leftover from another writer must neither be reused nor break the save
+    (tmp_path / 'graded.jsonl.state.json.tmp').mkdir()
+
+    grader._save_state(state_path, {'chunks': []})
+
+    assert grader._load_state(state_path) == {'chunks': []}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['graded.jsonl.state.json', 'graded.jsonl.state.json.tmp']
@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip('anthropic')
+
+import clients
+from token_budget import TokenCounter
+from writing_2_claude import IELTSWritingTask2Agent
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setenv('ANTHROPIC_API_KEY', 'test')
+    monkeypatch.setattr(clients, 'CLIENT_SETTINGS', dict(clients.CLIENT_SETTINGS))
+    monkeypatch.setattr(clients, '_client', None)
+    monkeypatch.setattr(clients, '_async_client', None)
+    return clients.CLIENT_SETTINGS
+
+
+def test_configure_leaves_clients_in_use_open(settings):
+    agent = IELTSWritingTask2Agent()
+    counter = TokenCounter()
+    old = agent.anthropic
+    assert counter.client is old
+
+    clients.configure(max_connections=7)
+
+    assert not old.is_closed()
+    assert agent.anthropic is not old
+    assert agent.anthropic is clients.get_client()
+    assert counter.client is clients.get_client()
+
+
+def test_explicit_client_is_kept(settings):
+    client = object()
+    agent = IELTSWritingTask2Agent(client=client)
+    clients.configure(max_connections=7)
+    assert agent.anthropic is client
+
+
+def test_configure_rejects_unknown_settings(settings):
+    with pytest.raises(ValueError):
+        clients.configure(max_conections=7)
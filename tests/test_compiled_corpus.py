@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from compiled_corpus import compile_corpus
+from corpus import Corpus
+
+
+@pytest.fixture(scope='module')
+def compiled_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('compiled') / 'corpus.bin'
+    compile_corpus(output_path=str(path))
+    return str(path)
+
+
+@pytest.fixture(scope='module')
+def corpora(compiled_path):
+    compiled = Corpus(compiled_path=compiled_path)
+    assert compiled.compiled is not None
+    return compiled, Corpus(compiled_path=False)
+
+
+@pytest.mark.parametrize('relative_path', [Corpus.WRITING_1_SAMPLES, Corpus.WRITING_2_SAMPLES, Corpus.READING_SAMPLES])
+def test_compiled_document_serializes_like_json(corpora, relative_path):
+    compiled, plain = corpora
+    assert json.dumps(compiled.load(relative_path), sort_keys=True) == json.dumps(plain.load(relative_path), sort_keys=True)
+
+
+def test_compiled_sample_lists_are_lists(corpora):
+    compiled, _ = corpora
+    assert isinstance(compiled.writing_1_samples['ielts_writing_task_1']['question_examples'], list)
+    assert isinstance(compiled.writing_2_samples['ielts_writing_task_2']['question_examples'], list)
+
+
+def test_indexed_lookups_match_json(corpora):
+    compiled, plain = corpora
+    for visual_type in ('bar graph', 'line graph', 'pie chart'):
+        assert compiled.task_1_examples(visual_type) == plain.task_1_examples(visual_type)
+    question_id = plain.writing_2_samples['ielts_writing_task_2']['question_examples'][0]['id']
+    assert compiled.task_2_example(question_id) == plain.task_2_example(question_id)
+
+
+def test_lookup_before_and_after_load_share_records(compiled_path):
+    compiled = Corpus(compiled_path=compiled_path)
+    question_id = compiled.build_indexes()['task_2_by_id']
+    question_id = next(key for key, position in question_id.items() if position == 0)
+    first = compiled.task_2_example(question_id)
+    assert Corpus.WRITING_2_SAMPLES not in compiled._files
+    examples = compiled.writing_2_samples['ielts_writing_task_2']['question_examples']
+    assert first is examples[0]
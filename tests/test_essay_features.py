@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('anthropic')
+
+from essay_features import EssayFeatureExtractor
+from marker_scanner import MarkerScanner
+from writing_2_claude import IELTSWritingTask2Agent
+
+CATEGORIES = {
+    'introduction': ['nowadays', 'it is widely believed'],
+    'conclusion': ['in conclusion', 'to sum up'],
+    'addition': ['moreover', 'in addition', 'also'],
+    'result': ['as a result', 'therefore', 'result'],
+    'example': ['for example', 'such as'],
+}
+COHESIVE = ['addition', 'result', 'example']
+
+
+class Analyzer(IELTSWritingTask2Agent):
+    """The agent's structure analysis over a small, overlapping marker set"""
+    MARKER_SCANNER = MarkerScanner(CATEGORIES)
+    COHESIVE_DEVICES = {category: CATEGORIES[category] for category in COHESIVE}
+
+ESSAYS = [
+    "",
+    "One short answer.",
+    "Nowadays, many argue? Yes.\n\nMoreover, it works.Therefore it matters!\n\nIn conclusion, it does.",
+    "It is widely believed that cities grow.\n\nSuch as a result, costs rise; for\n\nexample rents.\n\nTo sum up: growth.",
+    "  \n\n\n\nFirst.\n\n\n\n\nAlso_this and _that also.\n\n  \n\nThen (moreover) the end",
+    "Café culture — “moreover” it’s naïve…therefore in addition, ß.\n\nstrengthen such, as\n\nIn  Conclusion\tit ends",
+    "a\x00b\x01c. In conclusion\x00\n\nx moreover\n\ny?",
+    "Should " + "people " * 24 + "travel more?\n\nYes, as a result of costs.\n\nSo yes.",
+]
+
+
+def reference(essay, scanner):
+    """The features computed token by token, as the extractor's NumPy pass must reproduce them"""
+    paragraphs = [p.strip() for p in essay.split('\n\n') if p.strip()]
+    tokens = [token for paragraph in paragraphs for token in scanner.tokenize(paragraph)]
+    words = [token for token in tokens if token[0].isalnum()]
+    sentences, length = [], 0
+    for token in tokens:
+        if token in ('.', '!', '?'):
+            sentences, length = sentences + [length] * bool(length), 0
+        elif token[0].isalnum():
+            length += 1
+    sentences += [length] * bool(length)
+
+    structured = len(paragraphs) >= 3
+    counts = [scanner.count(paragraph) for paragraph in paragraphs] if structured else []
+    cohesive = [sum(sum(c[category].values()) for c in counts) for category in COHESIVE]
+    variety = len({(category, device) for c in counts for category in COHESIVE for device in c[category]})
+    has_introduction = structured and (bool(counts[0]['introduction']) or (len(paragraphs[0].split()) >= 25 and '?' in paragraphs[0]))
+    has_conclusion = structured and bool(counts[-1]['conclusion'])
+    body = len(paragraphs) - 2 if structured else 0
+    score = min(10, 2 * has_introduction + 2 * has_conclusion + 2 * (len(paragraphs) >= 4) + min(2, variety / 5) + 2 * (body >= 2)) if structured else 0
+    return [float(value) for value in (
+        len(essay.split()), len(paragraphs), body,
+        len(sentences), np.mean(sentences) if sentences else 0, np.std(sentences) if sentences else 0, max(sentences, default=0),
+        len(set(words)) / len(words) if words else 0, has_introduction, has_conclusion,
+        *cohesive, variety, score
+    )]
+
+
+@pytest.fixture(scope='module')
+def extractor():
+    return EssayFeatureExtractor(Analyzer)
+
+
+def test_batch_matches_token_by_token_features(extractor):
+    features = extractor.extract(ESSAYS)
+    for essay, row in zip(ESSAYS, features):
+        assert row == pytest.approx(reference(essay, extractor.scanner)), essay
+
+
+def test_single_essays_match_the_batch(extractor):
+    features = extractor.extract(ESSAYS)
+    for essay, row in zip(ESSAYS, features):
+        assert extractor.extract([essay])[0] == pytest.approx(row)
+
+
+def test_overlapping_markers_count_like_the_scanner(extractor):
+    essay = "Intro.\n\nSuch as a result, therefore.\n\nEnd."
+    features = extractor.extract([essay])
+    assert extractor.column(features, 'cohesive_example')[0] == 1
+    # "as a result" overlaps the end of "such as" and is lost; the standalone "result" is not
+    assert extractor.column(features, 'cohesive_result')[0] == 2
+
+
+def test_empty_batch(extractor):
+    assert extractor.extract([]).shape == (0, len(extractor.feature_names))
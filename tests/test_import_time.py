@@ -0,0 +1,15 @@
+import pytest
+
+pytest.importorskip('anthropic')
+
+from benchmarks import benchmark_import_time
+
+# Both imports take about 0.4 s here, nearly all of it the anthropic SDK; the budget leaves room
+# for slower machines but not for matplotlib or NumPy, which the agents import on first use
+IMPORT_BUDGET_MS = 2000
+
+
+@pytest.mark.parametrize('module', ['writing_1_claude', 'writing_2_claude'])
+def test_agent_import_is_light(module, capsys):
+    passed = benchmark_import_time(module=module, budget_ms=IMPORT_BUDGET_MS, forbidden=('matplotlib', 'numpy'))
+    assert passed, capsys.readouterr().out
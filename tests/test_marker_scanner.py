@@ -0,0 +1,47 @@
+from marker_scanner import MarkerScanner
+
+SCANNER = MarkerScanner({
+    'sequence': ['firstly', 'then', 'finally'],
+    'addition': ['also', 'in addition'],
+    'result': ['as a result', 'result'],
+    'summary': ['in conclusion', 'finally']
+})
+
+
+def test_markers_only_match_whole_words():
+    text = "We strengthen then weaken. Athens also. Thenceforth, finally."
+    assert SCANNER.count(text)['sequence'] == {'then': 1, 'finally': 1}
+    assert SCANNER.scan(text) == [(text.index(' then') + 1, 'then'), (text.index('also'), 'also'), (text.index('finally'), 'finally')]
+
+
+def test_repeated_markers_are_all_counted():
+    text = "Also, it is cheap. It is also fast, and also quiet.ALSO"
+    assert SCANNER.count(text)['addition'] == {'also': 4}
+    assert [marker for _, marker in SCANNER.scan(text)] == ['also'] * 4
+
+
+def test_nested_markers_are_reported_with_the_longer_one():
+    text = "As a result, prices rose. The result was clear."
+    assert SCANNER.count(text)['result'] == {'as a result': 1, 'result': 2}
+    assert SCANNER.scan(text) == [(0, 'as a result'), (5, 'result'), (30, 'result')]
+
+
+def test_markers_match_across_line_breaks():
+    text = "Costs fell.\nAs a\nresult, demand grew in\r\n\taddition to wages. In\n\nconclusion, yes."
+    counts = SCANNER.count(text)
+    assert counts['result'] == {'as a result': 1, 'result': 1}
+    assert counts['addition'] == {'in addition': 1}
+    assert counts['summary'] == {'in conclusion': 1}
+    assert SCANNER.count_matches(SCANNER.scan(text)) == counts
+
+
+def test_markers_do_not_match_across_sentences():
+    assert SCANNER.count("In. Addition is hard. As a. Result")['addition'] == {}
+    assert SCANNER.scan("In. Addition is hard.") == []
+
+
+def test_categories_sharing_a_marker_both_count_it():
+    counts = SCANNER.count("Finally, we stop.")
+    assert counts['sequence'] == {'finally': 1}
+    assert counts['summary'] == {'finally': 1}
+    assert counts['addition'] == {}
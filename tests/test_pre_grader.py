@@ -0,0 +1,104 @@
+import pytest
+
+pytest.importorskip('anthropic')
+
+from pre_grader import PreGrader
+
+QUESTION = "Some people believe university education should be free for all students. To what extent do you agree?"
+WEAK_ESSAY = (
+    "Nowadays many people think that university should be free. I am agree with this idea because it is good.\n\n"
+    "First, education is important for everyone. If university is free then more student can go there and they will get good job. "
+    "Also poor family can not pay money so it is problem for them.\n\n"
+    "Second, goverment have money from tax so they can pay for student. It is good for country because people will be smart.\n\n"
+    "In conclusion, I think university should be free because it is good for student and for country."
+)
+# A full-length band 4 answer: frequent spelling errors and only loosely about the question
+LOW_BAND_ESSAY = "\n\n".join([
+    "In this days many peple talk about studing and if it must be free for the students in the sociaty. "
+    "I think it is very importent topic and evry body have diffrent opinon about it.",
+    "First of all, when I was a child my famly dont have much mony. My father work in a factry every day and "
+    "my mother was stay in home with my brothers. We go to the school near our hous and the teachers was "
+    "very strickt but they was kind also. I remeber that we play footbal after the lessons and it was the "
+    "best time of my life. Now my brothers are work in the city and they have good job, so I think hard work "
+    "is more importent than anything.",
+    "Secondly, the goverment must to do many things for peple. For exampel, they must to bild more hospitals "
+    "and roads becuase the trafic in my city is very bad and peple wait for hours. Also the enviroment is "
+    "very dirty and the air is not clean, so the goverment must to stop the factrys. If the goverment do "
+    "this things the life will be more better for evry body and the peple will be happy.",
+    "Thirdly, many yung peple now use the internet all the time and they dont read books. I think this is "
+    "not good for them becuase books are teach many things about the life. My frends play games on the "
+    "phone all night and then they are tired in the morning. Parents must to control the children and take "
+    "the phone from them.",
+    "In conclution, there is many problems in the sociaty and evry body must to help. I belive that if we "
+    "work togather the futur will be more better for our children and for our contry."
+])
+
+
+@pytest.fixture(scope='module')
+def pre_grader():
+    return PreGrader()
+
+
+def test_under_length_essay_is_graded_locally(pre_grader):
+    result = pre_grader.grade(WEAK_ESSAY, QUESTION)
+    assert not result['off_task']
+    assert result['under_length']
+    assert result['band'] <= PreGrader.UNDER_LENGTH_BAND
+    assert result['high'] <= pre_grader.llm_band_threshold
+    assert result['route'] == 'local'
+    assert pre_grader.evaluation(result)['improvements'][0].startswith("Write at least 250 words")
+
+
+def test_full_length_low_band_essay_is_graded_locally(pre_grader):
+    pytest.importorskip('spellchecker')
+    result = pre_grader.grade(LOW_BAND_ESSAY, QUESTION)
+    assert len(LOW_BAND_ESSAY.split()) >= 250
+    assert not result['under_length']
+    assert not result['off_task']
+    assert result['spelling_error_rate'] >= PreGrader.SPELLING_ERROR_RATE
+    assert result['low_band']
+    assert result['band'] == PreGrader.LOW_BAND
+    assert result['reference_band'] == '4.0'
+    assert result['route'] == 'local'
+    assert any(note.startswith("Check your spelling") for note in pre_grader.evaluation(result)['improvements'])
+
+
+def test_band_4_sample_is_the_only_local_sample(pre_grader):
+    pytest.importorskip('spellchecker')
+    samples = pre_grader.corpus.writing_2_samples['ielts_writing_task_2']['question_examples']
+    scores, essays, questions = [], [], []
+    for sample in samples:
+        answer = sample.get('answers', {}).get('example_answer', {})
+        text = answer.get('text', '')
+        scores.append(float(answer.get('score', 0)))
+        essays.append('\n\n'.join(text) if isinstance(text, list) else text)
+        questions.append(sample.get('description'))
+    for score, result in zip(scores, pre_grader.grade_many(essays, questions)):
+        assert (result['route'] == 'local') == (score == 4.0)
+
+
+def test_interval_is_the_model_error_within_the_reference_range(pre_grader):
+    result = pre_grader.grade(WEAK_ESSAY, QUESTION)
+    error = pre_grader._fit()['error']
+    thresholds = pre_grader.reference[result['reference_band']]['confidence_thresholds']
+    assert result['high'] - result['low'] <= 2 * error + 0.5
+    assert result['low'] >= thresholds['min_score'] - thresholds['variance'] - 0.25
+    assert result['high'] <= thresholds['max_score'] + thresholds['variance'] + 0.25
+
+
+def test_out_of_range_essay_goes_to_the_llm(pre_grader):
+    result = pre_grader.grade('word ' * 300)
+    assert result['out_of_range']
+    assert result['band'] < 9
+    assert result['route'] == 'llm'
+
+
+def test_calibration_essays_stay_within_their_scores(pre_grader):
+    model = pre_grader._fit()
+    samples = pre_grader.corpus.writing_2_samples['ielts_writing_task_2']['question_examples']
+    essays = []
+    for sample in samples:
+        text = sample.get('answers', {}).get('example_answer', {}).get('text', '')
+        essays.append('\n\n'.join(text) if isinstance(text, list) else text)
+    for result in pre_grader.grade_many(essays):
+        assert model['min_score'] - 0.25 <= result['band'] <= model['max_score'] + 0.25
@@ -0,0 +1,55 @@
+import os
+import threading
+
+import pytest
+
+anthropic = pytest.importorskip('anthropic')
+
+from response_cache import ResponseCache
+
+
+def message(text):
+    return anthropic.types.Message.model_validate({
+        'id': 'msg_test', 'type': 'message', 'role': 'assistant', 'model': 'claude-test',
+        'content': [{'type': 'text', 'text': text}], 'stop_reason': 'end_turn', 'stop_sequence': None,
+        'usage': {'input_tokens': 10, 'output_tokens': 20}
+    })
+
+
+def test_concurrent_writes_to_one_key(tmp_path, caplog):
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    key = cache.make_key({'model': 'claude-test', 'messages': [], 'temperature': 0})
+    # Long enough that unsynchronised writes to one file would interleave
+    texts = [str(writer) * 200000 for writer in range(8)]
+    barrier = threading.Barrier(len(texts))
+
+    def write(text):
+        barrier.wait()
+        for _ in range(5):
+            cache.put(key, message(text))
+
+    threads = [threading.Thread(target=write, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Every write succeeded, and the entry is one whole response
+    assert not caplog.records
+    cached = cache.get(key)
+    assert cached.content[0].text in texts
+    assert cached.usage.input_tokens == 0
+    assert os.listdir(tmp_path) == [f"{key}.json"]
+
+
+def test_failed_write_leaves_no_temporary_file(tmp_path, monkeypatch):
+    cache = ResponseCache(cache_dir=str(tmp_path))
+
+    def replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, 'replace', replace)
+    cache.put('key', message("text"))
+
+    assert os.listdir(tmp_path) == []
+    assert cache.get('key') is None
@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip('anthropic')
+
+from scheduler import RequestScheduler
+from writing_1_claude import IELTSWritingAgent
+
+QUESTION = {
+    'type': 'line_graph',
+    'data': {'description': "The graph shows the number of visitors to three museums between 2000 and 2020."}
+}
+ANSWER = "The graph compares visitor numbers at three museums over twenty years. " * 20
+
+
+class DroppedStream:
+    """A messages.stream context whose text stream fails after its first chunk"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    @property
+    def text_stream(self):
+        yield "Overall Band Score: 6"
+        raise ConnectionError("connection lost")
+
+
+class FakeMessages:
+    def stream(self, **request):
+        return DroppedStream()
+
+
+class FakeClient:
+    messages = FakeMessages()
+
+
+@pytest.fixture
+def agent():
+    agent = IELTSWritingAgent(client=FakeClient(), scheduler=RequestScheduler(max_retries=0), display=False)
+    agent.current_question = QUESTION
+    return agent
+
+
+def test_stream_evaluation_reports_errors(agent):
+    chunks = list(agent.stream_evaluation(ANSWER))
+    assert len(chunks) == 2
+    assert chunks[-1] == "Error evaluating answer: connection lost"
+
+
+class Response:
+    def __init__(self, text):
+        self.content = [type('Block', (), {'text': text})()]
+
+
+GENERATED = {'topic': 'museum visitors', 'seed': 1, 'data': {'labels': ['2000', '2010']}, 'details': {}}
+
+
+@pytest.mark.parametrize('written', [
+    '{"description": "Visitors.", "key_features": "Visitors rose", "expected_analysis": []}',
+    '{"description": "Visitors.", "key_features": [], "expected_analysis": "Compare the museums"}',
+    '["Visitors rose"]'
+])
+def test_question_with_misshapen_lists_is_rejected(agent, written):
+    result = agent._handle_question_response('line graph', GENERATED, Response(written))
+    assert result == "Error: Invalid question structure"
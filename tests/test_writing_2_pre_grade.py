@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip('anthropic')
+
+from pre_grader import PreGrader
+from writing_2_claude import IELTSWritingTask2Agent
+
+QUESTION = {
+    'question_type': 'opinion',
+    'topic_category': 'education',
+    'metadata': {'main_themes': ['education'], 'reasoning_type': 'opinion'},
+    'question': {'description': [
+        "Some people believe that university education should be free for all students.",
+        "To what extent do you agree or disagree?"
+    ]}
+}
+
+PIZZA_ESSAY = "\n\n".join([
+    "Pizza is one of the most popular dishes in the world, and it is eaten in almost every country. "
+    "In this essay I will describe how a good pizza is made and why so many families love it.",
+    "The dough is the most important part of any pizza. Flour, water, yeast and salt are mixed and left "
+    "to rise for several hours, sometimes for a whole day, so that the crust becomes light and crisp. "
+    "Bakers in Naples stretch the dough by hand and never use a rolling pin, because it would press out "
+    "the air. The oven must be extremely hot, often above four hundred degrees, and a wood fire gives the "
+    "crust a smoky taste that electric ovens cannot copy. A pizza cooked in this way is ready in ninety seconds.",
+    "The toppings are the second secret. A classic margherita needs only tomato sauce, fresh mozzarella, "
+    "basil leaves and olive oil, yet the balance between them is difficult to achieve. Too much sauce "
+    "makes the base soggy, while too little cheese leaves it dry. Some cooks prefer pepperoni, mushrooms, "
+    "olives or pineapple, and the debate about pineapple has lasted for decades. Each region has its own "
+    "favourite combination, and tourists often travel just to taste a famous local version.",
+    "Pizza is also a social meal. Friends share one large pizza at parties, children choose their own "
+    "toppings at birthday celebrations, and many families order a pizza every Friday evening after a long "
+    "week. Delivery companies have built huge businesses around hot boxes and fast scooters, and some "
+    "restaurants now sell frozen pizzas in supermarkets.",
+    "In conclusion, pizza is simple to describe but hard to perfect. Good dough, a very hot oven and a "
+    "careful choice of toppings are what turn bread and cheese into a meal that people all over the world enjoy."
+])
+
+
+class FakeMessages:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        raise AssertionError("the LLM must not be called for a pre-graded essay")
+
+    stream = create
+
+
+class FakeClient:
+    def __init__(self):
+        self.messages = FakeMessages()
+
+
+def test_off_task_essay_is_graded_without_the_llm():
+    client = FakeClient()
+    agent = IELTSWritingTask2Agent(client=client, pre_grader=PreGrader())
+    agent.current_question = QUESTION
+    assert len(PIZZA_ESSAY.split()) >= agent.MINIMUM_WORDS
+
+    feedback = agent.evaluate_answer(PIZZA_ESSAY)
+
+    assert client.messages.calls == 0
+    assert agent.last_pre_grade['off_task']
+    assert agent.last_pre_grade['topic_overlap'] is not None
+    assert agent.last_evaluation_usage == {'input_tokens': 0, 'output_tokens': 0}
+    assert "Answer the question that was asked" in feedback
+
+
+def test_prompts_include_the_question_text():
+    agent = IELTSWritingTask2Agent(client=FakeClient())
+    agent.current_question = QUESTION
+    for prompt in (
+        agent._create_score_prompt(PIZZA_ESSAY, 300),
+        agent._create_feedback_prompt(PIZZA_ESSAY, 300),
+        agent._create_structured_evaluation_prompt(PIZZA_ESSAY, 300)
+    ):
+        assert "university education should be free for all students" in prompt